@@ -0,0 +1,9 @@
+"""Reproducible performance benchmarks for the resume evaluator.
+
+    python -m benchmarks run                      # micro + pool (1k, 10k)
+    python -m benchmarks run --suite pool --sizes 1000,10000,100000
+    python -m benchmarks run --baseline benchmarks/baseline.json
+    python -m benchmarks generate --out corpus/ --count 200
+
+See README.md ("Benchmarks") for the workflow.
+"""
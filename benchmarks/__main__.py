@@ -0,0 +1,100 @@
+import argparse
+import os
+import sys
+from pathlib import Path
+
+DEFAULT_BASELINE = Path(__file__).with_name('baseline.json')
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help='Run benchmarks and compare them against a baseline')
+    run.add_argument('--suite', choices=['micro', 'pool', 'all'], default='all')
+    run.add_argument('--sizes', default='1000,10000',
+                     help='Comma-separated pool sizes for the pool suite (default: 1000,10000)')
+    run.add_argument('--repeat', type=int, default=20, help='Timed repetitions per microbenchmark')
+    run.add_argument('--seed', type=int, default=0)
+    run.add_argument('--output', default='benchmark-results.json', help='Where to write the results JSON')
+    run.add_argument('--baseline', default=str(DEFAULT_BASELINE),
+                     help='Baseline results JSON to compare against (default: benchmarks/baseline.json)')
+    run.add_argument('--tolerance', type=float, default=0.25,
+                     help='Allowed slowdown of a median before it counts as a regression (default: 0.25)')
+    run.add_argument('--save-baseline', action='store_true',
+                     help='Also write the results to --baseline instead of comparing')
+
+    generate = commands.add_parser('generate', help='Write a synthetic corpus of resume PDFs and job postings')
+    generate.add_argument('--out', required=True)
+    generate.add_argument('--count', type=int, default=100)
+    generate.add_argument('--jobs', type=int, default=5)
+    generate.add_argument('--pages', type=int, default=1)
+    generate.add_argument('--seed', type=int, default=0)
+    return parser.parse_args(argv)
+
+def setup_django():
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'benchmarks.settings')
+    import django
+    from django.core.management import call_command
+    django.setup()
+    call_command('migrate', verbosity=0)
+
+def print_comparison(rows):
+    width = max(len(name) for name, *_ in rows)
+    for name, before, after, ratio, regressed in rows:
+        if before is None:
+            print(f'{name:<{width}}  {"-":>10} ms -> {after * 1000:10.3f} ms  (not in baseline)')
+            continue
+        flag = '  REGRESSION' if regressed else ''
+        print(f'{name:<{width}}  {before * 1000:10.3f} ms -> {after * 1000:10.3f} ms  ({ratio:5.2f}x){flag}')
+
+def run(args):
+    setup_django()
+    from . import micro, pool
+    from .timing import compare, load_results, write_results
+
+    results = {}
+    if args.suite in ('micro', 'all'):
+        print('Running microbenchmarks...')
+        results.update(micro.run(seed=args.seed, repeat=args.repeat))
+    if args.suite in ('pool', 'all'):
+        sizes = [int(size) for size in args.sizes.split(',') if size]
+        print(f'Running pool benchmarks for {", ".join(map(str, sizes))} resumes...')
+        results.update(pool.run(sizes=sizes, seed=args.seed))
+
+    write_results(args.output, results)
+    print(f'Wrote {len(results)} results to {args.output}')
+
+    if args.save_baseline:
+        write_results(args.baseline, results)
+        print(f'Saved baseline to {args.baseline}')
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f'No baseline at {args.baseline}; run with --save-baseline to record one')
+        return 0
+
+    rows = compare(results, load_results(args.baseline), args.tolerance)
+    if rows:
+        print_comparison(rows)
+    unchecked = [row for row in rows if row[1] is None]
+    if unchecked:
+        print(f'{len(unchecked)} benchmark(s) are not in the baseline and were not checked; '
+              f're-record it with --save-baseline')
+    regressions = [row for row in rows if row[-1]]
+    if regressions:
+        print(f'{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}')
+        return 1
+    print('No regressions against the baseline')
+    return 0
+
+def generate(args):
+    from .corpus import write_corpus
+    paths = write_corpus(args.out, args.count, jobs=args.jobs, seed=args.seed, pages=args.pages)
+    print(f'Wrote {len(paths)} resumes and {args.jobs} job postings to {args.out}')
+    return 0
+
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    return run(args) if args.command == 'run' else generate(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
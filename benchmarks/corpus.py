@@ -0,0 +1,228 @@
+"""Seeded generator of synthetic resumes (Jake's-resume layout) and job postings."""
+
+import json
+import random
+from pathlib import Path
+
+from .pdf_writer import PAGE_HEIGHT, PAGE_WIDTH, PDFDocument, text_width
+
+SKILLS = [
+    'Python', 'Java', 'C++', 'C', 'JavaScript', 'TypeScript', 'Go', 'Rust', 'Ruby', 'Kotlin',
+    'Swift', 'Scala', 'R', 'SQL', 'HTML', 'CSS', 'Bash', 'PHP', 'MATLAB', 'Haskell',
+    'Django', 'Flask', 'FastAPI', 'React', 'Angular', 'Vue', 'Node.js', 'Express', 'Spring Boot',
+    'Ruby on Rails', 'ASP.NET', 'JUnit', 'pytest', 'Selenium', 'GraphQL', 'REST',
+    'PostgreSQL', 'MySQL', 'SQLite', 'MongoDB', 'Redis', 'Elasticsearch', 'Cassandra', 'DynamoDB',
+    'Docker', 'Kubernetes', 'Terraform', 'Ansible', 'Jenkins', 'GitHub Actions', 'Git', 'Linux',
+    'AWS', 'Google Cloud', 'Azure', 'Kafka', 'RabbitMQ', 'Spark', 'Hadoop', 'Airflow',
+    'pandas', 'NumPy', 'scikit-learn', 'TensorFlow', 'PyTorch', 'Keras', 'OpenCV', 'NLTK',
+    'Tableau', 'Power BI', 'Excel', 'Jira', 'Figma', 'Agile', 'Scrum', 'Machine Learning',
+    'Deep Learning', 'Data Analysis', 'Computer Vision', 'NLP', 'Microservices', 'CI/CD',
+]
+
+FIRST_NAMES = [
+    'Jake', 'Maria', 'Wei', 'Aisha', 'Carlos', 'Priya', 'Liam', 'Sofia', 'Noah', 'Yuki',
+    'Omar', 'Elena', 'Kwame', 'Hannah', 'Diego', 'Mei', 'Lucas', 'Fatima', 'Ethan', 'Zara',
+]
+LAST_NAMES = [
+    'Ryan', 'Garcia', 'Chen', 'Khan', 'Lopez', 'Patel', 'Smith', 'Rossi', 'Kim', 'Tanaka',
+    'Haddad', 'Ivanova', 'Mensah', 'Muller', 'Silva', 'Wong', 'Martin', 'Ali', 'Brown', 'Nowak',
+]
+UNIVERSITIES = [
+    ('Southwestern University', 'Georgetown, TX'), ('Blinn College', 'Bryan, TX'),
+    ('State University', 'Austin, TX'), ('Institute of Technology', 'Boston, MA'),
+    ('University of the West', 'San Diego, CA'), ('Lakeside University', 'Chicago, IL'),
+]
+DEGREES = [
+    'Bachelor of Science in Computer Science', 'Bachelor of Arts in Computer Science',
+    'Master of Science in Data Science', 'Bachelor of Engineering in Software Engineering',
+    'Associate\'s in Liberal Arts', 'PhD in Computer Science', 'Master of Business Administration',
+]
+COMPANIES = [
+    ('Texas A&M University', 'College Station, TX'), ('Southwestern University', 'Georgetown, TX'),
+    ('Acme Analytics', 'Austin, TX'), ('Globex Corporation', 'Seattle, WA'),
+    ('Initech', 'Denver, CO'), ('Umbrella Health', 'New York, NY'), ('Hooli', 'Mountain View, CA'),
+]
+TITLES = [
+    'Undergraduate Research Assistant', 'Information Technology Support Specialist',
+    'Artificial Intelligence Research Assistant', 'Software Engineer', 'Senior Software Engineer',
+    'Data Scientist', 'Backend Developer', 'DevOps Engineer', 'Machine Learning Engineer',
+]
+VERBS = ['Developed', 'Built', 'Designed', 'Implemented', 'Optimized', 'Led', 'Automated', 'Migrated']
+OBJECTS = [
+    'a REST API', 'a full-stack web application', 'a data pipeline', 'an internal dashboard',
+    'a recommendation service', 'the CI/CD workflow', 'a monitoring system', 'a batch scoring job',
+]
+OUTCOMES = [
+    'reducing latency by {n}%', 'serving {n}k daily users', 'cutting costs by {n}%',
+    'improving accuracy by {n}%', 'saving {n} engineering hours per month',
+]
+MONTHS = ['Jan.', 'Feb.', 'Mar.', 'Apr.', 'May', 'June', 'July', 'Aug.', 'Sep.', 'Oct.', 'Nov.', 'Dec.']
+DEPARTMENTS = ['Engineering', 'Data', 'Platform', 'Research', 'Infrastructure']
+LOCATIONS = ['Austin, TX', 'Remote', 'New York, NY', 'Seattle, WA', 'Boston, MA']
+
+def date_range(rng, start_year):
+    end_year = start_year + rng.randint(1, 3)
+    end = 'Present' if rng.random() < 0.2 else f'{rng.choice(MONTHS)} {end_year}'
+    return f'{rng.choice(MONTHS)} {start_year} - {end}', end_year
+
+def make_bullet(rng, skills):
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 90))
+    return f'{rng.choice(VERBS)} {rng.choice(OBJECTS)} with {", ".join(rng.sample(skills, min(2, len(skills))))}, {outcome}'
+
+def make_resume(rng, n_skills=15, n_jobs=3, n_projects=2):
+    """Return a resume as a dict of fields plus its layout sections."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(SKILLS, min(n_skills, len(SKILLS)))
+    year = rng.randint(2005, 2020)
+
+    education = []
+    for _ in range(rng.randint(1, 2)):
+        university, city = rng.choice(UNIVERSITIES)
+        dates, year = date_range(rng, year)
+        education.append(((university, city), (rng.choice(DEGREES), dates)))
+
+    experience = []
+    for _ in range(n_jobs):
+        company, city = rng.choice(COMPANIES)
+        dates, year = date_range(rng, year)
+        bullets = [make_bullet(rng, skills) for _ in range(rng.randint(2, 4))]
+        experience.append(((rng.choice(TITLES), dates), (company, city), bullets))
+
+    projects = []
+    for _ in range(n_projects):
+        name = f'{rng.choice(["Gitlytics", "Simple Paintball", "Resumify", "Trackr", "Notely"])}'
+        dates, _ = date_range(rng, year - 1)
+        bullets = [make_bullet(rng, skills) for _ in range(rng.randint(2, 3))]
+        projects.append(((f'{name} | {", ".join(rng.sample(skills, min(3, len(skills))))}', dates), bullets))
+
+    groups = ['Languages', 'Frameworks', 'Developer Tools', 'Libraries']
+    skill_lines = [
+        f'{group}: {", ".join(skills[i::len(groups)])}' for i, group in enumerate(groups) if skills[i::len(groups)]
+    ]
+
+    return {
+        'name': f'{first} {last}',
+        'email': f'{first.lower()}.{last.lower()}{rng.randint(1, 99)}@example.com',
+        'phone': f'{rng.randint(200, 999)}-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}',
+        'links': f'linkedin.com/in/{first.lower()}{last.lower()} | github.com/{first.lower()}{last.lower()}',
+        'skills': skills,
+        'education': education,
+        'experience': experience,
+        'projects': projects,
+        'skill_lines': skill_lines,
+    }
+
+def resume_lines(resume):
+    """Layout of a resume as (style, left text, right text) rows, top to bottom."""
+    rows = [('name', resume['name'], ''), ('contact', f"{resume['phone']} | {resume['email']} | {resume['links']}", '')]
+    rows.append(('heading', 'Education', ''))
+    for (university, city), (degree, dates) in resume['education']:
+        rows += [('bold', university, city), ('italic', degree, dates)]
+    rows.append(('heading', 'Experience', ''))
+    for (title, dates), (company, city), bullets in resume['experience']:
+        rows += [('bold', title, dates), ('italic', company, city)]
+        rows += [('bullet', bullet, '') for bullet in bullets]
+    rows.append(('heading', 'Projects', ''))
+    for (title, dates), bullets in resume['projects']:
+        rows.append(('bold', title, dates))
+        rows += [('bullet', bullet, '') for bullet in bullets]
+    rows.append(('heading', 'Technical Skills', ''))
+    rows += [('text', line, '') for line in resume['skill_lines']]
+    return rows
+
+def resume_text(resume):
+    # Plain text close to what the extractor returns; used to seed large pools
+    # without paying for PDF rendering and parsing
+    return '\n'.join(
+        f'{left} {right}'.strip() if style != 'bullet' else f'• {left}'
+        for style, left, right in resume_lines(resume)
+    ) + '\n'
+
+def resume_fields(resume):
+    """Extracted-field dict in the shape ResumeExtractor.extract_all_data returns."""
+    rows = resume_lines(resume)
+    sections, current = {}, None
+    for style, left, right in rows:
+        if style == 'heading':
+            current = sections.setdefault(left, [])
+        elif current is not None:
+            current.append(f'{left} {right}'.strip())
+    return {
+        'raw_text': resume_text(resume),
+        'name': resume['name'],
+        'email': resume['email'],
+        'phone': resume['phone'],
+        'education': '\n'.join(sections['Education']),
+        'experience': '\n'.join(sections['Experience']),
+        'skills': ', '.join(resume['skills']),
+    }
+
+def render_resume_pdf(resume, min_pages=1):
+    """Render a resume to PDF bytes, repeating experience until min_pages is reached."""
+    rows = resume_lines(resume)
+    if min_pages > 1:
+        # Pad with extra experience entries; ~50 rows fill a page
+        experience_end = next(i for i, row in enumerate(rows) if row[1] == 'Projects')
+        extra = []
+        while len(rows) + len(extra) < min_pages * 52:
+            for (title, dates), (company, city), bullets in resume['experience']:
+                extra += [('bold', title, dates), ('italic', company, city)]
+                extra += [('bullet', bullet, '') for bullet in bullets]
+        rows = rows[:experience_end] + extra + rows[experience_end:]
+
+    styles = {
+        'name': ('bold', 20, 26), 'contact': ('regular', 9, 20), 'heading': ('bold', 12, 18),
+        'bold': ('bold', 10, 13), 'italic': ('regular', 9, 13), 'bullet': ('regular', 9, 12),
+        'text': ('regular', 9, 12),
+    }
+    margin = 40
+    document = PDFDocument()
+    page, y = document.add_page(), PAGE_HEIGHT - margin
+    for style, left, right in rows:
+        font, size, leading = styles[style]
+        if y - leading < margin:
+            page, y = document.add_page(), PAGE_HEIGHT - margin
+        y -= leading
+        if style in ('name', 'contact'):
+            x = (PAGE_WIDTH - text_width(left, size)) / 2
+            document.draw(page, max(x, margin), y, left, size, font)
+        elif style == 'bullet':
+            document.draw(page, margin + 8, y, f'• {left}', size, font)
+        else:
+            document.draw(page, margin, y, left, size, font)
+        if right:
+            document.draw(page, PAGE_WIDTH - margin - text_width(right, size), y, right, size, font)
+    return document.to_bytes()
+
+def make_job_posting(rng, n_skills=8):
+    skills = rng.sample(SKILLS, min(n_skills, len(SKILLS)))
+    title = rng.choice(TITLES)
+    years = rng.randint(0, 8)
+    description = (
+        f'We are hiring a {title} to join our {rng.choice(DEPARTMENTS)} team. '
+        f'You will work with {", ".join(skills)} to build reliable products. '
+        f'{" ".join(make_bullet(rng, skills) + "." for _ in range(4))} '
+        f'Requires {years}+ years of experience and a Bachelor degree in Computer Science or similar.'
+    )
+    return {
+        'title': title,
+        'department': rng.choice(DEPARTMENTS),
+        'location': rng.choice(LOCATIONS),
+        'description': description,
+        'required_skills': ', '.join(skills),
+        'experience_required': years,
+    }
+
+def write_corpus(out_dir, count, jobs=5, seed=0, pages=1):
+    """Write `count` resume PDFs and a jobs.json with `jobs` postings; returns the paths."""
+    rng = random.Random(seed)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = out_dir / f'resume-{i:06d}.pdf'
+        path.write_bytes(render_resume_pdf(make_resume(rng), min_pages=pages))
+        paths.append(path)
+    job_postings = [make_job_posting(rng) for _ in range(jobs)]
+    (out_dir / 'jobs.json').write_text(json.dumps(job_postings, indent=2))
+    return paths
@@ -0,0 +1,101 @@
+"""Microbenchmarks for each extractor and scorer function."""
+
+import random
+import tempfile
+from pathlib import Path
+
+from evaluator.models import JobPosting, Resume
+from evaluator.utils.evaluator import ResumeEvaluator
+from evaluator.utils.features import compute_features
+from evaluator.utils.job_profiles import compute_job_profile, job_term_counts, top_keywords
+from evaluator.utils.pdf_extractor import ResumeExtractor
+from evaluator.utils.skill_matcher import SkillMatcher
+from evaluator.utils.vectorizer import CorpusVectorizer
+
+from .corpus import SKILLS, make_job_posting, make_resume, render_resume_pdf, resume_fields
+from .timing import measure
+
+PAGE_COUNTS = [1, 3, 10]
+SKILL_COUNTS = [5, 20, 80]
+MODEL_CORPUS_SIZE = 500
+
+def extractor_benchmarks(rng, repeat):
+    results = {}
+    extractor = ResumeExtractor()
+    resume = make_resume(rng)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for pages in PAGE_COUNTS:
+            path = Path(tmp_dir) / f'resume-{pages}.pdf'
+            path.write_bytes(render_resume_pdf(resume, min_pages=pages))
+            text = extractor.extract_text_from_pdf(path)
+            sections = extractor.segment_sections(text)
+            suffix = f'pages={pages}'
+
+            results[f'extract.text_from_pdf.{suffix}'] = measure(lambda: extractor.extract_text_from_pdf(path), repeat)
+            results[f'extract.segment_sections.{suffix}'] = measure(lambda: extractor.segment_sections(text), repeat)
+            results[f'extract.contact_info.{suffix}'] = measure(lambda: extractor.extract_contact_info(text, sections), repeat)
+            results[f'extract.education.{suffix}'] = measure(lambda: extractor.extract_education(sections), repeat)
+            results[f'extract.experience.{suffix}'] = measure(lambda: extractor.extract_experience(sections), repeat)
+            results[f'extract.skills.{suffix}'] = measure(lambda: extractor.extract_skills(sections), repeat)
+            results[f'extract.all_data.{suffix}'] = measure(lambda: extractor.extract_all_data(path), repeat)
+    return results
+
+def clear_job_caches(model):
+    top_keywords.cache_clear()
+    job_term_counts.cache_clear()
+    model._job_cache.clear()
+
+def scorer_benchmarks(rng, repeat):
+    results = {}
+    evaluator = ResumeEvaluator()
+    resume = Resume(id=1, **resume_fields(make_resume(rng)))
+    job = JobPosting(id=1, **make_job_posting(rng))
+    text = evaluator.get_skill_text(resume)
+
+    for count in SKILL_COUNTS:
+        skills = (SKILLS * (count // len(SKILLS) + 1))[:count]
+        suffix = f'skills={count}'
+        # Cold: automaton construction; warm: lookup through the compiled cache
+        results[f'score.skill_matcher_build.{suffix}'] = measure(lambda: SkillMatcher(tuple(skills)), repeat)
+        results[f'score.skill_match.{suffix}'] = measure(lambda: evaluator.calculate_skill_match(text, skills), repeat)
+
+    results['score.experience'] = measure(
+        lambda: evaluator.calculate_experience_score(resume.raw_text, job.experience_required), repeat
+    )
+    results['score.education'] = measure(
+        lambda: evaluator.calculate_education_score(resume.education, job.description), repeat
+    )
+    results['score.cosine_pairwise'] = measure(
+        lambda: evaluator.calculate_cosine_similarity(resume.raw_text, job.description), repeat
+    )
+    results['score.keyword_highlights'] = measure(
+        lambda: evaluator.extract_keyword_highlights(resume.raw_text, job.description), repeat
+    )
+    results['score.fingerprint'] = measure(lambda: evaluator.get_fingerprint(resume, job), repeat)
+    results['score.evaluate_resume.no_model'] = measure(lambda: evaluator.evaluate_resume(resume, job), repeat)
+
+    # The production path scores against the fitted corpus model
+    corpus = [resume_fields(make_resume(rng))['raw_text'] for _ in range(MODEL_CORPUS_SIZE)]
+    model = CorpusVectorizer.fit(corpus)
+    model.save()
+    model.activate()
+    results['score.corpus_similarity'] = measure(
+        lambda: evaluator.calculate_corpus_similarity([resume], job.description, model), repeat
+    )
+    results['score.evaluate_resume'] = measure(lambda: evaluator.evaluate_resume(resume, job), repeat)
+    # Job-side cost paid once per job; evaluate_resume reuses the cached profile
+    results['score.compile_job_profile'] = measure(
+        lambda: compute_job_profile(job, model), repeat, setup=lambda: clear_job_caches(model)
+    )
+
+    # Re-scoring a resume whose parsed features are already stored
+    results['score.compute_features'] = measure(lambda: compute_features(resume), repeat)
+    resume.features = compute_features(resume)
+    results['score.evaluate_resume.features'] = measure(lambda: evaluator.evaluate_resume(resume, job), repeat)
+    return results
+
+def run(seed=0, repeat=20):
+    rng = random.Random(seed)
+    results = extractor_benchmarks(rng, repeat)
+    results.update(scorer_benchmarks(rng, repeat))
+    return results
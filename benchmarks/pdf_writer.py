@@ -0,0 +1,101 @@
+"""Minimal PDF writer for synthetic resumes.
+
+Writes just enough of PDF 1.4 for PyPDF2 to extract the text: one content
+stream per page, the two standard Helvetica fonts (no embedding) and a
+cross-reference table. Keeping this in-tree avoids a reportlab dependency.
+"""
+
+PAGE_WIDTH = 612   # US Letter, in points
+PAGE_HEIGHT = 792
+
+FONTS = {
+    'regular': ('F1', 'Helvetica'),
+    'bold': ('F2', 'Helvetica-Bold'),
+}
+
+def escape_text(text):
+    # Literal string: escape delimiters, write non-ASCII as cp1252 octal escapes
+    out = []
+    for byte in text.encode('cp1252', errors='replace'):
+        char = chr(byte)
+        if char in '\\()':
+            out.append('\\' + char)
+        elif 32 <= byte < 127:
+            out.append(char)
+        else:
+            out.append(f'\\{byte:03o}')
+    return ''.join(out)
+
+def text_width(text, size):
+    # Rough Helvetica advance (average glyph ~0.5 em); only used for layout
+    return len(text) * size * 0.5
+
+class PDFDocument:
+    """Collects pages of positioned text lines and serializes them to bytes."""
+
+    def __init__(self):
+        self.pages = []
+
+    def add_page(self):
+        page = []
+        self.pages.append(page)
+        return page
+
+    @staticmethod
+    def draw(page, x, y, text, size=10, font='regular'):
+        page.append((x, y, size, FONTS[font][0], text))
+
+    def content_stream(self, page):
+        ops = ['BT']
+        for x, y, size, font_name, text in page:
+            ops.append(f'/{font_name} {size} Tf 1 0 0 1 {x:.2f} {y:.2f} Tm ({escape_text(text)}) Tj')
+        ops.append('ET')
+        return '\n'.join(ops).encode('latin-1')
+
+    def to_bytes(self):
+        # Object numbers: 1 catalog, 2 page tree, 3-4 fonts, then (page, content) pairs
+        objects = {}
+        page_ids = []
+        font_ids = {}
+        next_id = 3
+        for font_name, base_font in FONTS.values():
+            font_ids[font_name] = next_id
+            objects[next_id] = (
+                f'<< /Type /Font /Subtype /Type1 /BaseFont /{base_font} '
+                f'/Encoding /WinAnsiEncoding >>'
+            ).encode('latin-1')
+            next_id += 1
+
+        fonts = ' '.join(f'/{name} {obj_id} 0 R' for name, obj_id in font_ids.items())
+        for page in self.pages:
+            page_id, content_id = next_id, next_id + 1
+            next_id += 2
+            page_ids.append(page_id)
+            stream = self.content_stream(page)
+            objects[content_id] = (
+                f'<< /Length {len(stream)} >>\nstream\n'.encode('latin-1') + stream + b'\nendstream'
+            )
+            objects[page_id] = (
+                f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+                f'/Resources << /Font << {fonts} >> >> /Contents {content_id} 0 R >>'
+            ).encode('latin-1')
+
+        objects[1] = b'<< /Type /Catalog /Pages 2 0 R >>'
+        kids = ' '.join(f'{page_id} 0 R' for page_id in page_ids)
+        objects[2] = f'<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>'.encode('latin-1')
+
+        out = bytearray(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        offsets = {}
+        for obj_id in sorted(objects):
+            offsets[obj_id] = len(out)
+            out += f'{obj_id} 0 obj\n'.encode('latin-1') + objects[obj_id] + b'\nendobj\n'
+
+        xref_offset = len(out)
+        size = max(objects) + 1
+        out += f'xref\n0 {size}\n0000000000 65535 f \n'.encode('latin-1')
+        for obj_id in range(1, size):
+            out += f'{offsets[obj_id]:010d} 00000 n \n'.encode('latin-1')
+        out += (
+            f'trailer\n<< /Size {size} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n'
+        ).encode('latin-1')
+        return bytes(out)
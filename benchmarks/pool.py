@@ -0,0 +1,65 @@
+"""Pool-scale benchmarks: one job posting against 1k, 10k, 100k resumes."""
+
+import io
+import random
+
+from django.core.management import call_command
+
+from evaluator.models import Evaluation, JobPosting, Resume
+from evaluator.views import JobPostingViewSet, SCORED_RESUME_FIELDS
+from evaluator.utils.evaluator import ResumeEvaluator
+from evaluator.utils.features import save_features
+from evaluator.utils.pool_stats import job_pool_stats
+from evaluator.utils.retrieval import shortlist_candidates
+from evaluator.utils.search import search_resumes
+
+from .corpus import make_job_posting, make_resume, resume_fields
+from .timing import measure
+
+DEFAULT_SIZES = [1000, 10000]
+INSERT_BATCH_SIZE = 2000
+
+def grow_pool(rng, size):
+    # Pools are nested: growing from 1k to 10k only inserts the difference.
+    # Rows carry extracted fields directly; PDF parsing is covered by micro
+    missing = size - Resume.objects.count()
+    while missing > 0:
+        batch = min(missing, INSERT_BATCH_SIZE)
+        resumes = Resume.objects.bulk_create([
+            Resume(status='done', **resume_fields(make_resume(rng))) for _ in range(batch)
+        ])
+        save_features(resumes)
+        missing -= batch
+
+def run(sizes=None, seed=0):
+    rng = random.Random(seed)
+    results = {}
+    evaluator = ResumeEvaluator()
+    job = JobPosting.objects.create(**make_job_posting(rng))
+    score_pool = JobPostingViewSet().score_pool
+
+    for size in sorted(sizes or DEFAULT_SIZES):
+        grow_pool(rng, size)
+        suffix = f'n={size}'
+        repeat = 3 if size <= 10000 else 1
+
+        # Fit the corpus model, vectorize every resume and build the LSA index
+        results[f'pool.refit_tfidf.{suffix}'] = measure(
+            lambda: call_command('refit_tfidf', '--force', stdout=io.StringIO()), repeat=1, warmup=0
+        )
+
+        resumes = list(Resume.objects.only(*SCORED_RESUME_FIELDS).select_related('features'))
+        results[f'pool.evaluate_batch.{suffix}'] = measure(
+            lambda: evaluator.evaluate_batch(resumes, job), repeat=repeat, warmup=0
+        )
+
+        pool = Resume.objects.filter(status='done')
+        results[f'pool.rank_cold.{suffix}'] = measure(
+            lambda: score_pool(job, pool), repeat=repeat, warmup=0,
+            setup=lambda: Evaluation.objects.filter(job_posting=job).delete(),
+        )
+        results[f'pool.rank_cached.{suffix}'] = measure(lambda: score_pool(job, pool), repeat=repeat)
+        results[f'pool.candidates.{suffix}'] = measure(lambda: shortlist_candidates(job.description, 50), repeat=repeat)
+        results[f'pool.stats.{suffix}'] = measure(lambda: job_pool_stats(job), repeat=repeat)
+        results[f'pool.search.{suffix}'] = measure(lambda: search_resumes('python docker', 20), repeat=repeat)
+    return results
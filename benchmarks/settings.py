@@ -0,0 +1,17 @@
+# Benchmarks run against a throwaway database, media and model directory so
+# they never touch the development data. Set BENCHMARK_DIR to keep them.
+import os
+import tempfile
+from pathlib import Path
+
+from resume_evaluator.settings import *  # noqa: F401,F403
+
+BENCHMARK_DIR = Path(os.environ.get('BENCHMARK_DIR') or tempfile.mkdtemp(prefix='resume-bench-'))
+
+DEBUG = False  # no per-query logging during the large pool runs
+ALLOWED_HOSTS = ['*']
+DATABASES['default']['NAME'] = BENCHMARK_DIR / 'benchmark.sqlite3'  # noqa: F405
+MEDIA_ROOT = BENCHMARK_DIR / 'media'
+TFIDF_MODEL_DIR = BENCHMARK_DIR / 'tfidf_models'
+STATICFILES_DIRS = []
+RESUME_INGESTION_EAGER = True
@@ -0,0 +1,74 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+
+def measure(func, repeat=5, warmup=1, setup=None):
+    """Time func() `repeat` times after `warmup` untimed calls; seconds per call.
+
+    `setup`, if given, runs untimed before every call (e.g. to reset state).
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        func()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return {
+        'median': statistics.median(samples),
+        'min': min(samples),
+        'max': max(samples),
+        'repeat': repeat,
+    }
+
+def run_metadata():
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ''
+    return {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+    }
+
+def write_results(path, results):
+    with open(path, 'w') as f:
+        json.dump({'meta': run_metadata(), 'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+def compare(results, baseline, tolerance, min_delta=0.0005):
+    """Return (name, baseline time, current time, ratio, regressed) rows.
+
+    Runs are compared on their fastest sample, which is far less sensitive to
+    scheduler noise than the median on a shared CI runner. A benchmark
+    regresses when it is more than `tolerance` slower than the baseline and by
+    more than `min_delta` seconds, so jitter on tiny functions is not reported.
+    Benchmarks missing from the baseline get None for the baseline time and ratio.
+    """
+    rows = []
+    for name in sorted(results):
+        if name not in baseline:
+            rows.append((name, None, results[name]['min'], None, False))
+            continue
+        before = baseline[name]['min']
+        after = results[name]['min']
+        ratio = after / before if before else float('inf')
+        regressed = ratio > 1 + tolerance and after - before > min_delta
+        rows.append((name, before, after, ratio, regressed))
+    return rows
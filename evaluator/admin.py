@@ -1,5 +1,12 @@
 from django.contrib import admin
+from django.http import FileResponse, Http404
+from django.shortcuts import render
 from .models import JobPosting, Resume, Evaluation
+from .utils.profiling import SORT_KEYS, get_profile_path, list_profiles, load_profile, top_functions
+from .utils.search import search_resumes
+
+ADMIN_SEARCH_LIMIT = 1000
+PROFILE_TOP_FUNCTIONS = 50
 
 @admin.register(JobPosting)
 class JobPostingAdmin(admin.ModelAdmin):
@@ -10,9 +17,50 @@ class JobPostingAdmin(admin.ModelAdmin):
 class ResumeAdmin(admin.ModelAdmin):
     list_display = ['id', 'name', 'email', 'uploaded_at']
     search_fields = ['name', 'email']
+    
+    def get_search_results(self, request, queryset, search_term):
+        # Also match the resume text through the full-text index
+        queryset, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term:
+            hits = search_resumes(search_term, limit=ADMIN_SEARCH_LIMIT, status=None)
+            queryset |= self.model.objects.filter(id__in=[resume_id for resume_id, _, _ in hits])
+        return queryset, may_have_duplicates
 
 @admin.register(Evaluation)
 class EvaluationAdmin(admin.ModelAdmin):
     list_display = ['resume', 'job_posting', 'final_score', 'category', 'created_at']
+    list_select_related = ['resume', 'job_posting']
     list_filter = ['category', 'created_at']
-    search_fields = ['resume__name', 'job_posting__title']
\ No newline at end of file
+    search_fields = ['resume__name', 'job_posting__title']
+# Request profiles saved by ProfilingMiddleware; routed under admin/ in the project urls
+
+def profile_list(request):
+    return render(request, 'admin/evaluator/profile_list.html', {
+        **admin.site.each_context(request),
+        'title': 'Request profiles',
+        'profiles': list_profiles(),
+    })
+
+def profile_detail(request, name):
+    try:
+        metadata, stats = load_profile(name)
+    except (OSError, ValueError):
+        raise Http404('Profile not found')
+    sort = request.GET.get('sort', 'cumulative')
+    return render(request, 'admin/evaluator/profile_detail.html', {
+        **admin.site.each_context(request),
+        'title': f'Profile {name}',
+        'profile': metadata,
+        'total_calls': stats.total_calls,
+        'total_time': stats.total_tt,
+        'functions': top_functions(stats, sort, PROFILE_TOP_FUNCTIONS),
+        'sort': sort if sort in SORT_KEYS else 'cumulative',
+        'sort_keys': list(SORT_KEYS),
+    })
+
+def profile_download(request, name):
+    try:
+        path = get_profile_path(name, '.prof')
+        return FileResponse(path.open('rb'), as_attachment=True, filename=path.name)
+    except OSError:
+        raise Http404('Profile not found')
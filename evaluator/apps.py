@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_save
 
 
 class EvaluatorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'evaluator'
+    
+    def ready(self):
+        from .db import configure_sqlite_connection
+        from .models import JobPosting
+        from .utils.job_profiles import forget_job_profile, invalidate_job_profile
+        connection_created.connect(configure_sqlite_connection, dispatch_uid='evaluator.configure_sqlite_connection')
+        post_save.connect(invalidate_job_profile, sender=JobPosting, dispatch_uid='evaluator.invalidate_job_profile')
+        post_delete.connect(forget_job_profile, sender=JobPosting, dispatch_uid='evaluator.forget_job_profile')
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils import timezone
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
+from rest_framework.renderers import JSONRenderer
+
+from .models import JobPosting, Resume, Evaluation
+from .serializers import ResumeSerializer, EvaluationSerializer
+from .views import compute_time_ms, save_evaluation
+from .utils.claims import await_pair, claim_pair, release_pair
+from .utils.dedup import compute_content_hash, copy_extracted_fields, find_extracted_duplicate
+from .utils.evaluator import ResumeEvaluator, score_resume
+from .utils.features import save_features
+from .utils.ingestion import extraction_limits, ingestion_queue
+from .utils.job_profiles import load_job_profile
+from .utils.metrics import EVALUATIONS
+from .utils.pdf_extractor import extract_resume_path
+from .utils.process_pool import get_process_pool, reset_process_pool
+from .utils.single_flight import AsyncSingleFlight
+from .utils.timing import call_with_timings, merge_stage_timings, record_stage
+
+# Async endpoints for ASGI deployments: PDF parsing and scoring are awaited in
+# the shared process pool, so the event loop keeps serving other requests
+
+analyze_flight = AsyncSingleFlight()
+
+async def run_in_pool(func, *args):
+    # Returns (result, seconds spent in the worker); the worker's stage timings
+    # and the time spent queued for a free worker go into this request's timings
+    loop = asyncio.get_running_loop()
+    executor = get_process_pool()
+    start = time.perf_counter()
+    try:
+        result, stages, elapsed = await loop.run_in_executor(executor, call_with_timings, func, *args)
+    except BrokenProcessPool:
+        reset_process_pool(executor)
+        raise
+    merge_stage_timings(stages)
+    record_stage('pool.wait', time.perf_counter() - start - elapsed)
+    return result, elapsed
+
+def store_upload(serializer):
+    # Identical uploads reuse the stored extraction; new ones are claimed here
+    # ('processing') so the background ingestion worker leaves them alone
+    content_hash = compute_content_hash(serializer.validated_data['file'])
+    duplicate = find_extracted_duplicate(content_hash)
+    if duplicate:
+        resume = serializer.save(content_hash=content_hash, status='done',
+                                 **copy_extracted_fields(duplicate))
+        save_features([resume])
+        return resume, True
+    return serializer.save(content_hash=content_hash, status='processing',
+                           processing_started_at=timezone.now()), False
+
+async def extract_upload(path):
+    try:
+        return await run_in_pool(extract_resume_path, path, *extraction_limits())
+    except BrokenProcessPool:
+        # Another request's PDF may have killed the worker; retry once on the fresh pool
+        return await run_in_pool(extract_resume_path, path, *extraction_limits())
+
+def serialize(serializer_class, instance):
+    # Related names are read through the ORM, which is sync-only
+    return serializer_class(instance).data
+
+def render_json(data, status=200):
+    # Rendered like the DRF views, so both APIs return identical bodies
+    return HttpResponse(JSONRenderer().render(data), status=status, content_type='application/json')
+
+@csrf_exempt
+@require_POST
+async def upload_resume(request):
+    # Form fields and the file, as DRF's request.data would merge them
+    data = request.POST.copy()
+    data.update(request.FILES)
+    serializer = ResumeSerializer(data=data)
+    if not await sync_to_async(serializer.is_valid)():
+        return render_json(serializer.errors, status=400)
+
+    resume, reused = await sync_to_async(store_upload)(serializer)
+    if not reused:
+        # Same outcome as the ingestion queue: the row is kept as 'done' or 'failed'
+        try:
+            extracted_data, _ = await extract_upload(resume.file.path)
+        except Exception as e:
+            await sync_to_async(ingestion_queue.fail)(resume, e)
+        else:
+            await sync_to_async(ingestion_queue.finish)(resume, extracted_data)
+    return render_json(await sync_to_async(serialize)(ResumeSerializer, resume), status=201)
+
+async def evaluate_pair(resume, job_posting):
+    # Reuse the existing evaluation only if it was computed from the same inputs
+    fingerprint = ResumeEvaluator().get_fingerprint(resume, job_posting)
+    token = None
+    try:
+        while True:
+            existing_evaluation = await Evaluation.objects.filter(
+                resume=resume, job_posting=job_posting
+            ).afirst()
+
+            if existing_evaluation and existing_evaluation.fingerprint == fingerprint:
+                EVALUATIONS.inc(result='cached')
+                return existing_evaluation
+            if token is not None:
+                break
+
+            # Same claim as the sync view, so the two endpoints coalesce too
+            token = await sync_to_async(claim_pair)(resume, job_posting)
+            if token is None:
+                await await_pair(resume, job_posting)
+
+        # The profile is pickled along with the job, so the worker skips compiling it
+        await sync_to_async(load_job_profile)(job_posting)
+        evaluation_data, elapsed = await run_in_pool(score_resume, resume, job_posting)
+        evaluation_data['compute_time_ms'] = compute_time_ms(elapsed)
+        EVALUATIONS.inc(result='scored')
+        return await sync_to_async(save_evaluation)(
+            resume, job_posting, fingerprint, evaluation_data, existing_evaluation
+        )
+    finally:
+        if token is not None:
+            await sync_to_async(release_pair)(resume, job_posting, token)
+
+@csrf_exempt
+@require_POST
+async def analyze(request):
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return render_json({'error': 'Request body must be JSON'}, status=400)
+    if not isinstance(data, dict):
+        return render_json({'error': 'Request body must be a JSON object'}, status=400)
+
+    resume_id = data.get('resume_id')
+    job_posting_id = data.get('job_posting_id')
+    if not resume_id or not job_posting_id:
+        return render_json({'error': 'resume_id and job_posting_id are required'}, status=400)
+
+    try:
+        # Features travel with the resume to the worker process, which has no DB access
+        resume = await Resume.objects.select_related('features').aget(id=resume_id)
+        job_posting = await JobPosting.objects.aget(id=job_posting_id)
+    except (Resume.DoesNotExist, JobPosting.DoesNotExist, TypeError, ValueError):
+        return render_json({'detail': 'Not found.'}, status=404)
+
+    if resume.status != 'done':
+        return render_json({'error': f'Resume is not ready for analysis (status: {resume.status})'},
+                           status=409)
+
+    # The first request for a pair scores it; concurrent ones await the same task
+    evaluation = await analyze_flight.do((resume.id, job_posting.id), evaluate_pair, resume, job_posting)
+    return render_json(await sync_to_async(serialize)(EvaluationSerializer, evaluation))
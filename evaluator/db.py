@@ -0,0 +1,9 @@
+from django.conf import settings
+
+def configure_sqlite_connection(sender, connection, **kwargs):
+    # connection_created hook: per-connection PRAGMAs from settings.SQLITE_PRAGMAS
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from evaluator.models import Resume
+from evaluator.utils.retrieval import CandidateIndex
+from evaluator.utils.vectorizer import get_current_model
+
+
+class Command(BaseCommand):
+    help = (
+        "Build the LSA candidate index used by /api/job-postings/{id}/candidates/ "
+        "for the active TF-IDF model. refit_tfidf runs this automatically."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--components', type=int, default=None,
+                            help='Number of LSA dimensions (default: LSA_COMPONENTS)')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        model = get_current_model()
+        if model is None:
+            raise CommandError("No TF-IDF model fitted yet; run refit_tfidf first")
+
+        if not Resume.objects.filter(status='done').exists():
+            # Nothing extracted yet (refit_tfidf also fits on pending rows); the
+            # candidates endpoint answers 503 until the index is built
+            self.stdout.write("No extracted resumes to index yet; skipping the candidate index")
+            return
+
+        resumes = (
+            Resume.objects.filter(status='done')
+            .only('id', 'raw_text', 'tfidf_vector', 'tfidf_version')
+            .order_by('id')
+            .iterator(chunk_size=options['chunk_size'])
+        )
+        try:
+            index = CandidateIndex.build(resumes, model, options['components'], options['chunk_size'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        index.save()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Indexed {len(index.ids)} resumes with {index.vectors.shape[1]} LSA components "
+            f"for model {model.version}"
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from evaluator.models import Resume
+from evaluator.utils.ingestion import ingestion_queue
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the resume ingestion worker outside the web process. With --once, "
+        "drain the pending queue and exit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Process the current backlog and exit')
+
+    def handle(self, *args, **options):
+        if options['once']:
+            ingestion_queue.drain()
+            self.stdout.write(self.style.SUCCESS(
+                f"Queue drained, {Resume.objects.filter(status='failed').count()} failed resumes in total"
+            ))
+            return
+
+        self.stdout.write("Processing pending resumes (Ctrl+C to stop)")
+        ingestion_queue.run_forever()
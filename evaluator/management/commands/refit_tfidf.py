@@ -0,0 +1,91 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from evaluator.models import Resume
+from evaluator.utils.batching import iter_queryset_chunks
+from evaluator.utils.vectorizer import CorpusVectorizer, get_current_model, vectorize_resumes
+
+
+class Command(BaseCommand):
+    help = (
+        "Refit the corpus TF-IDF model when the resume corpus has drifted and "
+        "re-vectorize every resume. The new model only becomes active once all "
+        "vectors are written, so it is safe to run while the API is serving."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--force', action='store_true',
+                            help='Refit even if the corpus has not drifted')
+        parser.add_argument('--check', action='store_true',
+                            help='Only report the current drift')
+        parser.add_argument('--drift', type=float, default=settings.TFIDF_REFIT_DRIFT,
+                            help='Fraction of new resumes since the last fit that triggers a refit')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument('--keep', type=int, default=2,
+                            help='Number of model versions to keep on disk')
+
+    def handle(self, *args, **options):
+        current = get_current_model()
+        total = Resume.objects.count()
+
+        if current is None:
+            drift = 1.0
+            self.stdout.write(f"No TF-IDF model fitted yet ({total} resumes)")
+        else:
+            new_resumes = Resume.objects.filter(uploaded_at__gt=current.fitted_at).count()
+            drift = new_resumes / max(current.n_documents, 1)
+            self.stdout.write(
+                f"Model {current.version}: fitted on {current.n_documents} resumes, "
+                f"{new_resumes} uploaded since (drift {drift:.1%})"
+            )
+
+        if options['check']:
+            return
+        if not total:
+            self.stdout.write("No resumes to fit on")
+            return
+        if drift < options['drift'] and not options['force']:
+            self.stdout.write("Drift below threshold, nothing to do")
+            return
+
+        texts = Resume.objects.values_list('raw_text', flat=True).iterator(chunk_size=options['chunk_size'])
+        model = CorpusVectorizer.fit(texts)
+        model.save()
+        self.stdout.write(f"Fitted model {model.version} on {model.n_documents} resumes "
+                          f"({model.n_features} terms)")
+
+        vectorized = self.vectorize(Resume.objects.all(), model, options['chunk_size'])
+        model.activate()
+        # Catch resumes that were uploaded under the previous model while refitting
+        vectorized += self.vectorize(
+            Resume.objects.exclude(tfidf_version=model.version), model, options['chunk_size']
+        )
+        self.remove_old_models(options['keep'])
+        call_command('build_candidate_index', chunk_size=options['chunk_size'], stdout=self.stdout)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Activated model {model.version}, vectorized {vectorized} resumes"
+        ))
+
+    def vectorize(self, queryset, model, chunk_size):
+        count = 0
+        for chunk in iter_queryset_chunks(queryset.only('id', 'raw_text'), chunk_size):
+            vectorize_resumes(chunk, model)
+            with transaction.atomic():
+                Resume.objects.bulk_update(chunk, ['tfidf_vector', 'tfidf_version'])
+            count += len(chunk)
+        return count
+
+    def remove_old_models(self, keep):
+        model_dir = Path(settings.TFIDF_MODEL_DIR)
+        model_files = sorted(model_dir.glob('tfidf-*.pkl'), reverse=True)
+        for path in model_files[max(keep, 1):]:
+            version = path.stem.split('-', 1)[1]
+            path.unlink()
+            # Candidate indexes are built per TF-IDF version
+            for index_path in model_dir.glob(f'lsa-{version}*'):
+                index_path.unlink()
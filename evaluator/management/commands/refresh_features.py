@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from evaluator.models import Resume
+from evaluator.utils.batching import iter_queryset_chunks
+from evaluator.utils.features import FEATURES_VERSION, save_features
+
+
+class Command(BaseCommand):
+    help = (
+        "Compute the stored scoring features of extracted resumes that have none "
+        "or were computed by an older feature version. Run after upgrading; "
+        "resumes without features are still scored, just more slowly."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true',
+                            help='Recompute the features of every extracted resume')
+        parser.add_argument('--chunk-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        queryset = Resume.objects.filter(status='done')
+        if not options['all']:
+            queryset = queryset.exclude(features__version=FEATURES_VERSION)
+        queryset = queryset.only('id', 'raw_text', 'skills', 'education')
+
+        count = 0
+        for chunk in iter_queryset_chunks(queryset, options['chunk_size']):
+            with transaction.atomic():
+                save_features(chunk)
+            count += len(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Computed features for {count} resumes (version {FEATURES_VERSION})"
+        ))
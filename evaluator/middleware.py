@@ -0,0 +1,114 @@
+import cProfile
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from .utils.metrics import REQUEST_SECONDS, REQUESTS
+from .utils.profiling import profiling_requested, save_profile
+from .utils.timing import StageTimings, current_timings
+
+class ServerTimingMiddleware:
+    """Collects the stage timings of each request.
+
+    Stages timed while the view runs (PDF parsing, scoring, DB writes) are
+    sent back as a Server-Timing header and every response is counted in
+    the /metrics request histogram. Works under both WSGI and ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        timings, token, start = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, timings, start)
+
+    async def __acall__(self, request):
+        timings, token, start = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timings.reset(token)
+        return self.finish(request, response, timings, start)
+
+    def start(self):
+        timings = StageTimings()
+        return timings, current_timings.set(timings), time.perf_counter()
+
+    def finish(self, request, response, timings, start):
+        elapsed = time.perf_counter() - start
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        REQUEST_SECONDS.observe(elapsed, view=view, method=request.method)
+        REQUESTS.inc(view=view, method=request.method, status=response.status_code)
+        if settings.SERVER_TIMING:
+            response['Server-Timing'] = timings.server_timing(total=elapsed)
+        return response
+
+class ProfilingMiddleware:
+    """Runs a view under cProfile when the request carries PROFILING_TOKEN.
+
+    Send the token as an X-Profile-Token header or a ?_profile= query flag;
+    the profile is saved to PROFILING_DIR, its name is returned in an
+    X-Profile header and it can be browsed at /admin/profiles/. Without a
+    configured token the middleware is removed from the stack at startup.
+
+    Profiling happens in process_view, on the thread that runs the view, so
+    sync views are profiled under WSGI and ASGI alike. Async views are not:
+    their PDF parsing and scoring run in the process pool, out of reach of
+    an in-process profiler; profile the sync endpoints instead.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_TOKEN:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+            # Under ASGI a sync process_view would cost every request a thread hop
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if iscoroutinefunction(view_func) or not profiling_requested(request):
+            return None
+        return self.profile_view(request, view_func, view_args, view_kwargs)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if iscoroutinefunction(view_func) or not profiling_requested(request):
+            return None
+        # Same thread Django would run the sync view on
+        return await sync_to_async(self.profile_view, thread_sensitive=True)(
+            request, view_func, view_args, view_kwargs
+        )
+
+    def profile_view(self, request, view_func, view_args, view_kwargs):
+        profiler = cProfile.Profile()
+        start = time.perf_counter()
+        profiler.enable()
+        try:
+            response = view_func(request, *view_args, **view_kwargs)
+            if hasattr(response, 'render') and callable(response.render):
+                # Rendering (e.g. DRF serialization to JSON) is part of the cost
+                response = response.render()
+        finally:
+            profiler.disable()
+        response['X-Profile'] = save_profile(profiler, request, response, time.perf_counter() - start)
+        return response
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:10
+
+from django.db import migrations, models
+
+
+def mark_existing_resumes_done(apps, schema_editor):
+    # Resumes uploaded before the ingestion queue were extracted synchronously
+    Resume = apps.get_model('evaluator', 'Resume')
+    Resume.objects.update(status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0002_resume_tfidf_vector'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='error',
+            field=models.TextField(blank=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='processing_finished_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='processing_started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='pending', max_length=20),
+        ),
+        migrations.RunPython(mark_existing_resumes_done, migrations.RunPython.noop),
+    ]
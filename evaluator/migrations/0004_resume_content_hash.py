@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:13
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def hash_existing_files(apps, schema_editor):
+    Resume = apps.get_model('evaluator', 'Resume')
+    for resume in Resume.objects.exclude(file='').iterator():
+        sha256 = hashlib.sha256()
+        try:
+            with resume.file.open('rb') as f:
+                for chunk in f.chunks():
+                    sha256.update(chunk)
+        except (FileNotFoundError, OSError):
+            continue
+        resume.content_hash = sha256.hexdigest()
+        resume.save(update_fields=['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0003_resume_ingestion_status'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resume',
+            name='content_hash',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+        migrations.RunPython(hash_existing_files, migrations.RunPython.noop),
+    ]
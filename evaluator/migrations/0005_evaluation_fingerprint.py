@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0004_resume_content_hash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluation',
+            name='fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=64),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0006_list_ordering_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evaluation',
+            index=models.Index(fields=['job_posting', '-final_score'], name='evaluator_e_job_pos_be5df7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluation',
+            index=models.Index(fields=['job_posting', 'category'], name='evaluator_e_job_pos_97c0de_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evaluation',
+            index=models.Index(fields=['resume', 'job_posting'], name='evaluator_e_resume__061659_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:20
+
+from django.db import migrations, models
+
+
+def delete_duplicate_evaluations(apps, schema_editor):
+    # Concurrent analyze requests could insert the same pair twice; keep the newest row
+    Evaluation = apps.get_model('evaluator', 'Evaluation')
+    duplicates = (
+        Evaluation.objects.values('resume_id', 'job_posting_id')
+        .annotate(keep_id=models.Max('id'), count=models.Count('id'))
+        .filter(count__gt=1)
+    )
+    for row in duplicates:
+        Evaluation.objects.filter(
+            resume_id=row['resume_id'], job_posting_id=row['job_posting_id']
+        ).exclude(id=row['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0007_evaluation_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_evaluations, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='evaluation',
+            name='evaluator_e_resume__061659_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='evaluation',
+            constraint=models.UniqueConstraint(fields=('resume', 'job_posting'), name='unique_evaluation_per_pair'),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:22
+
+import json
+
+from django.db import migrations, models
+
+JSON_FIELDS = ['matched_skills', 'missing_skills', 'keyword_highlights']
+
+
+def normalize_json_text(apps, schema_editor):
+    # The columns held json.dumps output as text; blank or malformed values
+    # become an empty list so the column converts cleanly to JSON
+    Evaluation = apps.get_model('evaluator', 'Evaluation')
+    for evaluation in Evaluation.objects.only('id', *JSON_FIELDS).iterator(chunk_size=1000):
+        changed = []
+        for field in JSON_FIELDS:
+            try:
+                json.loads(getattr(evaluation, field))
+            except (TypeError, ValueError):
+                setattr(evaluation, field, '[]')
+                changed.append(field)
+        if changed:
+            evaluation.save(update_fields=changed)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0008_unique_evaluation_per_pair'),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_json_text, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='evaluation',
+            name='keyword_highlights',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='evaluation',
+            name='matched_skills',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AlterField(
+            model_name='evaluation',
+            name='missing_skills',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
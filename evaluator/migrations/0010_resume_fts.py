@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:30
+
+from django.db import migrations
+
+# External-content FTS5 index over the searchable resume columns. The index
+# stores only the inverted lists; text is read back from evaluator_resume.
+# Triggers keep it in sync on every insert, delete and relevant update.
+FTS_COLUMNS = 'name, skills, experience, education, raw_text'
+
+CREATE_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE evaluator_resume_fts USING fts5(
+        {FTS_COLUMNS},
+        content='evaluator_resume', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER evaluator_resume_fts_insert AFTER INSERT ON evaluator_resume BEGIN
+        INSERT INTO evaluator_resume_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.name, new.skills, new.experience, new.education, new.raw_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER evaluator_resume_fts_delete AFTER DELETE ON evaluator_resume BEGIN
+        INSERT INTO evaluator_resume_fts(evaluator_resume_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.name, old.skills, old.experience, old.education, old.raw_text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER evaluator_resume_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON evaluator_resume BEGIN
+        INSERT INTO evaluator_resume_fts(evaluator_resume_fts, rowid, {FTS_COLUMNS})
+        VALUES ('delete', old.id, old.name, old.skills, old.experience, old.education, old.raw_text);
+        INSERT INTO evaluator_resume_fts(rowid, {FTS_COLUMNS})
+        VALUES (new.id, new.name, new.skills, new.experience, new.education, new.raw_text);
+    END
+    """,
+    # Index the resumes that already exist
+    "INSERT INTO evaluator_resume_fts(evaluator_resume_fts) VALUES ('rebuild')",
+]
+
+DROP_SQL = [
+    "DROP TRIGGER IF EXISTS evaluator_resume_fts_insert",
+    "DROP TRIGGER IF EXISTS evaluator_resume_fts_delete",
+    "DROP TRIGGER IF EXISTS evaluator_resume_fts_update",
+    "DROP TABLE IF EXISTS evaluator_resume_fts",
+]
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        # FTS5 is SQLite-only; other backends fall back to icontains search
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0009_evaluation_json_fields'),
+    ]
+
+    operations = [
+        migrations.RunPython(run_sqlite(CREATE_SQL), run_sqlite(DROP_SQL)),
+    ]
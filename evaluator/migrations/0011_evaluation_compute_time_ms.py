@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0010_resume_fts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evaluation',
+            name='compute_time_ms',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
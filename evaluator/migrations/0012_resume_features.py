@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0011_evaluation_compute_time_ms'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeFeatures',
+            fields=[
+                ('resume', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='features', serialize=False, to='evaluator.resume')),
+                ('version', models.CharField(max_length=16)),
+                ('text_hash', models.CharField(max_length=64)),
+                ('normalized_text', models.TextField(blank=True)),
+                ('normalized_skills', models.TextField(blank=True)),
+                ('max_years', models.IntegerField(blank=True, null=True)),
+                ('experience_keywords', models.JSONField(blank=True, default=list)),
+                ('has_degree', models.BooleanField(default=False)),
+                ('has_computing_field', models.BooleanField(default=False)),
+                ('term_counts', models.JSONField(blank=True, default=dict)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0012_resume_features'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobProfile',
+            fields=[
+                ('job_posting', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='profile', serialize=False, to='evaluator.jobposting')),
+                ('version', models.CharField(max_length=16)),
+                ('source_hash', models.CharField(max_length=64)),
+                ('skills', models.JSONField(blank=True, default=list)),
+                ('top_keywords', models.JSONField(blank=True, default=list)),
+                ('requires_degree', models.BooleanField(default=False)),
+                ('term_counts', models.JSONField(blank=True, default=dict)),
+                ('tfidf_vector', models.BinaryField(blank=True, null=True)),
+                ('tfidf_version', models.CharField(blank=True, max_length=32)),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('evaluator', '0013_job_profile'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EvaluationClaim',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.CharField(max_length=32)),
+                ('claimed_at', models.DateTimeField()),
+                ('job_posting', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='evaluator.jobposting')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='evaluator.resume')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('resume', 'job_posting'), name='unique_evaluation_claim_per_pair')],
+            },
+        ),
+    ]
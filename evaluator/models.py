@@ -11,7 +11,7 @@ class JobPosting(models.Model):
     experience_required = models.IntegerField(validators=[MinValueValidator(0)])
     salary_min = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     salary_max = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     
     def __str__(self):
         return self.title
@@ -20,9 +20,57 @@ class JobPosting(models.Model):
     def skills_list(self):
         return [skill.strip() for skill in self.required_skills.split(',')]
 
+class JobProfile(models.Model):
+    """Resume-independent scoring inputs compiled from a job posting.
+
+    Compiled once per job and kept in an in-process LRU as well, so scoring
+    many resumes for one job pays the job-side text processing only once.
+    Saving the job posting drops its profile.
+    """
+    job_posting = models.OneToOneField(JobPosting, on_delete=models.CASCADE, primary_key=True, related_name='profile')
+    
+    # Profile compiler version; rows from an older version are recompiled
+    version = models.CharField(max_length=16)
+    # SHA-256 of the description and required skills the profile was compiled from
+    source_hash = models.CharField(max_length=64)
+    
+    # Normalized required skills, deduplicated in job order
+    skills = models.JSONField(default=list, blank=True)
+    # Most frequent description terms, matched against resumes as keyword highlights
+    top_keywords = models.JSONField(default=list, blank=True)
+    # Whether the description mentions an education keyword
+    requires_degree = models.BooleanField(default=False)
+    
+    # Description vector: TF-IDF term frequencies for the pairwise fallback,
+    # and the vector under the corpus model named by tfidf_version
+    term_counts = models.JSONField(default=dict, blank=True)
+    tfidf_vector = models.BinaryField(null=True, blank=True)
+    tfidf_version = models.CharField(max_length=32, blank=True)
+    
+    computed_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Profile for job posting {self.job_posting_id}"
+
 class Resume(models.Model):
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    
     file = models.FileField(upload_to='resumes/')
-    uploaded_at = models.DateTimeField(auto_now_add=True)
+    uploaded_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    
+    # SHA-256 of the uploaded PDF, used to skip re-parsing duplicate uploads
+    content_hash = models.CharField(max_length=64, blank=True, db_index=True)
+    
+    # Extraction status; pending rows are the ingestion queue
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    error = models.TextField(blank=True)
+    processing_started_at = models.DateTimeField(null=True, blank=True)
+    processing_finished_at = models.DateTimeField(null=True, blank=True)
     
     # Extracted data fields
     name = models.CharField(max_length=200, blank=True)
@@ -35,6 +83,18 @@ class Resume(models.Model):
     # Raw extracted text
     raw_text = models.TextField(blank=True)
     
+    # Sparse TF-IDF vector under the corpus model named by tfidf_version
+    tfidf_vector = models.BinaryField(null=True, blank=True)
+    tfidf_version = models.CharField(max_length=32, blank=True, db_index=True)
+    
+    class Meta:
+        indexes = [
+            # Finds resumes finished since the candidate index was built. Declared
+            # here rather than as db_index: AlterField rebuilds the SQLite table,
+            # which drops the full-text search triggers
+            models.Index(fields=['processing_finished_at'], name='evaluator_resume_finished_idx'),
+        ]
+    
     def __str__(self):
         return f"Resume {self.id} - {self.name or 'Unknown'}"
     
@@ -44,6 +104,54 @@ class Resume(models.Model):
             return [skill.strip() for skill in self.skills.split(',')]
         return []
 
+class ResumeFeatures(models.Model):
+    """Job-independent scoring inputs derived from a resume's text.
+
+    Computed once at extraction and again whenever the extracted fields are
+    edited, so scoring a resume against another job never re-parses its text.
+    """
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, primary_key=True, related_name='features')
+    
+    # Feature extraction version; rows from an older version are recomputed
+    version = models.CharField(max_length=16)
+    # SHA-256 of the raw text, skills and education the features were computed from
+    text_hash = models.CharField(max_length=64)
+    
+    # Lowercased word tokens of raw_text and of the skills field, space-separated
+    normalized_text = models.TextField(blank=True)
+    normalized_skills = models.TextField(blank=True)
+    
+    # Largest "N years" mention (null if none) and the experience keywords present
+    max_years = models.IntegerField(null=True, blank=True)
+    experience_keywords = models.JSONField(default=list, blank=True)
+    
+    # Education flags: a degree keyword, a computing field
+    has_degree = models.BooleanField(default=False)
+    has_computing_field = models.BooleanField(default=False)
+    
+    # TF-IDF term frequencies of the normalized text (English stop words removed)
+    term_counts = models.JSONField(default=dict, blank=True)
+    
+    computed_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"Features for resume {self.resume_id}"
+    
+    @property
+    def skill_text(self):
+        # Same tokens as normalizing the raw text and skills field together
+        return f"{self.normalized_text} {self.normalized_skills}"
+
+class EvaluationQuerySet(models.QuerySet):
+    def with_related(self):
+        # Join the resume and job for the serializer's names, without reading
+        # their large text columns or the stored TF-IDF vector
+        return self.select_related('resume', 'job_posting').defer(
+            'resume__raw_text', 'resume__tfidf_vector', 'resume__education', 
+            'resume__experience', 'resume__skills', 'resume__error',
+            'job_posting__description', 'job_posting__required_skills',
+        )
+
 class Evaluation(models.Model):
     SCORE_CATEGORIES = [
         ('excellent', 'Excellent (80-100)'),
@@ -68,11 +176,29 @@ class Evaluation(models.Model):
     category = models.CharField(max_length=20, choices=SCORE_CATEGORIES)
     
     # Additional analysis data
-    matched_skills = models.TextField(blank=True)  # JSON
-    missing_skills = models.TextField(blank=True)  # JSON
-    keyword_highlights = models.TextField(blank=True)  # JSON
+    matched_skills = models.JSONField(default=list, blank=True)
+    missing_skills = models.JSONField(default=list, blank=True)
+    keyword_highlights = models.JSONField(default=list, blank=True)
+    
+    # Hash of the resume/job inputs and algorithm version the scores were computed from
+    fingerprint = models.CharField(max_length=64, blank=True, db_index=True)
+    
+    # Scoring time, recorded when EVALUATION_RECORD_COMPUTE_TIME is on
+    compute_time_ms = models.FloatField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     
-    created_at = models.DateTimeField(auto_now_add=True)
+    objects = EvaluationQuerySet.as_manager()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['job_posting', '-final_score']),
+            models.Index(fields=['job_posting', 'category']),
+        ]
+        constraints = [
+            # One evaluation per pair; its index also serves resume/job lookups
+            models.UniqueConstraint(fields=['resume', 'job_posting'], name='unique_evaluation_per_pair'),
+        ]
     
     def __str__(self):
         return f"Evaluation for {self.resume.name} - {self.final_score:.2f}"
@@ -85,4 +211,26 @@ class Evaluation(models.Model):
         elif score >= 40:
             return 'average'
         else:
-            return 'below_average'
\ No newline at end of file
+            return 'below_average'
+
+class EvaluationClaim(models.Model):
+    """Marks a (resume, job) pair as being scored by one process.
+
+    Taken before an analyze request scores a pair, so identical requests
+    served by other workers wait for that result instead of scoring it again.
+    Claims older than EVALUATION_CLAIM_TIMEOUT are treated as abandoned.
+    """
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE)
+    job_posting = models.ForeignKey(JobPosting, on_delete=models.CASCADE)
+    
+    # Identifies the holder, so only it releases the claim
+    token = models.CharField(max_length=32)
+    claimed_at = models.DateTimeField()
+    
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['resume', 'job_posting'], name='unique_evaluation_claim_per_pair'),
+        ]
+    
+    def __str__(self):
+        return f"Claim on resume {self.resume_id} / job posting {self.job_posting_id}"
@@ -0,0 +1,11 @@
+from rest_framework.pagination import CursorPagination
+
+class NewestFirstCursorPagination(CursorPagination):
+    # Keyset pagination: every page is an indexed range scan, however deep
+    ordering = '-created_at'
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+
+class UploadedAtCursorPagination(NewestFirstCursorPagination):
+    ordering = '-uploaded_at'
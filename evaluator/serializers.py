@@ -1,17 +1,55 @@
 from rest_framework import serializers
 from .models import JobPosting, Resume, Evaluation
 
-class JobPostingSerializer(serializers.ModelSerializer):
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """Serializer that can be narrowed with `fields` or `exclude` keyword arguments."""
+    
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        exclude = kwargs.pop('exclude', None)
+        super().__init__(*args, **kwargs)
+        
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+        for field_name in exclude or []:
+            self.fields.pop(field_name, None)
+
+class JobPostingSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = JobPosting
         fields = '__all__'
 
-class ResumeSerializer(serializers.ModelSerializer):
+class ResumeSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Resume
-        fields = '__all__'
+        exclude = ['tfidf_vector']
+        read_only_fields = [
+            'status', 'error', 'processing_started_at', 'processing_finished_at', 'tfidf_version',
+            # Set from the uploaded bytes only; a client-chosen hash would poison deduplication
+            'content_hash',
+        ]
+
+class ResumeStatusSerializer(serializers.ModelSerializer):
+    queue_seconds = serializers.SerializerMethodField()
+    processing_seconds = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = Resume
+        fields = ['id', 'status', 'error', 'uploaded_at', 'processing_started_at', 
+                  'processing_finished_at', 'queue_seconds', 'processing_seconds']
+    
+    def get_queue_seconds(self, obj):
+        if obj.processing_started_at:
+            return (obj.processing_started_at - obj.uploaded_at).total_seconds()
+        return None
+    
+    def get_processing_seconds(self, obj):
+        if obj.processing_started_at and obj.processing_finished_at:
+            return (obj.processing_finished_at - obj.processing_started_at).total_seconds()
+        return None
 
-class EvaluationSerializer(serializers.ModelSerializer):
+class EvaluationSerializer(DynamicFieldsModelSerializer):
     resume_name = serializers.CharField(source='resume.name', read_only=True)
     job_title = serializers.CharField(source='job_posting.title', read_only=True)
     
@@ -1,3 +1,847 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import tempfile
+import time
+import zipfile
+from collections import Counter
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import PyPDF2
+from benchmarks.pdf_writer import PAGE_HEIGHT, PDFDocument
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from .models import Evaluation, EvaluationClaim, JobPosting, JobProfile, Resume, ResumeFeatures
+from .utils.claims import claim_pair, release_pair
+from .utils.evaluator import ResumeEvaluator, tfidf_from_counts
+from .utils.features import get_features, normalize_text, save_features, term_analyzer
+from .utils.ingestion import extract_in_parallel, extraction_limits, ingestion_queue
+from .utils.job_profiles import get_cached_profile, load_job_profile
+from .utils.pdf_extractor import ResumeExtractor, extract_resume_path
+from .utils.process_pool import get_process_pool, reset_process_pool
+from .utils.profiling import list_profiles
+from .utils.retrieval import get_current_index, shortlist_candidates
+from .utils.search import fallback_search, parse_terms, search_resumes
+from .utils.skill_matcher import SkillMatcher
+from .utils.vectorizer import get_current_model, resume_vectors
+from .views import STATS_MAX_TOP_SKILLS
+
+RESUME_TEXTS = [
+    "Backend developer with 5 years of Python and Django experience. Built REST APIs and led a team.",
+    "Data scientist: machine learning, pandas, numpy and SQL. Developed forecasting models for 3 years.",
+    "Frontend engineer working with React, TypeScript and CSS. Created design systems.",
+    "DevOps engineer managing Docker, Kubernetes and AWS infrastructure for 7 yrs.",
+    "Recent graduate, bachelor degree in computer science, internships in Java and Python.",
+]
+
+def make_resume(text, **fields):
+    fields.setdefault('education', 'Bachelor of Science in Computer Science')
+    fields.setdefault('skills', 'Python, SQL')
+    return Resume.objects.create(status='done', raw_text=text, **fields)
+
+def make_job(**fields):
+    fields.setdefault('title', 'Backend Engineer')
+    fields.setdefault('department', 'Engineering')
+    fields.setdefault('location', 'Remote')
+    fields.setdefault('description', "We need a backend engineer with Python, Django and SQL "
+                                     "experience. A degree in computer science is preferred.")
+    fields.setdefault('required_skills', 'Python, Django, SQL, Docker')
+    fields.setdefault('experience_required', 3)
+    return JobPosting.objects.create(**fields)
+
+SAMPLE_RESUME_LINES = [
+    'Ada Lovelace',
+    'ada@example.com | 555-123-4567',
+    'Professional Summary',
+    'Backend engineer who has worked on job schedulers.',
+    'Work Experience',
+    'Backend developer at Analytical Engines, 5 years',
+    'Led a team of 4 and managed the work queue',
+    'Education:',
+    'Bachelor of Science in Computer Science',
+    'Technical Skills',
+    '• Python • Django',
+    '• SQL',
+    'Skills in leadership are listed under experience',
+]
+
+def make_pdf(pages):
+    # One line of text per row, top to bottom, for each page
+    document = PDFDocument()
+    for lines in pages:
+        page = document.add_page()
+        for row, line in enumerate(lines):
+            document.draw(page, 40, PAGE_HEIGHT - 60 - 14 * row, line)
+    return document.to_bytes()
+
+def extract_or_crash(path, max_pages=None, max_chars=None):
+    # Stand-in extractor run in pool workers: a "crash" PDF kills its worker
+    # while the others are still in flight
+    if 'crash' in os.path.basename(path):
+        os._exit(1)
+    time.sleep(0.2)
+    return {'raw_text': RESUME_TEXTS[0], 'skills': 'Python, Django'}
+
+def discard_process_pool():
+    # Tests start and end without worker processes left from another test
+    reset_process_pool(get_process_pool())
+
+class EvaluatorTestCase(TestCase):
+    # Each test starts without a corpus model, in its own TF-IDF model directory
+    def setUp(self):
+        model_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(model_dir.cleanup)
+        self.enterContext(override_settings(TFIDF_MODEL_DIR=model_dir.name))
+        self.evaluator = ResumeEvaluator()
+
+class SkillMatcherTests(TestCase):
+    def test_skills_match_on_word_boundaries(self):
+        matcher = SkillMatcher(['java', 'c', 'sql'])
+        self.assertEqual(matcher.match('javascript and c++ developer mysql'), ([], ['java', 'c', 'sql']))
+        self.assertEqual(matcher.match('java and c developer with sql'), (['java', 'c', 'sql'], []))
+
+    def test_multi_token_and_overlapping_skills(self):
+        matcher = SkillMatcher(['machine learning', 'learning', 'deep machine learning', 'node js'])
+        matched, missing = matcher.match('applied machine learning with node js')
+        self.assertEqual(matched, ['machine learning', 'learning', 'node js'])
+        self.assertEqual(missing, ['deep machine learning'])
+        # Tokens must be adjacent and in order
+        self.assertEqual(matcher.match('learning machine js node')[0], ['learning'])
+
+    def test_skills_are_deduplicated_in_job_order(self):
+        matcher = SkillMatcher(['python', '', 'sql', 'python'])
+        self.assertEqual(matcher.skills, ['python', 'sql'])
+        self.assertEqual(matcher.match('sql only'), (['sql'], ['python']))
+
+class TfidfFromCountsTests(TestCase):
+    def test_matches_sklearn(self):
+        texts = [normalize_text(text) for text in RESUME_TEXTS]
+        documents = [Counter(term_analyzer(text)) for text in texts]
+        for max_features in (None, 1, 5, 20, 1000):
+            expected = TfidfVectorizer(stop_words='english', max_features=max_features).fit_transform(texts)
+            actual = tfidf_from_counts(documents, max_features)
+            self.assertEqual(actual.shape, expected.shape, max_features)
+            self.assertTrue(np.allclose(actual.toarray(), expected.toarray()), max_features)
+
+    def test_empty_vocabulary_raises_like_sklearn(self):
+        with self.assertRaises(ValueError):
+            tfidf_from_counts([{}, {}])
+
+class SectionSegmentationTests(TestCase):
+    def test_extracted_fields_come_from_their_sections(self):
+        data = ResumeExtractor().extract_all_data(io.BytesIO(make_pdf([SAMPLE_RESUME_LINES])))
+        self.assertEqual((data['name'], data['email'], data['phone']), ('Ada Lovelace', 'ada@example.com', '555-123-4567'))
+        self.assertEqual(data['education'], 'Bachelor of Science in Computer Science')
+        self.assertEqual(data['experience'], 'Backend developer at Analytical Engines, 5 years\n'
+                                             'Led a team of 4 and managed the work queue')
+        self.assertEqual(data['skills'], ', Python , Django , SQL Skills in leadership are listed under experience')
+
+    def test_headings_are_whole_lines(self):
+        sections = ResumeExtractor().segment_sections(
+            'Jane Doe\nWORK   HISTORY :\nWorked on a job board\nSkills in Python\nskills\nGo'
+        )
+        self.assertEqual(sections, {
+            'header': ['Jane Doe'],
+            'experience': ['Worked on a job board', 'Skills in Python'],
+            'skills': ['Go'],
+        })
+
+    def test_repeated_heading_extends_its_section(self):
+        sections = ResumeExtractor().segment_sections('Education\nBSc\nProjects\nCompiler\nEducation\nMSc')
+        self.assertEqual(sections['education'], ['BSc', 'MSc'])
+        self.assertEqual(sections['projects'], ['Compiler'])
+
+class ExtractionBudgetTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.pages = [[f'Page {number} line {row}' for row in range(3)] for number in range(1, 6)]
+        self.pdf = make_pdf(self.pages)
+
+    def extract_text(self, **limits):
+        with mock.patch.object(PyPDF2.PageObject, 'extract_text', autospec=True,
+                               side_effect=PyPDF2.PageObject.extract_text) as page_text:
+            text = ResumeExtractor(**limits).extract_text_from_pdf(io.BytesIO(self.pdf))
+        return text, page_text.call_count
+
+    def test_page_budget_stops_reading(self):
+        text, pages_read = self.extract_text(max_pages=2)
+        self.assertEqual(pages_read, 2)
+        self.assertEqual(text, ''.join('\n'.join(lines) + '\n' for lines in self.pages[:2]))
+
+    def test_char_budget_truncates(self):
+        full_text, _ = self.extract_text()
+        text, pages_read = self.extract_text(max_chars=30)
+        self.assertEqual(pages_read, 1)
+        self.assertEqual(text, full_text[:30] + '\n')
+
+    def test_char_budget_across_pages(self):
+        full_text, _ = self.extract_text()
+        max_chars = len(full_text) // 3
+        text, pages_read = self.extract_text(max_chars=max_chars)
+        self.assertLess(pages_read, len(self.pages))
+        # Budget spent on page text; each page read is followed by one newline
+        self.assertEqual(len(text), max_chars + pages_read)
+        self.assertTrue(full_text.startswith(text[:-1]))
+
+    def test_stored_uploads_use_the_configured_budget(self):
+        path = os.path.join(self.enterContext(tempfile.TemporaryDirectory()), 'long.pdf')
+        with open(path, 'wb') as f:
+            f.write(self.pdf)
+        with override_settings(PDF_MAX_PAGES=1, PDF_MAX_CHARS=200000):
+            data = extract_resume_path(path, *extraction_limits())
+        self.assertIn('Page 1 line 2', data['raw_text'])
+        self.assertNotIn('Page 2', data['raw_text'])
+
+class BatchScoringTests(EvaluatorTestCase):
+    def test_batch_scores_equal_single_scores(self):
+        resumes = [make_resume(text) for text in RESUME_TEXTS]
+        job = make_job()
+        single = [self.evaluator.evaluate_resume(resume, job) for resume in resumes]
+
+        # Same result whatever other resumes share the chunk
+        self.assertEqual(self.evaluator.evaluate_batch(resumes, job), single)
+        self.assertEqual(self.evaluator.evaluate_batch(resumes[:2], job), single[:2])
+        self.assertEqual(self.evaluator.evaluate_batch(resumes[3:], job), single[3:])
+
+    def test_job_scores_equal_single_scores(self):
+        resume = make_resume(RESUME_TEXTS[0])
+        jobs = [
+            make_job(),
+            make_job(description="Data scientist with pandas and machine learning experience.",
+                     required_skills='pandas, numpy'),
+            make_job(description="Frontend role: React and CSS.", required_skills='React, CSS'),
+        ]
+        single = [self.evaluator.evaluate_resume(resume, job) for job in jobs]
+
+        # Same result whatever other jobs are matched alongside
+        self.assertEqual(self.evaluator.evaluate_against_jobs(resume, jobs), single)
+        self.assertEqual(self.evaluator.evaluate_against_jobs(resume, jobs[1:]), single[1:])
+
+class RankLimitTests(EvaluatorTestCase):
+    def test_limit_out_of_range_is_rejected(self):
+        job = make_job()
+        for limit in (0, -1, 'ten', 10 ** 6):
+            response = self.client.post(f'/api/job-postings/{job.id}/rank/', {'limit': limit},
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 400, limit)
+
+    def test_resume_ids_must_be_a_list_of_ids(self):
+        job = make_job()
+        for resume_ids in ('abc', ['x'], 5, [1.5], [True], {'id': 1}):
+            response = self.client.post(f'/api/job-postings/{job.id}/rank/', {'resume_ids': resume_ids},
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 400, resume_ids)
+            self.assertIn('resume_ids', response.json())
+
+    def test_resume_ids_restrict_the_pool(self):
+        job = make_job()
+        resumes = [make_resume(text) for text in RESUME_TEXTS]
+        response = self.client.post(f'/api/job-postings/{job.id}/rank/', {'resume_ids': [resumes[1].id]},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result['resume'] for result in response.json()['results']], [resumes[1].id])
+
+    def test_limit_caps_results(self):
+        job = make_job()
+        for text in RESUME_TEXTS:
+            make_resume(text)
+        response = self.client.post(f'/api/job-postings/{job.id}/rank/', {'limit': 2},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 2)
+
+class EvaluationCacheTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.resume = make_resume(RESUME_TEXTS[0], skills='Python')
+        self.job = make_job(required_skills='Python, Kubernetes')
+
+    def analyze(self):
+        response = self.client.post('/api/evaluations/analyze/',
+                                    {'resume_id': self.resume.id, 'job_posting_id': self.job.id},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def assert_rescored(self):
+        before = Evaluation.objects.get()
+        with mock.patch.object(ResumeEvaluator, 'evaluate_resume', autospec=True,
+                               side_effect=ResumeEvaluator.evaluate_resume) as score:
+            after = self.analyze()
+        score.assert_called_once()
+        # The stale row is rewritten in place
+        evaluation = Evaluation.objects.get()
+        self.assertEqual((after['id'], evaluation.id), (before.id, before.id))
+        self.assertNotEqual(evaluation.fingerprint, before.fingerprint)
+        return after
+
+    def test_unchanged_pair_is_served_from_cache(self):
+        first = self.analyze()
+        with mock.patch.object(ResumeEvaluator, 'evaluate_resume', side_effect=AssertionError):
+            self.assertEqual(self.analyze(), first)
+        self.assertEqual(Evaluation.objects.count(), 1)
+
+    def test_edited_job_posting_is_rescored(self):
+        self.analyze()
+        self.job.required_skills = 'Python'
+        self.job.save()
+        self.assertEqual(self.assert_rescored()['skill_match_score'], 100)
+
+    def test_edited_extracted_data_is_rescored(self):
+        self.analyze()
+        response = self.client.put(f'/api/resumes/{self.resume.id}/update_extracted_data/',
+                                   {'skills': 'Python, Kubernetes'}, content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.assert_rescored()['skill_match_score'], 100)
+
+    def test_new_algorithm_version_is_rescored(self):
+        self.analyze()
+        with mock.patch('evaluator.utils.evaluator.ALGORITHM_VERSION', 'next'):
+            self.assert_rescored()
+
+    def test_new_tfidf_model_is_rescored(self):
+        self.analyze()
+        call_command('refit_tfidf', '--force', stdout=io.StringIO())
+        self.assert_rescored()
+
+class RankCacheTests(EvaluatorTestCase):
+    def test_fresh_evaluations_skip_loading_features(self):
+        resumes = [make_resume(text) for text in RESUME_TEXTS]
+        save_features(resumes)
+        job = make_job()
+        url = f'/api/job-postings/{job.id}/rank/'
+        self.assertEqual(self.client.post(url, content_type='application/json').json()['evaluated'], len(resumes))
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(url, content_type='application/json')
+        self.assertEqual(response.json()['cached'], len(resumes))
+        scoring_queries = [query['sql'] for query in queries if 'evaluator_resumefeatures' in query['sql']]
+        self.assertEqual(scoring_queries, [])
+
+class MatchJobsLimitTests(EvaluatorTestCase):
+    def test_limit_out_of_range_is_rejected(self):
+        resume = make_resume(RESUME_TEXTS[0])
+        make_job()
+        for limit in (0, -1, 10 ** 6):
+            response = self.client.post(f'/api/resumes/{resume.id}/match-jobs/', {'limit': limit},
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 400, limit)
+
+    def test_job_posting_ids_must_be_a_list_of_ids(self):
+        resume = make_resume(RESUME_TEXTS[0])
+        for job_posting_ids in ('abc', ['x'], 5):
+            response = self.client.post(f'/api/resumes/{resume.id}/match-jobs/',
+                                        {'job_posting_ids': job_posting_ids}, content_type='application/json')
+            self.assertEqual(response.status_code, 400, job_posting_ids)
+            self.assertIn('job_posting_ids', response.json())
+
+class FeatureInvalidationTests(EvaluatorTestCase):
+    def test_edit_outside_save_features_is_scored_from_current_text(self):
+        resume = make_resume(RESUME_TEXTS[0], skills='Python')
+        save_features([resume])
+        job = make_job(required_skills='Python, Kubernetes')
+
+        # ORM update: the stored features row is not rewritten
+        Resume.objects.filter(id=resume.id).update(skills='Python, Kubernetes')
+        resume = Resume.objects.select_related('features').get(id=resume.id)
+        self.assertEqual(self.evaluator.evaluate_resume(resume, job)['skill_match_score'], 100)
+
+    def test_stored_features_are_reused_while_text_is_unchanged(self):
+        resume = make_resume(RESUME_TEXTS[0])
+        save_features([resume])
+        resume = Resume.objects.select_related('features').get(id=resume.id)
+        self.assertIs(get_features(resume), resume.features)
+
+class JobProfileTests(EvaluatorTestCase):
+    def test_profile_is_stored_and_reused(self):
+        job = make_job()
+        profile = load_job_profile(job)
+        self.assertEqual(JobProfile.objects.get(job_posting=job).source_hash, profile.source_hash)
+        self.assertIs(load_job_profile(JobPosting.objects.get(id=job.id)), profile)
+
+    def test_saved_job_drops_its_profile(self):
+        job = make_job()
+        load_job_profile(job)
+        job.required_skills = 'Python, Kubernetes'
+        job.save()
+        self.assertIsNone(get_cached_profile(job.id))
+        self.assertFalse(JobProfile.objects.filter(job_posting=job).exists())
+        self.assertIn('kubernetes', load_job_profile(job).skills)
+
+    def test_queryset_update_is_caught_by_source_hash(self):
+        job = make_job()
+        load_job_profile(job)
+        JobPosting.objects.filter(id=job.id).update(required_skills='Python, Kubernetes')
+        job = JobPosting.objects.get(id=job.id)
+        self.assertIn('kubernetes', load_job_profile(job).skills)
+        self.assertIn('kubernetes', JobProfile.objects.get(job_posting=job).skills)
+        resume = make_resume(RESUME_TEXTS[3], skills='Kubernetes, Python')
+        self.assertEqual(self.evaluator.evaluate_resume(resume, job)['skill_match_score'], 100)
+
+class RefitTests(EvaluatorTestCase):
+    def test_resumes_are_vectorized_with_the_fitted_model(self):
+        resumes = [make_resume(text) for text in RESUME_TEXTS]
+        call_command('refit_tfidf', '--force', stdout=io.StringIO())
+        model = get_current_model()
+        self.assertEqual(model.n_documents, len(resumes))
+        expected = model.transform([resume.raw_text for resume in resumes]).toarray()
+        stored = Resume.objects.order_by('id')
+        self.assertEqual({resume.tfidf_version for resume in stored}, {model.version})
+        self.assertTrue(np.allclose(resume_vectors(list(stored), model).toarray(), expected))
+
+    def test_refit_without_extracted_resumes_activates_the_model(self):
+        Resume.objects.create(status='processing', raw_text=RESUME_TEXTS[0])
+        out = io.StringIO()
+        call_command('refit_tfidf', '--force', stdout=out)
+        self.assertIsNotNone(get_current_model())
+        self.assertIsNone(get_current_index())
+        self.assertIn('skipping the candidate index', out.getvalue())
+
+class CandidatesTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        for text in RESUME_TEXTS * 2:
+            make_resume(text)
+        self.job = make_job()
+        call_command('refit_tfidf', '--force', stdout=io.StringIO())
+
+    def test_k_below_one_is_rejected(self):
+        for k in (0, -3, 'x'):
+            response = self.client.get(f'/api/job-postings/{self.job.id}/candidates/', {'k': k})
+            self.assertEqual(response.status_code, 400, k)
+
+    def test_k_limits_shortlist(self):
+        response = self.client.get(f'/api/job-postings/{self.job.id}/candidates/', {'k': 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 3)
+
+    def test_resume_finished_after_the_build_is_shortlisted(self):
+        resume = Resume.objects.create(status='processing', raw_text=RESUME_TEXTS[0], skills='Python')
+        # A later upload raises the index's highest id past the one still processing
+        make_resume(RESUME_TEXTS[1])
+        call_command('refit_tfidf', '--force', stdout=io.StringIO())
+        Resume.objects.filter(id=resume.id).update(status='done', processing_finished_at=timezone.now())
+        shortlist = shortlist_candidates(self.job.description, 500)
+        self.assertEqual(set(shortlist), set(Resume.objects.filter(status='done').values_list('id', flat=True)))
+        self.assertIn(resume.id, shortlist)
+
+    def test_search_with_k_zero_returns_nothing(self):
+        index = get_current_index()
+        query = index.project(get_current_model().job_vector(self.job.description))
+        ids, scores = index.search(query, 0)
+        self.assertEqual((len(ids), len(scores)), (0, 0))
+
+class SearchLimitTests(EvaluatorTestCase):
+    def test_limit_below_one_is_rejected(self):
+        for limit in (0, -1):
+            response = self.client.get('/api/resumes/search/', {'q': 'python', 'limit': limit})
+            self.assertEqual(response.status_code, 400, limit)
+
+    def test_negative_limit_does_not_bypass_cap(self):
+        make_resume(RESUME_TEXTS[0])
+        self.assertEqual(search_resumes('python', -1), [])
+
+class SearchTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = make_resume(RESUME_TEXTS[0], name='Ada', skills='Python, Django')
+        self.data = make_resume(RESUME_TEXTS[1], name='Grace', skills='pandas, SQL')
+        self.pending = Resume.objects.create(status='pending', raw_text=RESUME_TEXTS[0], skills='Python')
+
+    def test_fts_ranks_matching_done_resumes(self):
+        results = search_resumes('python')
+        self.assertEqual([resume_id for resume_id, _, _ in results], [self.backend.id])
+        _, score, snippet = results[0]
+        self.assertGreater(score, 0)
+        self.assertIn('<mark>', snippet)
+        self.assertEqual({resume_id for resume_id, _, _ in search_resumes('python', status=None)},
+                         {self.backend.id, self.pending.id})
+
+    def test_every_term_and_prefixes(self):
+        self.assertEqual(search_resumes('python pandas'), [])
+        self.assertEqual([resume_id for resume_id, _, _ in search_resumes('panda*')], [self.data.id])
+        # Punctuation is not FTS5 syntax
+        self.assertEqual(search_resumes('"python" OR ('), search_resumes('python OR'))
+
+    def test_edits_are_searchable(self):
+        self.data.skills = 'Rust'
+        self.data.save()
+        self.assertEqual([resume_id for resume_id, _, _ in search_resumes('rust')], [self.data.id])
+
+    def test_fallback_matches_every_term(self):
+        self.assertEqual(fallback_search(parse_terms('python django'), 20, 'done'),
+                         [(self.backend.id, None, '')])
+        self.assertEqual(fallback_search(parse_terms('python'), 20, None),
+                         [(self.pending.id, None, ''), (self.backend.id, None, '')])
+        self.assertEqual(fallback_search(parse_terms('python pandas'), 20, 'done'), [])
+
+class CursorPaginationTests(EvaluatorTestCase):
+    def collect(self, url, params):
+        ids = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            page = response.json()
+            ids.extend(item['id'] for item in page['results'])
+            if not page['next']:
+                return ids
+            response = self.client.get(page['next'])
+
+    def test_resume_pages_cover_every_row_once(self):
+        resumes = [make_resume(text) for text in RESUME_TEXTS * 2]
+        ids = self.collect('/api/resumes/', {'page_size': 3})
+        expected = list(Resume.objects.order_by('-uploaded_at', '-pk').values_list('id', flat=True))
+        self.assertEqual(sorted(ids), sorted(resume.id for resume in resumes))
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertEqual(ids, expected)
+
+    def test_evaluation_pages_follow_requested_ordering(self):
+        job = make_job()
+        for text in RESUME_TEXTS:
+            make_resume(text)
+        self.client.post(f'/api/job-postings/{job.id}/rank/', content_type='application/json')
+        ids = self.collect('/api/evaluations/', {'page_size': 2, 'ordering': '-final_score'})
+        self.assertEqual(len(ids), len(set(ids)))
+        scores = [Evaluation.objects.get(id=evaluation_id).final_score for evaluation_id in ids]
+        self.assertEqual(len(scores), len(RESUME_TEXTS))
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+class StatsTests(EvaluatorTestCase):
+    def test_top_skills_below_one_is_rejected(self):
+        job = make_job()
+        for top_skills in (0, -1):
+            response = self.client.get(f'/api/job-postings/{job.id}/stats/', {'top_skills': top_skills})
+            self.assertEqual(response.status_code, 400, top_skills)
+
+    def test_top_skills_is_capped(self):
+        job = make_job(required_skills=', '.join(f'skill{i}' for i in range(80)))
+        for text in RESUME_TEXTS:
+            make_resume(text)
+        self.client.post(f'/api/job-postings/{job.id}/rank/', content_type='application/json')
+        response = self.client.get(f'/api/job-postings/{job.id}/stats/', {'top_skills': 10 ** 6})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['top_missing_skills']), STATS_MAX_TOP_SKILLS)
+
+class EvaluationClaimTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.resume = make_resume(RESUME_TEXTS[0])
+        self.job = make_job()
+
+    def test_only_one_holder_per_pair(self):
+        token = claim_pair(self.resume, self.job)
+        self.assertIsNotNone(token)
+        self.assertIsNone(claim_pair(self.resume, self.job))
+        release_pair(self.resume, self.job, token)
+        self.assertIsNotNone(claim_pair(self.resume, self.job))
+
+    def test_expired_claim_is_taken_over(self):
+        token = claim_pair(self.resume, self.job)
+        EvaluationClaim.objects.update(claimed_at=timezone.now() - timedelta(seconds=3600))
+        new_token = claim_pair(self.resume, self.job)
+        self.assertNotIn(new_token, (None, token))
+        # The previous holder's late release leaves the new claim alone
+        release_pair(self.resume, self.job, token)
+        self.assertTrue(EvaluationClaim.objects.filter(token=new_token).exists())
+
+    def test_analyze_scores_after_abandoned_claim_and_releases(self):
+        EvaluationClaim.objects.create(resume=self.resume, job_posting=self.job, token='crashed',
+                                       claimed_at=timezone.now() - timedelta(seconds=3600))
+        response = self.client.post('/api/evaluations/analyze/',
+                                    {'resume_id': self.resume.id, 'job_posting_id': self.job.id},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Evaluation.objects.count(), 1)
+        self.assertFalse(EvaluationClaim.objects.exists())
+
+class DeduplicationTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        self.pdf = b'%PDF-1.4 resume bytes'
+
+    def upload(self, content):
+        return self.client.post('/api/resumes/', {'file': SimpleUploadedFile('cv.pdf', content, 'application/pdf')})
+
+    def test_identical_upload_reuses_extracted_fields(self):
+        original = make_resume(RESUME_TEXTS[0], name='Ada', content_hash=hashlib.sha256(self.pdf).hexdigest())
+        response = self.upload(self.pdf)
+        self.assertEqual(response.status_code, 201)
+        duplicate = Resume.objects.get(id=response.json()['id'])
+        self.assertNotEqual(duplicate.id, original.id)
+        self.assertEqual((duplicate.status, duplicate.name, duplicate.raw_text), ('done', 'Ada', original.raw_text))
+        self.assertTrue(ResumeFeatures.objects.filter(resume=duplicate).exists())
+
+    def test_content_hash_cannot_be_set_by_clients(self):
+        resume = make_resume(RESUME_TEXTS[0], content_hash='a' * 64)
+        response = self.client.patch(f'/api/resumes/{resume.id}/', {'content_hash': 'b' * 64},
+                                     content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        resume.refresh_from_db()
+        self.assertEqual(resume.content_hash, 'a' * 64)
+
+@override_settings(PROCESS_POOL_WORKERS=2)
+class BrokenPoolTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        discard_process_pool()
+        self.addCleanup(discard_process_pool)
+        self.enterContext(mock.patch('evaluator.utils.ingestion.extract_resume_path', extract_or_crash))
+        self.names = ['a.pdf', 'crash.pdf', 'b.pdf', 'c.pdf']
+
+    def test_only_the_crashing_resume_fails(self):
+        resumes = [Resume.objects.create(file=f'resumes/{name}', status='processing') for name in self.names]
+        ingestion_queue.process(resumes, get_process_pool())
+        statuses = dict(Resume.objects.values_list('file', 'status'))
+        self.assertEqual(statuses, {
+            'resumes/a.pdf': 'done', 'resumes/crash.pdf': 'failed', 'resumes/b.pdf': 'done', 'resumes/c.pdf': 'done',
+        })
+
+    def test_late_reset_keeps_the_replacement_pool(self):
+        broken = get_process_pool()
+        reset_process_pool(broken)
+        replacement = get_process_pool()
+        # A second caller that saw the same broken pool resets after the first
+        reset_process_pool(broken)
+        self.assertIs(get_process_pool(), replacement)
+        self.assertEqual(replacement.submit(abs, -1).result(), 1)
+
+    def test_bulk_extraction_only_fails_the_crashing_pdf(self):
+        results = extract_in_parallel([os.path.join(tempfile.gettempdir(), name) for name in self.names])
+        self.assertEqual([error is None for _, error in results], [True, False, True, True])
+
+class AsyncUploadTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        self.addCleanup(discard_process_pool)
+
+    def test_failed_extraction_keeps_the_resume(self):
+        response = self.client.post('/api/async/resumes/', {
+            'name': 'Ada', 'file': SimpleUploadedFile('cv.pdf', b'%PDF-1.4 not a real pdf', 'application/pdf'),
+        })
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual((body['status'], body['name']), ('failed', 'Ada'))
+        resume = Resume.objects.get(id=body['id'])
+        self.assertTrue(resume.error.startswith('Failed to extract resume data'))
+        self.assertTrue(os.path.exists(resume.file.path))
+
+class ProfilingTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(profile_dir.cleanup)
+        self.enterContext(override_settings(PROFILING_TOKEN='s3cret', PROFILING_DIR=profile_dir.name))
+
+    def test_token_is_not_recorded(self):
+        response = self.client.get('/api/resumes/search/', {'q': 'python', '_profile': 's3cret'})
+        self.assertIn('X-Profile', response)
+        [profile] = list_profiles()
+        self.assertEqual(profile['path'], '/api/resumes/search/?q=python')
+
+class AsyncAnalyzeTests(EvaluatorTestCase):
+    def test_body_must_be_a_json_object(self):
+        for body in ('[1, 2]', '"text"', '3', 'null'):
+            response = self.client.post('/api/async/evaluations/analyze/', body, content_type='application/json')
+            self.assertEqual(response.status_code, 400, body)
+
+    def test_ids_of_the_wrong_type_are_not_found(self):
+        response = self.client.post('/api/async/evaluations/analyze/', {'resume_id': [1], 'job_posting_id': {}},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/async/evaluations/analyze/', {'resume_id': [1], 'job_posting_id': 1},
+                                    content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+
+class MetricsTests(EvaluatorTestCase):
+    def parse_metrics(self):
+        # family -> declared type, and every sample name -> value, from the text format
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        types, samples = {}, {}
+        for line in response.content.decode().splitlines():
+            if line.startswith('# TYPE '):
+                _, _, family, kind = line.split(' ')
+                types[family] = kind
+            elif line and not line.startswith('#'):
+                name, value = line.rsplit(' ', 1)
+                samples[name] = float(value)
+        return types, samples
+
+    def test_samples_belong_to_declared_families(self):
+        self.client.get('/api/resumes/')
+        types, samples = self.parse_metrics()
+        for sample in samples:
+            family = sample.split('{', 1)[0]
+            if family not in types:
+                family = family.rsplit('_', 1)[0]
+                self.assertEqual(types.get(family), 'histogram', sample)
+        self.assertEqual(types['resume_evaluator_requests_total'], 'counter')
+        self.assertEqual(types['resume_evaluator_stage_seconds'], 'histogram')
+
+    def test_scoring_is_counted_and_timed(self):
+        resume = make_resume(RESUME_TEXTS[0])
+        job = make_job()
+        _, before = self.parse_metrics()
+        response = self.client.post('/api/evaluations/analyze/', {'resume_id': resume.id, 'job_posting_id': job.id},
+                                    content_type='application/json')
+        self.assertIn('score.skills;dur=', response['Server-Timing'])
+        self.assertIn('total;dur=', response['Server-Timing'])
+        _, after = self.parse_metrics()
+        scored = 'resume_evaluator_evaluations_total{result="scored"}'
+        self.assertEqual(after[scored] - before.get(scored, 0), 1)
+        count = 'resume_evaluator_stage_seconds_count{stage="score.skills"}'
+        self.assertGreater(after[count], before.get(count, 0))
+
+@override_settings(PROCESS_POOL_WORKERS=2)
+class BulkUploadTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root.name))
+        self.media_root = media_root.name
+        self.addCleanup(discard_process_pool)
+        self.ada = make_pdf([SAMPLE_RESUME_LINES])
+        self.grace = make_pdf([['Grace Hopper', 'Skills', 'COBOL']])
+
+    def upload(self, **data):
+        response = self.client.post('/api/resumes/bulk/', data)
+        self.assertEqual(response.status_code, 201)
+        return response.json()
+
+    def pdf(self, name, content):
+        return SimpleUploadedFile(name, content, 'application/pdf')
+
+    def stored_files(self):
+        return sorted(os.listdir(os.path.join(self.media_root, 'resumes')))
+
+    def test_files_get_per_file_results_in_order(self):
+        body = self.upload(files=[
+            self.pdf('ada.pdf', self.ada), SimpleUploadedFile('notes.txt', b'hello', 'text/plain'),
+            self.pdf('broken.pdf', b'%PDF-1.4 truncated'), self.pdf('grace.pdf', self.grace),
+        ])
+        results = body['results']
+        self.assertEqual((body['created'], body['failed']), (2, 2))
+        self.assertEqual([result['filename'] for result in results], ['ada.pdf', 'notes.txt', 'broken.pdf', 'grace.pdf'])
+        self.assertEqual([result['status'] for result in results], ['done', 'failed', 'failed', 'done'])
+        self.assertEqual(results[1]['error'], 'Not a PDF file')
+        self.assertTrue(results[2]['error'].startswith('Failed to extract resume data'))
+        self.assertEqual((results[0]['name'], results[3]['name']), ('Ada Lovelace', 'Grace Hopper'))
+
+        ada = Resume.objects.get(id=results[0]['id'])
+        self.assertEqual((ada.status, ada.skills), ('done', ', Python , Django , SQL Skills in leadership are listed under experience'))
+        self.assertTrue(ResumeFeatures.objects.filter(resume=ada).exists())
+        # The file that failed to extract is not kept in storage
+        self.assertEqual(self.stored_files(), ['ada.pdf', 'grace.pdf'])
+
+    def test_zip_archive(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as zip_file:
+            zip_file.writestr('cvs/', '')
+            zip_file.writestr('cvs/ada.pdf', self.ada)
+            zip_file.writestr('cvs/grace.PDF', self.grace)
+            zip_file.writestr('cvs/readme.txt', 'not a resume')
+            zip_file.writestr('__MACOSX/cvs/._ada.pdf', 'resource fork')
+        body = self.upload(archive=SimpleUploadedFile('cvs.zip', archive.getvalue(), 'application/zip'))
+        self.assertEqual(
+            [(result['filename'], result['status']) for result in body['results']],
+            [('cvs/ada.pdf', 'done'), ('cvs/grace.PDF', 'done'), ('cvs/readme.txt', 'failed')],
+        )
+        self.assertEqual(Resume.objects.get(id=body['results'][1]['id']).name, 'Grace Hopper')
+
+    def test_invalid_archive_and_batch_limit(self):
+        body = self.upload(archive=SimpleUploadedFile('cvs.zip', b'not a zip', 'application/zip'))
+        self.assertEqual(body['results'], [{'filename': 'cvs.zip', 'status': 'failed', 'error': 'Not a valid ZIP archive'}])
+        with override_settings(BULK_UPLOAD_MAX_FILES=1):
+            body = self.upload(files=[self.pdf('ada.pdf', self.ada), self.pdf('grace.pdf', self.grace)])
+        self.assertEqual([result['status'] for result in body['results']], ['done', 'failed'])
+        self.assertIn('Batch limit of 1 files exceeded', body['results'][1]['error'])
+
+    def test_duplicates_in_one_batch_are_extracted_and_stored_once(self):
+        with mock.patch('evaluator.views.extract_in_parallel', wraps=extract_in_parallel) as extract:
+            body = self.upload(files=[self.pdf('ada.pdf', self.ada), self.pdf('ada-copy.pdf', self.ada)])
+        self.assertEqual(len(extract.call_args.args[0]), 1)
+        first, second = (Resume.objects.get(id=result['id']) for result in body['results'])
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual((first.file.name, first.content_hash), (second.file.name, second.content_hash))
+        self.assertEqual(second.raw_text, first.raw_text)
+        self.assertEqual(self.stored_files(), ['ada.pdf'])
+
+        # A later batch reuses the stored extraction without parsing again
+        with mock.patch('evaluator.views.extract_in_parallel', wraps=extract_in_parallel) as extract:
+            body = self.upload(files=[self.pdf('ada-again.pdf', self.ada)])
+        self.assertEqual(extract.call_args.args[0], [])
+        self.assertEqual(Resume.objects.get(id=body['results'][0]['id']).file.name, first.file.name)
+
+    def test_upload_without_files_is_rejected(self):
+        self.assertEqual(self.client.post('/api/resumes/bulk/', {}).status_code, 400)
+
+class EvaluationFilterTests(EvaluatorTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend, self.data = make_job(), make_job(title='Data Scientist')
+        resumes = [make_resume(text, name=f'Candidate {number}') for number, text in enumerate(RESUME_TEXTS[:3])]
+        rows = [
+            (resumes[0], self.backend, 85, 'excellent', 10),
+            (resumes[1], self.backend, 65, 'good', 5),
+            (resumes[2], self.backend, 30, 'below_average', 1),
+            (resumes[0], self.data, 50, 'average', 3),
+        ]
+        self.evaluations = []
+        for resume, job, score, category, days_ago in rows:
+            evaluation = Evaluation.objects.create(resume=resume, job_posting=job, final_score=score,
+                                                   skill_match_score=100 - score, category=category)
+            Evaluation.objects.filter(id=evaluation.id).update(created_at=timezone.now() - timedelta(days=days_ago))
+            self.evaluations.append(evaluation.id)
+
+    def list_ids(self, **params):
+        response = self.client.get('/api/evaluations/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [result['id'] for result in response.json()['results']]
+
+    def test_filters(self):
+        first, second, third, other = self.evaluations
+        self.assertEqual(self.list_ids(job_posting=self.backend.id), [third, second, first])
+        self.assertEqual(self.list_ids(resume=Evaluation.objects.get(id=first).resume_id), [other, first])
+        self.assertEqual(self.list_ids(category='good,below_average'), [third, second])
+        self.assertEqual(self.list_ids(min_score=50, max_score=70), [other, second])
+        created = (timezone.now() - timedelta(days=4)).date().isoformat()
+        self.assertEqual(self.list_ids(created_after=created), [third, other])
+        self.assertEqual(self.list_ids(created_before=timezone.now() - timedelta(days=4)), [second, first])
+
+    def test_orderings(self):
+        first, second, third, other = self.evaluations
+        self.assertEqual(self.list_ids(job_posting=self.backend.id, ordering='-final_score'), [first, second, third])
+        self.assertEqual(self.list_ids(ordering='final_score'), [third, other, second, first])
+        self.assertEqual(self.list_ids(ordering='-skill_match_score'), [third, other, second, first])
+        # Fields outside ordering_fields are ignored in favour of the default, newest first
+        self.assertEqual(self.list_ids(ordering='resume__name'), [third, other, second, first])
+
+    def test_invalid_parameters_are_rejected(self):
+        for param, value in (('job_posting', 'x'), ('resume', '1.5'), ('min_score', 'high'),
+                             ('max_score', ''), ('created_after', 'yesterday'), ('created_before', '2024-13-01')):
+            response = self.client.get('/api/evaluations/', {param: value})
+            self.assertEqual(response.status_code, 400, param)
+            self.assertIn(param, response.json())
+
+    def test_listing_does_not_query_per_row(self):
+        with self.assertNumQueries(1):
+            results = self.client.get('/api/evaluations/').json()['results']
+        self.assertEqual({result['job_title'] for result in results}, {'Backend Engineer', 'Data Scientist'})
+        self.assertEqual(results[0]['resume_name'], 'Candidate 2')
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import JobPostingViewSet, ResumeViewSet, EvaluationViewSet
+from . import async_views
 
 router = DefaultRouter()
 router.register(r'job-postings', JobPostingViewSet)
@@ -9,4 +10,7 @@ router.register(r'evaluations', EvaluationViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    # Async variants for ASGI servers; extraction and scoring run in the process pool
+    path('async/resumes/', async_views.upload_resume, name='async-resume-upload'),
+    path('async/evaluations/analyze/', async_views.analyze, name='async-evaluation-analyze'),
 ]
\ No newline at end of file
@@ -0,0 +1,23 @@
+from itertools import islice
+
+def iter_chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def iter_queryset_chunks(queryset, size):
+    # Keyset pagination on the primary key, one query per chunk. Unlike
+    # iterator(), no cursor stays open between chunks, so rows written while a
+    # chunk is processed are never written from a stale SQLite read snapshot
+    last_pk = None
+    queryset = queryset.order_by('pk')
+    while True:
+        page = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        chunk = list(page[:size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
@@ -0,0 +1,41 @@
+import os
+import zipfile
+
+from django.conf import settings
+from django.core.files import File
+
+def iter_uploaded_pdfs(files, archives):
+    """Yield (filename, file object, error) for each PDF in the upload.
+
+    ZIP members are streamed straight out of the archive, so entries are
+    never fully buffered in memory before they reach storage.
+    """
+    for uploaded in files:
+        if not uploaded.name.lower().endswith('.pdf'):
+            yield uploaded.name, None, 'Not a PDF file'
+            continue
+        if uploaded.size > settings.BULK_UPLOAD_MAX_FILE_SIZE:
+            yield uploaded.name, None, 'File is too large'
+            continue
+        yield uploaded.name, uploaded, None
+
+    for archive in archives:
+        try:
+            zip_file = zipfile.ZipFile(archive)
+        except zipfile.BadZipFile:
+            yield archive.name, None, 'Not a valid ZIP archive'
+            continue
+
+        with zip_file:
+            for info in zip_file.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or not name or info.filename.startswith('__MACOSX/'):
+                    continue
+                if not name.lower().endswith('.pdf'):
+                    yield info.filename, None, 'Not a PDF file'
+                    continue
+                if info.file_size > settings.BULK_UPLOAD_MAX_FILE_SIZE:
+                    yield info.filename, None, 'File is too large'
+                    continue
+                with zip_file.open(info) as entry:
+                    yield info.filename, File(entry, name=name), None
@@ -0,0 +1,47 @@
+import asyncio
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from ..models import EvaluationClaim
+
+def claim_expiry():
+    return timezone.now() - timedelta(seconds=settings.EVALUATION_CLAIM_TIMEOUT)
+
+def claim_pair(resume, job_posting):
+    """Take the scoring claim on a pair; its token, or None if another process holds it."""
+    token = uuid.uuid4().hex
+    try:
+        with transaction.atomic():
+            EvaluationClaim.objects.create(
+                resume=resume, job_posting=job_posting, token=token, claimed_at=timezone.now()
+            )
+        return token
+    except IntegrityError:
+        pass
+    # A claim left behind by a crashed or killed process is taken over
+    taken_over = EvaluationClaim.objects.filter(
+        resume=resume, job_posting=job_posting, claimed_at__lt=claim_expiry()
+    ).update(token=token, claimed_at=timezone.now())
+    return token if taken_over else None
+
+def release_pair(resume, job_posting, token):
+    EvaluationClaim.objects.filter(resume=resume, job_posting=job_posting, token=token).delete()
+
+def live_claims(resume, job_posting):
+    return EvaluationClaim.objects.filter(
+        resume=resume, job_posting=job_posting, claimed_at__gte=claim_expiry()
+    )
+
+def wait_for_pair(resume, job_posting):
+    # Until the holder releases the claim or it expires
+    while live_claims(resume, job_posting).exists():
+        time.sleep(settings.EVALUATION_CLAIM_POLL_INTERVAL)
+
+async def await_pair(resume, job_posting):
+    while await live_claims(resume, job_posting).aexists():
+        await asyncio.sleep(settings.EVALUATION_CLAIM_POLL_INTERVAL)
@@ -0,0 +1,24 @@
+import hashlib
+
+from ..models import Resume
+
+# Fields produced by extraction that a duplicate upload can reuse as-is
+EXTRACTED_FIELDS = [
+    'name', 'email', 'phone', 'education', 'experience', 'skills', 
+    'raw_text', 'tfidf_vector', 'tfidf_version',
+]
+
+def compute_content_hash(uploaded_file):
+    sha256 = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        sha256.update(chunk)
+    uploaded_file.seek(0)
+    return sha256.hexdigest()
+
+def find_extracted_duplicate(content_hash):
+    return Resume.objects.filter(content_hash=content_hash, status='done').order_by('id').first()
+
+def copy_extracted_fields(source):
+    data = {field: getattr(source, field) for field in EXTRACTED_FIELDS}
+    data['file'] = source.file.name
+    return data
@@ -1,8 +1,55 @@
-import re
+import hashlib
 import numpy as np
+from scipy import sparse
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-import json
+from sklearn.preprocessing import normalize
+from collections import Counter
+from .features import (
+    COMPUTING_FIELD_KEYWORDS, EDUCATION_KEYWORDS, EXPERIENCE_KEYWORDS, YEAR_PATTERN,
+    get_features, normalize_text,
+)
+from .job_profiles import get_job_profile, profile_vectors, top_keywords
+from .vectorizer import get_current_model, resume_vectors
+from .skill_matcher import compile_skill_matcher
+from .timing import stage
+
+# Bump whenever scoring changes so cached evaluations are recomputed
+ALGORITHM_VERSION = '3'
+
+# Vocabulary cap of the pairwise TF-IDF fallback
+PAIRWISE_MAX_FEATURES = 1000
+
+def tfidf_from_counts(documents, max_features=None):
+    """L2-normalized TF-IDF rows for term-count dicts.
+
+    Matches TfidfVectorizer(stop_words='english', max_features=...) fitted on
+    the same texts (smooth IDF, same vocabulary cut), without re-tokenizing.
+    """
+    totals = Counter()
+    for counts in documents:
+        totals.update(counts)
+    if not totals:
+        raise ValueError("empty vocabulary")
+    terms = sorted(totals)
+    if max_features is not None and len(terms) > max_features:
+        # Same selection (and tie order) as TfidfVectorizer's _limit_features
+        frequencies = np.array([totals[term] for term in terms], dtype=np.int64)
+        terms = [terms[i] for i in np.sort((-frequencies).argsort()[:max_features])]
+    vocabulary = {term: col for col, term in enumerate(terms)}
+    
+    rows, cols, data = [], [], []
+    for row, counts in enumerate(documents):
+        for term, count in counts.items():
+            col = vocabulary.get(term)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+                data.append(count)
+    counts = sparse.csr_matrix((data, (rows, cols)), shape=(len(documents), len(terms)), dtype=np.float64)
+    document_frequency = np.bincount(cols, minlength=len(terms))
+    idf = np.log((len(documents) + 1) / (document_frequency + 1)) + 1
+    return normalize(counts @ sparse.diags(idf))
 
 class ResumeEvaluator:
     def __init__(self):
@@ -11,67 +58,88 @@ class ResumeEvaluator:
         self.education_weight = 0.2
         self.cosine_weight = 0.1
     
+    def get_fingerprint_hasher(self, job_posting):
+        # Job-side part of the fingerprint; copy() it once per resume in batches
+        model = get_current_model()
+        hasher = hashlib.sha256()
+        for value in (ALGORITHM_VERSION, model.version if model else '', job_posting.description,
+                      job_posting.required_skills, str(job_posting.experience_required)):
+            hasher.update(value.encode())
+            hasher.update(b'\0')
+        return hasher
+    
+    def get_fingerprint(self, resume, job_posting, job_hasher=None):
+        # Covers every input that affects the scores of this (resume, job) pair
+        hasher = (job_hasher or self.get_fingerprint_hasher(job_posting)).copy()
+        for value in (resume.raw_text, resume.skills, resume.education):
+            hasher.update(value.encode())
+            hasher.update(b'\0')
+        return hasher.hexdigest()
+    
     def normalize_text(self, text):
-        text = text.lower()
-        text = re.sub(r'[^\w\s]', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        return text.strip()
+        return normalize_text(text)
     
-    def calculate_skill_match(self, resume_skills, job_skills):
-        resume_skills_normalized = [self.normalize_text(skill) for skill in resume_skills]
-        job_skills_normalized = [self.normalize_text(skill) for skill in job_skills]
-        
-        matched_skills = []
-        for job_skill in job_skills_normalized:
-            for resume_skill in resume_skills_normalized:
-                if job_skill in resume_skill or resume_skill in job_skill:
-                    matched_skills.append(job_skill)
-                    break
-        
-        missing_skills = [skill for skill in job_skills_normalized if skill not in matched_skills]
+    def get_skill_matcher(self, job_skills):
+        return compile_skill_matcher(tuple(self.normalize_text(skill) for skill in job_skills))
+    
+    def calculate_skill_match(self, resume_text, job_skills):
+        return self.match_skills(self.normalize_text(resume_text), self.get_skill_matcher(job_skills))
+    
+    def match_skills(self, normalized_text, matcher):
+        # One pass over the whole resume text with the job's compiled matcher
+        matched_skills, missing_skills = matcher.match(normalized_text)
         
-        if not job_skills_normalized:
+        if not matcher.skills:
             return 0, [], missing_skills
         
-        match_percentage = (len(matched_skills) / len(job_skills_normalized)) * 100
+        match_percentage = (len(matched_skills) / len(matcher.skills)) * 100
         return match_percentage, matched_skills, missing_skills
     
+    def get_skill_text(self, resume):
+        # The skills field may have been corrected by hand, so scan it along with the raw text
+        return f"{resume.raw_text}\n{resume.skills}"
+    
     def calculate_experience_score(self, resume_text, required_years):
         # Extract years of experience from resume
-        year_pattern = r'(\d+)\s*(?:years?|yrs?)'
-        years_found = re.findall(year_pattern, resume_text.lower())
-        
-        if years_found:
-            max_years = max([int(year) for year in years_found])
+        resume_lower = resume_text.lower()
+        years_found = YEAR_PATTERN.findall(resume_lower)
+        max_years = max([int(year) for year in years_found]) if years_found else None
+        keyword_count = sum(1 for keyword in EXPERIENCE_KEYWORDS if keyword in resume_lower)
+        return self.score_experience(max_years, keyword_count, required_years)
+    
+    def score_experience(self, max_years, keyword_count, required_years):
+        if max_years is not None:
             if max_years >= required_years:
                 return 100
             else:
                 return (max_years / required_years) * 100
         
-        # If no specific years mentioned, look for experience keywords
-        experience_keywords = ['experience', 'worked', 'developed', 'managed', 'led', 'created']
-        keyword_count = sum(1 for keyword in experience_keywords if keyword in resume_text.lower())
-        
+        # If no specific years mentioned, score the experience keywords
         return min(keyword_count * 15, 70)  # Cap at 70 if no specific years
     
     def calculate_education_score(self, resume_education, job_description):
-        education_keywords = ['degree', 'bachelor', 'master', 'phd', 'diploma', 'certification']
         resume_edu_lower = resume_education.lower()
         job_desc_lower = job_description.lower()
-        
+        return self.score_education(
+            any(keyword in resume_edu_lower for keyword in EDUCATION_KEYWORDS),
+            any(keyword in resume_edu_lower for keyword in COMPUTING_FIELD_KEYWORDS),
+            any(keyword in job_desc_lower for keyword in EDUCATION_KEYWORDS)
+        )
+    
+    def score_education(self, has_degree, has_computing_field, requires_degree):
         score = 0
         
         # Check for degree mentions
-        if any(keyword in resume_edu_lower for keyword in education_keywords):
+        if has_degree:
             score += 50
         
         # Check for relevant field mentions
-        if 'computer' in resume_edu_lower or 'software' in resume_edu_lower:
+        if has_computing_field:
             score += 30
         
         # Check if job requires specific education
-        if any(keyword in job_desc_lower for keyword in education_keywords):
-            if any(keyword in resume_edu_lower for keyword in education_keywords):
+        if requires_degree:
+            if has_degree:
                 score += 20
         
         return min(score, 100)
@@ -80,7 +148,7 @@ class ResumeEvaluator:
         try:
             documents = [self.normalize_text(resume_text), self.normalize_text(job_description)]
             
-            vectorizer = TfidfVectorizer(stop_words='english', max_features=1000)
+            vectorizer = TfidfVectorizer(stop_words='english', max_features=PAIRWISE_MAX_FEATURES)
             tfidf_matrix = vectorizer.fit_transform(documents)
             
             similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
@@ -88,43 +156,75 @@ class ResumeEvaluator:
         except:
             return 0
     
+    def pairwise_similarity(self, term_counts, job_term_counts):
+        # Fallback similarity without a corpus model: TF-IDF fitted on this
+        # resume and job alone, built from their stored term counts, so the
+        # score never depends on which other resumes or jobs are scored with it
+        try:
+            matrix = tfidf_from_counts([job_term_counts, term_counts], PAIRWISE_MAX_FEATURES)
+        except ValueError:
+            return 0
+        return float((matrix[1] @ matrix[0].T).toarray()[0, 0] * 100)
+    
+    def get_top_job_keywords(self, job_description):
+        return list(top_keywords(self.normalize_text(job_description)))
+    
+    def calculate_corpus_similarity(self, resumes, job_description, model=None):
+        # Sparse dot product against the corpus-fitted model, or None if no model exists yet
+        model = model or get_current_model()
+        if model is None:
+            return None
+        return self.vector_similarities(resumes, model.job_vector(job_description), model)
+    
+    def vector_similarities(self, resumes, job_vector, model):
+        matrix = resume_vectors(resumes, model)
+        return (matrix @ job_vector.T).toarray().ravel() * 100
+    
     def extract_keyword_highlights(self, resume_text, job_description):
+        return self.match_keywords(self.normalize_text(resume_text), self.get_top_job_keywords(job_description))
+    
+    def match_keywords(self, normalized_text, top_job_keywords):
         try:
-            vectorizer = TfidfVectorizer(stop_words='english', max_features=50, ngram_range=(1, 2))
-            job_vector = vectorizer.fit_transform([self.normalize_text(job_description)])
-            
-            feature_names = vectorizer.get_feature_names_out()
-            job_scores = job_vector.toarray()[0]
-            
-            # Get top keywords from job description
-            top_job_keywords = [feature_names[i] for i in job_scores.argsort()[-10:][::-1]]
-            
-            # Find which keywords appear in resume
-            resume_lower = self.normalize_text(resume_text)
-            matched_keywords = [keyword for keyword in top_job_keywords if keyword in resume_lower]
+            # Find which of the job's top keywords appear in resume
+            matched_keywords = [keyword for keyword in top_job_keywords if keyword in normalized_text]
             
             return matched_keywords[:5]  # Return top 5 matches
         except:
             return []
     
     def evaluate_resume(self, resume, job_posting):
+        # Resume-side text processing comes from the stored features, job-side
+        # from the job's compiled profile
+        model = get_current_model()
+        with stage('score.features'):
+            features = get_features(resume)
+        with stage('score.job_profile'):
+            profile = get_job_profile(job_posting, model)
+        
         # Rule-based analysis
-        skill_score, matched_skills, missing_skills = self.calculate_skill_match(
-            resume.skills_list, job_posting.skills_list
-        )
+        with stage('score.skills'):
+            skill_score, matched_skills, missing_skills = self.match_skills(
+                features.skill_text, compile_skill_matcher(tuple(profile.skills))
+            )
         
-        experience_score = self.calculate_experience_score(
-            resume.raw_text, job_posting.experience_required
-        )
+        with stage('score.experience'):
+            experience_score = self.score_experience(
+                features.max_years, len(features.experience_keywords), job_posting.experience_required
+            )
         
-        education_score = self.calculate_education_score(
-            resume.education, job_posting.description
-        )
+        with stage('score.education'):
+            education_score = self.score_education(
+                features.has_degree, features.has_computing_field, profile.requires_degree
+            )
         
         # Cosine similarity
-        cosine_score = self.calculate_cosine_similarity(
-            resume.raw_text, job_posting.description
-        )
+        with stage('score.tfidf'):
+            if model is not None:
+                cosine_score = float(self.vector_similarities(
+                    [resume], profile_vectors([profile], model), model
+                )[0])
+            else:
+                cosine_score = self.pairwise_similarity(features.term_counts, profile.term_counts)
         
         # Calculate weighted final score
         final_score = (
@@ -135,9 +235,8 @@ class ResumeEvaluator:
         )
         
         # Get keyword highlights
-        keyword_highlights = self.extract_keyword_highlights(
-            resume.raw_text, job_posting.description
-        )
+        with stage('score.keywords'):
+            keyword_highlights = self.match_keywords(features.normalized_text, profile.top_keywords)
         
         # Determine category
         category = self.get_category_from_score(final_score)
@@ -149,11 +248,182 @@ class ResumeEvaluator:
             'cosine_similarity_score': cosine_score,
             'final_score': final_score,
             'category': category,
-            'matched_skills': json.dumps(matched_skills),
-            'missing_skills': json.dumps(missing_skills),
-            'keyword_highlights': json.dumps(keyword_highlights)
+            'matched_skills': matched_skills,
+            'missing_skills': missing_skills,
+            'keyword_highlights': keyword_highlights
         }
     
+    def evaluate_batch(self, resumes, job_posting):
+        # Score a chunk of resumes against one job posting; the job-side work
+        # is done once and every sub-score is computed as a NumPy array.
+        resumes = list(resumes)
+        if not resumes:
+            return []
+        
+        model = get_current_model()
+        profile = get_job_profile(job_posting, model)
+        matcher = compile_skill_matcher(tuple(profile.skills))
+        job_skills = matcher.skills
+        job_requires_degree = profile.requires_degree
+        top_job_keywords = profile.top_keywords
+        
+        features = [get_features(resume) for resume in resumes]
+        
+        # Skill match: one row per resume, one column per required skill
+        skill_matrix = np.zeros((len(resumes), len(job_skills)), dtype=bool)
+        for row, resume_features in enumerate(features):
+            found = matcher.scan(resume_features.skill_text)
+            skill_matrix[row, list(found)] = True
+        if job_skills:
+            skill_scores = skill_matrix.mean(axis=1) * 100
+        else:
+            skill_scores = np.zeros(len(resumes))
+        
+        # Experience: max years mentioned, falling back to keyword counts
+        max_years = np.array([
+            -1.0 if resume_features.max_years is None else resume_features.max_years
+            for resume_features in features
+        ])
+        keyword_counts = np.array([len(resume_features.experience_keywords) for resume_features in features])
+        required_years = job_posting.experience_required
+        if required_years > 0:
+            years_scores = np.minimum(max_years / required_years, 1) * 100
+        else:
+            years_scores = np.full(len(resumes), 100.0)
+        experience_scores = np.where(
+            max_years >= 0, years_scores, np.minimum(keyword_counts * 15, 70)
+        )
+        
+        # Education: degree and field flags
+        has_degree = np.array([resume_features.has_degree for resume_features in features], dtype=bool)
+        has_field = np.array([resume_features.has_computing_field for resume_features in features], dtype=bool)
+        education_scores = np.minimum(
+            has_degree * 50 + has_field * 30 + (has_degree & job_requires_degree) * 20, 100
+        )
+        
+        # Cosine similarity: stored corpus vectors, or the per-pair TF-IDF
+        # fallback of evaluate_resume when no corpus model has been fitted yet
+        if model is not None:
+            cosine_scores = self.vector_similarities(resumes, profile_vectors([profile], model), model)
+        else:
+            cosine_scores = np.array([
+                self.pairwise_similarity(resume_features.term_counts, profile.term_counts)
+                for resume_features in features
+            ])
+        
+        final_scores = (
+            skill_scores * self.skill_weight +
+            experience_scores * self.experience_weight +
+            education_scores * self.education_weight +
+            cosine_scores * self.cosine_weight
+        )
+        categories = np.select(
+            [final_scores >= 80, final_scores >= 60, final_scores >= 40],
+            ['excellent', 'good', 'average'],
+            default='below_average'
+        )
+        
+        results = []
+        for row, resume_features in enumerate(features):
+            normalized_text = resume_features.normalized_text
+            matched_skills = [skill for col, skill in enumerate(job_skills) if skill_matrix[row, col]]
+            missing_skills = [skill for col, skill in enumerate(job_skills) if not skill_matrix[row, col]]
+            keyword_highlights = [keyword for keyword in top_job_keywords if keyword in normalized_text][:5]
+            results.append({
+                'skill_match_score': float(skill_scores[row]),
+                'experience_score': float(experience_scores[row]),
+                'education_score': float(education_scores[row]),
+                'cosine_similarity_score': float(cosine_scores[row]),
+                'final_score': float(final_scores[row]),
+                'category': str(categories[row]),
+                'matched_skills': matched_skills,
+                'missing_skills': missing_skills,
+                'keyword_highlights': keyword_highlights
+            })
+        
+        return results
+    
+    def evaluate_against_jobs(self, resume, job_postings):
+        # Reverse of evaluate_batch: one resume against many job postings. The
+        # resume-side work is done once and every job is scored in one pass.
+        job_postings = list(job_postings)
+        if not job_postings:
+            return []
+        
+        model = get_current_model()
+        features = get_features(resume)
+        normalized_text = features.normalized_text
+        profiles = [get_job_profile(job, model) for job in job_postings]
+        
+        # Skill match: one automaton over the union of all job skills, one scan
+        job_skills = [profile.skills for profile in profiles]
+        union_matcher = compile_skill_matcher(tuple(sorted({skill for skills in job_skills for skill in skills})))
+        found = union_matcher.scan(features.skill_text)
+        found_skills = {union_matcher.skills[index] for index in found}
+        skill_scores = np.array([
+            sum(skill in found_skills for skill in skills) / len(skills) * 100 if skills else 0
+            for skills in job_skills
+        ], dtype=float)
+        
+        # Experience: the resume's years and keywords against every requirement
+        max_years = features.max_years
+        required_years = np.array([job.experience_required for job in job_postings], dtype=float)
+        if max_years is not None:
+            experience_scores = np.where(
+                max_years >= required_years, 100.0,
+                max_years / np.maximum(required_years, 1) * 100
+            )
+        else:
+            keyword_count = len(features.experience_keywords)
+            experience_scores = np.full(len(job_postings), float(min(keyword_count * 15, 70)))
+        
+        # Education: resume flags are fixed, only the job's degree requirement varies
+        has_degree = features.has_degree
+        has_field = features.has_computing_field
+        job_requires_degree = np.array([profile.requires_degree for profile in profiles])
+        education_scores = np.minimum(
+            has_degree * 50 + has_field * 30 + (job_requires_degree & has_degree) * 20, 100
+        ).astype(float)
+        
+        # Cosine similarity: stacked job vectors times the resume vector, or
+        # the per-pair TF-IDF fallback when no corpus model has been fitted yet
+        if model is not None:
+            job_matrix = profile_vectors(profiles, model)
+            resume_vector = resume_vectors([resume], model)
+            cosine_scores = (job_matrix @ resume_vector.T).toarray().ravel() * 100
+        else:
+            cosine_scores = np.array([
+                self.pairwise_similarity(features.term_counts, profile.term_counts) for profile in profiles
+            ])
+        
+        final_scores = (
+            skill_scores * self.skill_weight +
+            experience_scores * self.experience_weight +
+            education_scores * self.education_weight +
+            cosine_scores * self.cosine_weight
+        )
+        categories = np.select(
+            [final_scores >= 80, final_scores >= 60, final_scores >= 40],
+            ['excellent', 'good', 'average'],
+            default='below_average'
+        )
+        
+        results = []
+        for col, profile in enumerate(profiles):
+            results.append({
+                'skill_match_score': float(skill_scores[col]),
+                'experience_score': float(experience_scores[col]),
+                'education_score': float(education_scores[col]),
+                'cosine_similarity_score': float(cosine_scores[col]),
+                'final_score': float(final_scores[col]),
+                'category': str(categories[col]),
+                'matched_skills': [skill for skill in job_skills[col] if skill in found_skills],
+                'missing_skills': [skill for skill in job_skills[col] if skill not in found_skills],
+                'keyword_highlights': [keyword for keyword in profile.top_keywords if keyword in normalized_text][:5]
+            })
+        
+        return results
+    
     def get_category_from_score(self, score):
         if score >= 80:
             return 'excellent'
@@ -162,4 +432,8 @@ class ResumeEvaluator:
         elif score >= 40:
             return 'average'
         else:
-            return 'below_average'
\ No newline at end of file
+            return 'below_average'
+
+def score_resume(resume, job_posting):
+    # Process-pool entry point; the resume and job arrive pickled with their fields loaded
+    return ResumeEvaluator().evaluate_resume(resume, job_posting)
@@ -0,0 +1,91 @@
+import hashlib
+import re
+from collections import Counter
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ..models import Resume, ResumeFeatures
+
+# Bump whenever feature extraction changes so stored rows are recomputed
+FEATURES_VERSION = '2'
+
+YEAR_PATTERN = re.compile(r'(\d+)\s*(?:years?|yrs?)')
+EXPERIENCE_KEYWORDS = ['experience', 'worked', 'developed', 'managed', 'led', 'created']
+EDUCATION_KEYWORDS = ['degree', 'bachelor', 'master', 'phd', 'diploma', 'certification']
+COMPUTING_FIELD_KEYWORDS = ['computer', 'software']
+
+# Larger "N years" mentions are clamped to fit the column; they satisfy any requirement anyway
+MAX_STORED_YEARS = 2 ** 31 - 1
+
+NON_WORD_PATTERN = re.compile(r'[^\w\s]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Tokens exactly as TfidfVectorizer(stop_words='english') produces them
+term_analyzer = TfidfVectorizer(stop_words='english').build_analyzer()
+
+FEATURE_FIELDS = [
+    'version', 'text_hash', 'normalized_text', 'normalized_skills', 'max_years',
+    'experience_keywords', 'has_degree', 'has_computing_field', 'term_counts', 'computed_at',
+]
+
+def normalize_text(text):
+    text = text.lower()
+    text = NON_WORD_PATTERN.sub(' ', text)
+    text = WHITESPACE_PATTERN.sub(' ', text)
+    return text.strip()
+
+def compute_text_hash(resume):
+    # Hash of the raw fields, cheap enough to check on every scoring call
+    text_hash = hashlib.sha256()
+    for value in (resume.raw_text, resume.skills, resume.education):
+        text_hash.update(value.encode())
+        text_hash.update(b'\0')
+    return text_hash.hexdigest()
+
+def compute_features(resume, text_hash=None):
+    """Derive the resume's scoring features from its text (not saved)."""
+    text_lower = resume.raw_text.lower()
+    education_lower = resume.education.lower()
+    normalized_text = normalize_text(resume.raw_text)
+    normalized_skills = normalize_text(resume.skills)
+    years = [int(year) for year in YEAR_PATTERN.findall(text_lower)]
+
+    return ResumeFeatures(
+        resume_id=resume.id,
+        version=FEATURES_VERSION,
+        text_hash=text_hash or compute_text_hash(resume),
+        normalized_text=normalized_text,
+        normalized_skills=normalized_skills,
+        max_years=min(max(years), MAX_STORED_YEARS) if years else None,
+        experience_keywords=[keyword for keyword in EXPERIENCE_KEYWORDS if keyword in text_lower],
+        has_degree=any(keyword in education_lower for keyword in EDUCATION_KEYWORDS),
+        has_computing_field=any(keyword in education_lower for keyword in COMPUTING_FIELD_KEYWORDS),
+        term_counts=dict(Counter(term_analyzer(normalized_text))),
+    )
+
+def save_features(resumes):
+    """Compute and upsert the features of saved resumes, attaching them to each instance."""
+    features = [compute_features(resume) for resume in resumes]
+    ResumeFeatures.objects.bulk_create(
+        features, update_conflicts=True, unique_fields=['resume'], update_fields=FEATURE_FIELDS,
+    )
+    for resume, resume_features in zip(resumes, features):
+        resume.features = resume_features
+    return features
+
+def get_features(resume):
+    """The resume's current features: the stored row if loaded, else computed.
+
+    Only features already loaded with the resume (select_related('features'))
+    are used; a lazy query per resume would cost more than recomputing, and
+    scoring may run in a worker process without a usable connection. The row
+    is checked against the resume's current text, which may have been edited
+    without going through save_features (admin, ORM updates).
+    """
+    features = None
+    if Resume.features.is_cached(resume):
+        features = getattr(resume, 'features', None)
+    text_hash = compute_text_hash(resume)
+    if features is None or features.version != FEATURES_VERSION or features.text_hash != text_hash:
+        features = compute_features(resume, text_hash)
+    return features
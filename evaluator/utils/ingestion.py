@@ -0,0 +1,187 @@
+import logging
+import threading
+from concurrent.futures import as_completed
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from ..models import Resume
+from .features import save_features
+from .metrics import EXTRACTIONS
+from .pdf_extractor import extract_resume_path
+from .process_pool import get_pool_size, get_process_pool, reset_process_pool
+from .timing import call_with_timings, merge_stage_timings, stage
+from .vectorizer import vectorize_resume
+
+logger = logging.getLogger(__name__)
+
+def extraction_limits():
+    return settings.PDF_MAX_PAGES, settings.PDF_MAX_CHARS
+
+def submit_extraction(executor, path):
+    return executor.submit(call_with_timings, extract_resume_path, path, *extraction_limits())
+
+def extraction_result(future):
+    # Stages timed in the worker are merged into this process's metrics
+    extracted_data, stages, _ = future.result()
+    merge_stage_timings(stages)
+    return extracted_data
+
+def extract_alone(path):
+    # A dead worker breaks every future in flight, so after a crash each PDF is
+    # retried on its own fresh pool: only the one that breaks it again is at fault
+    executor = get_process_pool()
+    try:
+        return extraction_result(submit_extraction(executor, path))
+    except BrokenProcessPool:
+        reset_process_pool(executor)
+        raise
+
+class IngestionQueue:
+    """DB-backed extraction queue: pending Resume rows are the queue entries.
+
+    Rows are claimed with a conditional UPDATE, so any number of web processes
+    (or the `process_resumes` command) can drain the queue without a broker.
+    """
+
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def enqueue(self, resume):
+        if settings.RESUME_INGESTION_EAGER:
+            self.process(self.claim([resume.id]), executor=None)
+            resume.refresh_from_db()
+            return
+        transaction.on_commit(self.notify)
+
+    def notify(self):
+        self.start()
+        self._wakeup.set()
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self.run_forever, name='resume-ingestion', daemon=True)
+                self._thread.start()
+
+    def run_forever(self):
+        while True:
+            try:
+                self.drain()
+            except Exception:
+                logger.exception("Resume ingestion pass failed")
+            finally:
+                close_old_connections()
+            self._wakeup.wait(timeout=settings.RESUME_INGESTION_POLL_INTERVAL)
+            self._wakeup.clear()
+
+    def drain(self):
+        batch_size = get_pool_size() * 2
+        self.requeue_stale()
+        while True:
+            pending_ids = list(
+                Resume.objects.filter(status='pending')
+                .order_by('uploaded_at')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not pending_ids:
+                return
+            # Fetched per batch: a crash in the previous batch replaces the pool
+            self.process(self.claim(pending_ids), get_process_pool())
+
+    def claim(self, resume_ids):
+        # One write transaction for the whole batch instead of one per row
+        claimed = []
+        with transaction.atomic():
+            for resume_id in resume_ids:
+                updated = Resume.objects.filter(id=resume_id, status='pending').update(
+                    status='processing', processing_started_at=timezone.now()
+                )
+                if updated:
+                    claimed.append(resume_id)
+        return list(Resume.objects.filter(id__in=claimed))
+
+    def requeue_stale(self):
+        # Rows left in 'processing' by a worker that died are picked up again
+        cutoff = timezone.now() - timedelta(seconds=settings.RESUME_INGESTION_STALE_AFTER)
+        Resume.objects.filter(status='processing', processing_started_at__lt=cutoff).update(status='pending')
+
+    def process(self, resumes, executor):
+        if executor is None:
+            for resume in resumes:
+                try:
+                    self.finish(resume, extract_resume_path(resume.file.path, *extraction_limits()))
+                except Exception as e:
+                    self.fail(resume, e)
+            return
+
+        futures = {submit_extraction(executor, resume.file.path): resume for resume in resumes}
+        broken = []
+        for future in as_completed(futures):
+            resume = futures[future]
+            try:
+                self.finish(resume, extraction_result(future))
+            except BrokenProcessPool:
+                broken.append(resume)
+            except Exception as e:
+                self.fail(resume, e)
+
+        if broken:
+            reset_process_pool(executor)
+        for resume in broken:
+            try:
+                self.finish(resume, extract_alone(resume.file.path))
+            except Exception as e:
+                self.fail(resume, e)
+
+    def finish(self, resume, extracted_data):
+        for field, value in extracted_data.items():
+            setattr(resume, field, value)
+        with stage('tfidf.vectorize'):
+            vectorize_resume(resume)
+        resume.status = 'done'
+        resume.error = ''
+        resume.processing_finished_at = timezone.now()
+        with stage('db.save_resume'):
+            resume.save()
+        with stage('extract.features'):
+            save_features([resume])
+        EXTRACTIONS.inc(status='done')
+
+    def fail(self, resume, error):
+        logger.warning("Failed to extract resume %s: %s", resume.id, error)
+        resume.status = 'failed'
+        resume.error = f'Failed to extract resume data: {error}'
+        resume.processing_finished_at = timezone.now()
+        resume.save(update_fields=['status', 'error', 'processing_finished_at'])
+        EXTRACTIONS.inc(status='failed')
+
+def extract_in_parallel(paths):
+    """Extract many stored PDFs across the process pool.
+
+    Returns (extracted_data, error) pairs in the same order as paths.
+    """
+    executor = get_process_pool()
+    futures = [submit_extraction(executor, path) for path in paths]
+    results = []
+    for path, future in zip(paths, futures):
+        try:
+            try:
+                extracted_data = extraction_result(future)
+            except BrokenProcessPool:
+                reset_process_pool(executor)
+                extracted_data = extract_alone(path)
+            results.append((extracted_data, None))
+        except Exception as e:
+            results.append((None, f'Failed to extract resume data: {e}'))
+    failed = sum(1 for _, error in results if error)
+    EXTRACTIONS.inc(len(results) - failed, status='done')
+    EXTRACTIONS.inc(failed, status='failed')
+    return results
+
+ingestion_queue = IngestionQueue()
@@ -0,0 +1,162 @@
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from functools import lru_cache
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from ..models import JobPosting, JobProfile
+from .features import EDUCATION_KEYWORDS, normalize_text, term_analyzer
+from .skill_matcher import compile_skill_matcher
+from .vectorizer import decode_vectors, encode_vector, get_current_model
+
+# Bump whenever profile compilation changes so stored rows are recompiled
+JOB_PROFILE_VERSION = '1'
+JOB_PROFILE_CACHE_SIZE = 1024
+
+PROFILE_FIELDS = [
+    'version', 'source_hash', 'skills', 'top_keywords', 'requires_degree',
+    'term_counts', 'tfidf_vector', 'tfidf_version', 'computed_at',
+]
+
+# Same tokenization as a TF-IDF fit on the description alone; with a single
+# document every IDF is equal, so the top TF-IDF terms are the most frequent ones
+keyword_analyzer = TfidfVectorizer(stop_words='english', ngram_range=(1, 2)).build_analyzer()
+
+@lru_cache(maxsize=1024)
+def top_keywords(normalized_description):
+    counts = Counter(keyword_analyzer(normalized_description))
+    ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))
+    return tuple(term for term, _ in ranked[:10])
+
+@lru_cache(maxsize=1024)
+def job_term_counts(normalized_description):
+    return dict(Counter(term_analyzer(normalized_description)))
+
+def compute_source_hash(job_posting):
+    source_hash = hashlib.sha256()
+    for value in (job_posting.description, job_posting.required_skills):
+        source_hash.update(value.encode())
+        source_hash.update(b'\0')
+    return source_hash.hexdigest()
+
+def compute_job_profile(job_posting, model=None, source_hash=None):
+    """Compile the job's scoring profile under the given corpus model (not saved)."""
+    normalized_description = normalize_text(job_posting.description)
+    matcher = compile_skill_matcher(tuple(normalize_text(skill) for skill in job_posting.skills_list))
+    return JobProfile(
+        job_posting_id=job_posting.id,
+        version=JOB_PROFILE_VERSION,
+        source_hash=source_hash or compute_source_hash(job_posting),
+        skills=list(matcher.skills),
+        top_keywords=list(top_keywords(normalized_description)),
+        requires_degree=any(keyword in job_posting.description.lower() for keyword in EDUCATION_KEYWORDS),
+        term_counts=job_term_counts(normalized_description),
+        tfidf_vector=encode_vector(model.job_vector(job_posting.description)) if model else None,
+        tfidf_version=model.version if model else '',
+    )
+
+def is_current(profile, source_hash, model):
+    return (
+        profile is not None and profile.version == JOB_PROFILE_VERSION
+        and profile.source_hash == source_hash
+        and profile.tfidf_version == (model.version if model else '')
+    )
+
+_profile_cache = OrderedDict()
+_profile_cache_lock = threading.Lock()
+
+def get_cached_profile(job_id):
+    with _profile_cache_lock:
+        profile = _profile_cache.get(job_id)
+        if profile is not None:
+            _profile_cache.move_to_end(job_id)
+        return profile
+
+def cache_profile(profile):
+    with _profile_cache_lock:
+        _profile_cache[profile.job_posting_id] = profile
+        _profile_cache.move_to_end(profile.job_posting_id)
+        while len(_profile_cache) > JOB_PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+
+def evict_job_profile(job_id):
+    with _profile_cache_lock:
+        _profile_cache.pop(job_id, None)
+
+def find_profile(job_posting, source_hash, model):
+    # Profile attached to the instance (select_related or load_job_profiles),
+    # then the in-process LRU; each is checked against the job's current text
+    if JobPosting.profile.is_cached(job_posting):
+        profile = getattr(job_posting, 'profile', None)
+        if is_current(profile, source_hash, model):
+            return profile
+    profile = get_cached_profile(job_posting.id)
+    if is_current(profile, source_hash, model):
+        return profile
+    return None
+
+def get_job_profile(job_posting, model=None):
+    """The job's current profile, compiled in process if none is at hand.
+
+    Never queries the database, so it is safe inside pool workers; views
+    call load_job_profiles() first to reuse and persist stored profiles.
+    """
+    source_hash = compute_source_hash(job_posting)
+    profile = find_profile(job_posting, source_hash, model)
+    if profile is None:
+        profile = compute_job_profile(job_posting, model, source_hash)
+        if job_posting.id is not None:
+            cache_profile(profile)
+    return profile
+
+def load_job_profiles(job_postings, model=None):
+    """Attach a current profile to each saved job posting.
+
+    Profiles come from the instance, the in-process LRU or the database;
+    missing or stale ones are compiled and saved in one upsert.
+    """
+    model = model or get_current_model()
+    job_postings = list(job_postings)
+    source_hashes = [compute_source_hash(job_posting) for job_posting in job_postings]
+    profiles = [
+        find_profile(job_posting, source_hash, model)
+        for job_posting, source_hash in zip(job_postings, source_hashes)
+    ]
+
+    missing = [index for index, profile in enumerate(profiles) if profile is None]
+    if missing:
+        stored = JobProfile.objects.in_bulk([job_postings[index].id for index in missing])
+        compiled = []
+        for index in missing:
+            profile = stored.get(job_postings[index].id)
+            if not is_current(profile, source_hashes[index], model):
+                profile = compute_job_profile(job_postings[index], model, source_hashes[index])
+                compiled.append(profile)
+            profiles[index] = profile
+        if compiled:
+            JobProfile.objects.bulk_create(
+                compiled, update_conflicts=True, unique_fields=['job_posting'], update_fields=PROFILE_FIELDS,
+            )
+
+    for job_posting, profile in zip(job_postings, profiles):
+        job_posting.profile = profile
+        cache_profile(profile)
+    return profiles
+
+def load_job_profile(job_posting, model=None):
+    return load_job_profiles([job_posting], model)[0]
+
+def profile_vectors(profiles, model):
+    """Stack the profiles' stored description vectors under the given model."""
+    return decode_vectors([profile.tfidf_vector for profile in profiles], model.n_features)
+
+def invalidate_job_profile(sender, instance, created=False, raw=False, **kwargs):
+    # post_save receiver: the saved text may differ from what the profile was compiled from
+    evict_job_profile(instance.pk)
+    if not created and not raw:
+        JobProfile.objects.filter(job_posting_id=instance.pk).delete()
+
+def forget_job_profile(sender, instance, **kwargs):
+    # post_delete receiver; the stored row is removed by the cascade
+    evict_job_profile(instance.pk)
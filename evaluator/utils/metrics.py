@@ -0,0 +1,127 @@
+import threading
+from bisect import bisect_left
+
+# Minimal Prometheus text-format registry (exposition format 0.0.4). Metrics
+# live in process memory, so each gunicorn worker reports its own series.
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Seconds; spans a regex pass on one resume up to a 10-page PDF or a pool rank
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def format_labels(labelnames, values, extra=()):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in zip(labelnames, values)]
+    pairs += [f'{name}="{value}"' for name, value in extra]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Metric:
+    kind = ''
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def label_values(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        with self._lock:
+            series = sorted(self._series.items())
+            lines += self.render_series(series)
+        return lines
+
+class Counter(Metric):
+    # Counter names end in _total, and the HELP/TYPE lines use the same name as
+    # the samples: in the 0.0.4 text format a different name is another family
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        if not name.endswith('_total'):
+            raise ValueError(f"Counter name {name!r} must end in '_total'")
+        super().__init__(name, documentation, labelnames)
+
+    def inc(self, amount=1, **labels):
+        key = self.label_values(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def render_series(self, series):
+        return [
+            f'{self.name}{format_labels(self.labelnames, key)} {format_value(value)}'
+            for key, value in series
+        ]
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets) + (float('inf'),)
+
+    def observe(self, value, **labels):
+        key = self.label_values(labels)
+        # Counts are stored per bucket and made cumulative when rendered
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.get(key, (None, 0.0))
+            if counts is None:
+                counts = [0] * len(self.buckets)
+            counts[index] += 1
+            self._series[key] = (counts, total + value)
+
+    def render_series(self, series):
+        lines = []
+        for key, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = format_labels(self.labelnames, key, [('le', format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {cumulative}')
+        return lines
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines += metric.render()
+        return '\n'.join(lines) + '\n'
+
+registry = Registry()
+
+STAGE_SECONDS = registry.register(Histogram(
+    'resume_evaluator_stage_seconds', 'Time spent in one extraction or scoring stage.', ['stage'],
+))
+REQUEST_SECONDS = registry.register(Histogram(
+    'resume_evaluator_request_seconds', 'Time to produce a response, by view.', ['view', 'method'],
+))
+REQUESTS = registry.register(Counter(
+    'resume_evaluator_requests_total', 'Responses sent, by view and status code.', ['view', 'method', 'status'],
+))
+EXTRACTIONS = registry.register(Counter(
+    'resume_evaluator_extractions_total', 'Resume extractions finished, by outcome.', ['status'],
+))
+EVALUATIONS = registry.register(Counter(
+    'resume_evaluator_evaluations_total', 'Evaluations requested, by whether they were scored or reused.', ['result'],
+))
@@ -1,110 +1,158 @@
 import PyPDF2
+import io
+import mmap
+import os
 import re
-from io import BytesIO
+from contextlib import ExitStack, closing
+
+from .timing import stage
+
+SECTION_HEADINGS = {
+    'education': [
+        'education', 'academic background', 'academics', 'academic qualifications',
+        'education and training', 'qualifications',
+    ],
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'relevant experience',
+        'employment', 'employment history', 'work history', 'career history',
+    ],
+    'skills': [
+        'skills', 'technical skills', 'key skills', 'core skills', 'core competencies',
+        'technologies', 'programming languages', 'tools', 'skills and tools',
+    ],
+    'projects': ['projects', 'personal projects', 'academic projects', 'selected projects'],
+    'certifications': ['certifications', 'certificates', 'licenses and certifications'],
+    'summary': ['summary', 'professional summary', 'profile', 'objective', 'about me'],
+    'awards': ['awards', 'honors', 'honors and awards', 'achievements'],
+    'publications': ['publications'],
+    'interests': ['interests', 'hobbies'],
+}
+
+HEADING_TO_SECTION = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+# A heading is a whole line consisting of one known title, optionally followed by a colon
+HEADING_PATTERN = re.compile(
+    r'^\s*(' + '|'.join(
+        r'\s+'.join(re.escape(word) for word in heading.split())
+        for heading in sorted(HEADING_TO_SECTION, key=len, reverse=True)
+    ) + r')\s*:?\s*$',
+    re.IGNORECASE
+)
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+BULLET_PATTERN = re.compile(r'[•·\-\*]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
 
 class ResumeExtractor:
-    def __init__(self):
-        self.email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        self.phone_pattern = r'(\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'
-        
-    def extract_text_from_pdf(self, pdf_file):
+    def __init__(self, max_pages=None, max_chars=None):
+        self.email_pattern = EMAIL_PATTERN
+        self.phone_pattern = PHONE_PATTERN
+        # Budgets that bound memory and CPU on very long PDFs (None = unlimited)
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+    
+    def open_pdf_stream(self, pdf_file, stack):
+        # Map files that live on disk instead of copying them into memory;
+        # anything else (e.g. an in-memory upload) is read in place
+        if isinstance(pdf_file, (str, os.PathLike)):
+            pdf_file = stack.enter_context(open(pdf_file, 'rb'))
         try:
-            pdf_reader = PyPDF2.PdfReader(BytesIO(pdf_file.read()))
-            text = ""
+            return stack.enter_context(mmap.mmap(pdf_file.fileno(), 0, access=mmap.ACCESS_READ))
+        except (AttributeError, io.UnsupportedOperation, OSError, ValueError):
+            pdf_file.seek(0)
+            return pdf_file
+    
+    def iter_page_text(self, pdf_file):
+        with ExitStack() as stack:
+            pdf_reader = PyPDF2.PdfReader(self.open_pdf_stream(pdf_file, stack))
             for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text
+                yield page.extract_text() or ""
+    
+    def extract_text_from_pdf(self, pdf_file):
+        try:
+            pages = []
+            chars = 0
+            with closing(self.iter_page_text(pdf_file)) as page_texts:
+                for page_text in page_texts:
+                    if self.max_chars is not None and chars + len(page_text) >= self.max_chars:
+                        pages.append(page_text[:self.max_chars - chars])
+                        break
+                    pages.append(page_text)
+                    chars += len(page_text)
+                    if self.max_pages is not None and len(pages) >= self.max_pages:
+                        break
+            return "".join(f"{page}\n" for page in pages)
         except Exception as e:
             raise Exception(f"Error extracting PDF: {str(e)}")
     
-    def extract_contact_info(self, text):
-        lines = text.split('\n')
+    def segment_sections(self, text):
+        # Split the text once and assign every non-empty line to the section
+        # under the most recent heading; lines before any heading go to 'header'
+        sections = {'header': []}
+        current = sections['header']
+        
+        for line in text.split('\n'):
+            line = line.strip()
+            if not line:
+                continue
+            heading_match = HEADING_PATTERN.match(line)
+            if heading_match:
+                heading = WHITESPACE_PATTERN.sub(' ', heading_match.group(1).lower())
+                current = sections.setdefault(HEADING_TO_SECTION[heading], [])
+            else:
+                current.append(line)
+        
+        return sections
+    
+    def extract_contact_info(self, text, sections):
         contact_info = {'name': '', 'email': '', 'phone': ''}
         
         # Extract email
-        email_match = re.search(self.email_pattern, text)
+        email_match = self.email_pattern.search(text)
         if email_match:
             contact_info['email'] = email_match.group()
         
         # Extract phone
-        phone_match = re.search(self.phone_pattern, text)
+        phone_match = self.phone_pattern.search(text)
         if phone_match:
             contact_info['phone'] = phone_match.group()
         
-        # Extract name (usually first non-empty line)
-        for line in lines[:5]:  # Check first 5 lines
-            line = line.strip()
-            if line and not re.search(self.email_pattern, line) and not re.search(self.phone_pattern, line):
+        # Extract name (usually first line of the header)
+        for line in sections['header'][:5]:  # Check first 5 lines
+            if not self.email_pattern.search(line) and not self.phone_pattern.search(line):
                 if len(line.split()) >= 2 and len(line) < 50:  # Likely a name
                     contact_info['name'] = line
                     break
         
         return contact_info
     
-    def extract_education(self, text):
-        education_keywords = ['education', 'degree', 'university', 'college', 'bachelor', 'master', 'phd', 'diploma']
-        lines = text.lower().split('\n')
-        
-        education_section = []
-        in_education_section = False
-        
-        for i, line in enumerate(lines):
-            if any(keyword in line for keyword in education_keywords):
-                in_education_section = True
-                # Get next few lines as education details
-                for j in range(i, min(i+10, len(lines))):
-                    if lines[j].strip():
-                        education_section.append(lines[j].strip())
-                break
-        
-        return '\n'.join(education_section[:5]) if education_section else ''
+    def extract_education(self, sections):
+        return '\n'.join(sections.get('education', []))
     
-    def extract_experience(self, text):
-        experience_keywords = ['experience', 'work', 'employment', 'career', 'position', 'job']
-        lines = text.lower().split('\n')
-        
-        experience_section = []
-        in_experience_section = False
-        
-        for i, line in enumerate(lines):
-            if any(keyword in line for keyword in experience_keywords):
-                in_experience_section = True
-                # Get next several lines as experience details
-                for j in range(i, min(i+15, len(lines))):
-                    if lines[j].strip():
-                        experience_section.append(lines[j].strip())
-                break
-        
-        return '\n'.join(experience_section[:10]) if experience_section else ''
+    def extract_experience(self, sections):
+        return '\n'.join(sections.get('experience', []))
     
-    def extract_skills(self, text):
-        skills_keywords = ['skills', 'technical skills', 'technologies', 'programming', 'tools']
-        lines = text.lower().split('\n')
-        
-        skills_section = []
-        
-        for i, line in enumerate(lines):
-            if any(keyword in line for keyword in skills_keywords):
-                # Get next few lines as skills
-                for j in range(i+1, min(i+8, len(lines))):
-                    if lines[j].strip() and not any(kw in lines[j] for kw in ['experience', 'education', 'project']):
-                        skills_section.append(lines[j].strip())
-                break
-        
+    def extract_skills(self, sections):
         # Clean and format skills
-        skills_text = ' '.join(skills_section)
-        skills_text = re.sub(r'[•·\-\*]', ',', skills_text)
-        skills_text = re.sub(r'\s+', ' ', skills_text)
+        skills_text = ' '.join(sections.get('skills', []))
+        skills_text = BULLET_PATTERN.sub(',', skills_text)
+        skills_text = WHITESPACE_PATTERN.sub(' ', skills_text)
         
         return skills_text
     
     def extract_all_data(self, pdf_file):
-        text = self.extract_text_from_pdf(pdf_file)
+        with stage('extract.pdf_text'):
+            text = self.extract_text_from_pdf(pdf_file)
+        with stage('extract.sections'):
+            sections = self.segment_sections(text)
         
-        contact_info = self.extract_contact_info(text)
-        education = self.extract_education(text)
-        experience = self.extract_experience(text)
-        skills = self.extract_skills(text)
+        with stage('extract.fields'):
+            contact_info = self.extract_contact_info(text, sections)
+            education = self.extract_education(sections)
+            experience = self.extract_experience(sections)
+            skills = self.extract_skills(sections)
         
         return {
             'raw_text': text,
@@ -114,4 +162,8 @@ class ResumeExtractor:
             'education': education,
             'experience': experience,
             'skills': skills
-        }
\ No newline at end of file
+        }
+
+def extract_resume_path(path, max_pages=None, max_chars=None):
+    # Entry point for worker processes: takes a storage path, not a file object
+    return ResumeExtractor(max_pages, max_chars).extract_all_data(path)
@@ -0,0 +1,101 @@
+from collections import Counter
+
+import numpy as np
+from django.db import connection
+from django.db.models import Avg, Count, Q
+
+from ..models import Evaluation
+
+SCORE_FIELDS = [
+    'final_score', 'skill_match_score', 'experience_score', 'education_score', 'cosine_similarity_score',
+]
+PERCENTILES = [25, 50, 75, 90]
+HISTOGRAM_BUCKET = 10
+
+def histogram_buckets():
+    # [0, 10), [10, 20), ... [90, 100]; the last bucket includes a perfect score
+    for low in range(0, 100, HISTOGRAM_BUCKET):
+        high = low + HISTOGRAM_BUCKET
+        upper = Q(final_score__lte=high) if high == 100 else Q(final_score__lt=high)
+        yield low, high, Q(final_score__gte=low) & upper
+
+def job_pool_stats(job_posting, top_skills=10):
+    """Score distribution of every evaluation of a job, computed in the database.
+
+    Three queries regardless of pool size: one aggregate for the counts,
+    histogram and means, one narrow read of the scores for the percentiles
+    and one for the most common missing skills.
+    """
+    evaluations = Evaluation.objects.filter(job_posting=job_posting)
+
+    aggregates = {'total': Count('id')}
+    for category, _ in Evaluation.SCORE_CATEGORIES:
+        aggregates[f'category_{category}'] = Count('id', filter=Q(category=category))
+    for low, high, condition in histogram_buckets():
+        aggregates[f'bucket_{low}'] = Count('id', filter=condition)
+    for field in SCORE_FIELDS:
+        aggregates[f'mean_{field}'] = Avg(field)
+    totals = evaluations.aggregate(**aggregates)
+
+    percentiles = score_percentiles(job_posting.id) if totals['total'] else {}
+    scores = {}
+    for field in SCORE_FIELDS:
+        scores[field] = {'mean': totals[f'mean_{field}']}
+        for percentile in PERCENTILES:
+            scores[field][f'p{percentile}'] = percentiles.get(f'{field}_p{percentile}')
+
+    return {
+        'job_posting_id': job_posting.id,
+        'total': totals['total'],
+        'categories': {
+            category: totals[f'category_{category}'] for category, _ in Evaluation.SCORE_CATEGORIES
+        },
+        'histogram': [
+            {'min': low, 'max': high, 'count': totals[f'bucket_{low}']}
+            for low, high, _ in histogram_buckets()
+        ],
+        'scores': scores,
+        'top_missing_skills': top_missing_skills(job_posting.id, top_skills) if totals['total'] else [],
+    }
+
+def score_percentiles(job_posting_id):
+    # SQLite has no percentile aggregate, and one ROW_NUMBER() window per score
+    # costs a full sort each (about 4x slower at 50k rows than this). So the
+    # five score columns are read in one narrow query and ranked with NumPy
+    # (nearest-rank, like percentile_disc)
+    rows = Evaluation.objects.filter(job_posting_id=job_posting_id).values_list(*SCORE_FIELDS)
+    scores = np.array(list(rows), dtype=np.float64)
+    values = np.percentile(scores, PERCENTILES, axis=0, method='inverted_cdf')
+    return {
+        f'{field}_p{percentile}': float(values[row, col])
+        for col, field in enumerate(SCORE_FIELDS)
+        for row, percentile in enumerate(PERCENTILES)
+    }
+
+def top_missing_skills(job_posting_id, limit):
+    if limit < 1:
+        # A negative LIMIT means no limit to SQLite
+        return []
+    table = Evaluation._meta.db_table
+    if connection.vendor == 'sqlite':
+        sql = f"""
+            SELECT skill.value, COUNT(*) AS missing FROM {table}, json_each({table}.missing_skills) AS skill
+            WHERE {table}.job_posting_id = %s
+            GROUP BY skill.value ORDER BY missing DESC, skill.value LIMIT %s
+        """
+    elif connection.vendor == 'postgresql':
+        sql = f"""
+            SELECT skill, COUNT(*) AS missing FROM {table}, jsonb_array_elements_text({table}.missing_skills) AS skill
+            WHERE {table}.job_posting_id = %s
+            GROUP BY skill ORDER BY missing DESC, skill LIMIT %s
+        """
+    else:
+        counts = Counter()
+        for skills in Evaluation.objects.filter(job_posting_id=job_posting_id).values_list('missing_skills', flat=True):
+            counts.update(skills)
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [{'skill': skill, 'count': count} for skill, count in ranked]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [job_posting_id, limit])
+        return [{'skill': skill, 'count': count} for skill, count in cursor.fetchall()]
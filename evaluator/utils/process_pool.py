@@ -0,0 +1,30 @@
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+
+_pool_lock = threading.Lock()
+_pool = None
+
+def get_pool_size():
+    return getattr(settings, 'PROCESS_POOL_WORKERS', None) or os.cpu_count() or 1
+
+def get_process_pool():
+    """Shared, bounded pool for CPU-heavy PDF parsing and scoring."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=get_pool_size())
+    return _pool
+
+def reset_process_pool(executor):
+    # A worker that dies (e.g. on a pathological PDF) breaks the whole executor.
+    # Only the executor that broke is dropped: another caller may already have
+    # replaced it, and shutting down the new pool would cancel healthy work
+    global _pool
+    with _pool_lock:
+        if _pool is executor:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
@@ -0,0 +1,95 @@
+import hmac
+import json
+import pstats
+import re
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.utils import timezone
+
+PROFILE_HEADER = 'HTTP_X_PROFILE_TOKEN'
+PROFILE_PARAM = '_profile'
+PROFILE_NAME_PATTERN = re.compile(r'^[\w.-]+$')
+UNSAFE_NAME_CHARS = re.compile(r'[^\w.-]')
+# ?sort= on the admin page -> column of top_functions() rows
+SORT_KEYS = {'cumulative': 'cumtime', 'tottime': 'tottime', 'calls': 'ncalls'}
+
+def profiling_requested(request):
+    # Header or query flag carrying the PROFILING_TOKEN secret
+    token = request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+    return bool(token) and hmac.compare_digest(token.encode(), settings.PROFILING_TOKEN.encode())
+
+def get_profile_dir():
+    return Path(settings.PROFILING_DIR)
+
+def get_profile_path(name, suffix):
+    if not PROFILE_NAME_PATTERN.match(name):
+        raise FileNotFoundError(name)
+    return get_profile_dir() / f'{name}{suffix}'
+
+def recorded_path(request):
+    # The query string without the token, which must not be stored with the profile
+    query = request.GET.copy()
+    query.pop(PROFILE_PARAM, None)
+    return f'{request.path}?{query.urlencode()}' if query else request.path
+
+def save_profile(profiler, request, response, duration):
+    """Write profiler stats (.prof, loadable by pstats or snakeviz) and request metadata (.json)."""
+    profile_dir = get_profile_dir()
+    profile_dir.mkdir(parents=True, exist_ok=True)
+    created = timezone.now()
+    match = request.resolver_match
+    view = match.view_name if match else 'unmatched'
+    name = f'{created:%Y%m%dT%H%M%S%f}-{UNSAFE_NAME_CHARS.sub("_", view)}-{uuid.uuid4().hex[:8]}'
+
+    profiler.dump_stats(profile_dir / f'{name}.prof')
+    metadata = {
+        'name': name,
+        'created': created.isoformat(),
+        'method': request.method,
+        'path': recorded_path(request),
+        'view': view,
+        'status': response.status_code,
+        'duration_ms': duration * 1000,
+    }
+    (profile_dir / f'{name}.json').write_text(json.dumps(metadata))
+    prune_profiles()
+    return name
+
+def list_profiles():
+    # Newest first; names start with a UTC timestamp
+    profiles = []
+    for path in sorted(get_profile_dir().glob('*.json'), reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+def prune_profiles():
+    for path in sorted(get_profile_dir().glob('*.json'), reverse=True)[settings.PROFILING_MAX_FILES:]:
+        path.unlink(missing_ok=True)
+        path.with_suffix('.prof').unlink(missing_ok=True)
+
+def load_profile(name):
+    metadata = json.loads(get_profile_path(name, '.json').read_text())
+    stats = pstats.Stats(str(get_profile_path(name, '.prof')))
+    return metadata, stats
+
+def top_functions(stats, sort='cumulative', limit=50):
+    """Rows for the heaviest functions: calls, tottime and cumtime per function."""
+    rows = []
+    for (filename, line, function), (primitive_calls, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({
+            'function': function,
+            'location': f'{filename}:{line}' if line else filename,
+            'calls': calls if calls == primitive_calls else f'{calls}/{primitive_calls}',
+            'ncalls': calls,
+            'tottime': tottime,
+            'cumtime': cumtime,
+            'percall': cumtime / calls if calls else 0,
+        })
+    key = SORT_KEYS.get(sort, 'cumtime')
+    rows.sort(key=lambda row: row[key], reverse=True)
+    return rows[:limit]
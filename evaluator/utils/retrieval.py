@@ -0,0 +1,192 @@
+import os
+import pickle
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from sklearn.decomposition import TruncatedSVD
+
+from ..models import Resume
+from .batching import iter_chunks
+from .vectorizer import get_current_model, resume_vectors
+
+# A resume finished just before a build may not have been committed when the
+# build read the table; anything finished this long before it is re-checked
+INDEX_BUILD_SLACK = timedelta(minutes=5)
+
+def _normalize_rows(matrix):
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (matrix / norms).astype(np.float32)
+
+class CandidateIndex:
+    """Dense LSA projection of the resume corpus for top-K retrieval.
+
+    Resume vectors are stored as an L2-normalized float32 matrix, so the
+    similarity to a job is one matrix-vector product per block of rows.
+    """
+
+    def __init__(self, svd, ids, vectors, tfidf_version, built_at=None):
+        self.svd = svd
+        self.ids = ids
+        self.vectors = vectors
+        self.tfidf_version = tfidf_version
+        # When the build started reading resumes (None for indexes saved before it was recorded)
+        self.built_at = built_at
+
+    @property
+    def max_id(self):
+        return int(self.ids.max()) if len(self.ids) else 0
+
+    @classmethod
+    def build(cls, resumes, model, n_components=None, chunk_size=1000):
+        # resumes: iterable of Resume rows with tfidf_vector, tfidf_version and raw_text loaded
+        built_at = timezone.now()
+        ids = []
+        blocks = []
+        for chunk in iter_chunks(resumes, chunk_size):
+            ids.extend(resume.id for resume in chunk)
+            blocks.append(resume_vectors(chunk, model))
+        if not ids:
+            raise ValueError("No resumes to index")
+
+        tfidf_matrix = sparse.vstack(blocks).tocsr()
+
+        n_components = n_components or settings.LSA_COMPONENTS
+        n_components = max(1, min(n_components, tfidf_matrix.shape[0] - 1, tfidf_matrix.shape[1] - 1))
+        svd = TruncatedSVD(n_components=n_components, random_state=0)
+        vectors = _normalize_rows(svd.fit_transform(tfidf_matrix))
+        return cls(svd, np.array(ids, dtype=np.int64), vectors, model.version, built_at)
+
+    def project(self, tfidf_matrix):
+        return _normalize_rows(self.svd.transform(tfidf_matrix))
+
+    def search(self, query, k, block_size=65536):
+        """Return (ids, scores) of the k rows most similar to a projected query."""
+        if k <= 0:
+            # argpartition(scores, -0)[-0:] would select every row
+            return self.ids[:0], np.empty(0, dtype=np.float32)
+        query = query.ravel().astype(np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+
+        for start in range(0, len(self.ids), block_size):
+            scores = self.vectors[start:start + block_size] @ query
+            rows = np.arange(start, start + len(scores))
+            if len(scores) > k:
+                top = np.argpartition(scores, -k)[-k:]
+                rows, scores = rows[top], scores[top]
+            best_rows = np.concatenate([best_rows, rows])
+            best_scores = np.concatenate([best_scores, scores])
+            if len(best_scores) > k:
+                top = np.argpartition(best_scores, -k)[-k:]
+                best_rows, best_scores = best_rows[top], best_scores[top]
+
+        order = np.argsort(-best_scores)
+        return self.ids[best_rows[order]], best_scores[order]
+
+    def paths(self, model_dir=None):
+        model_dir = Path(model_dir or settings.TFIDF_MODEL_DIR)
+        prefix = model_dir / f'lsa-{self.tfidf_version}'
+        return prefix.with_suffix('.pkl'), Path(f'{prefix}-ids.npy'), Path(f'{prefix}-vectors.npy')
+
+    def save(self, model_dir=None):
+        svd_path, ids_path, vectors_path = self.paths(model_dir)
+        svd_path.parent.mkdir(parents=True, exist_ok=True)
+        # Arrays first, the pickle last: its presence marks the index as complete
+        for path, array in ((ids_path, self.ids), (vectors_path, self.vectors)):
+            tmp_path = path.with_name(path.name + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            os.replace(tmp_path, path)
+        tmp_path = svd_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'svd': self.svd, 'built_at': self.built_at}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, svd_path)
+
+    @classmethod
+    def load(cls, tfidf_version, model_dir=None):
+        index = cls(None, None, None, tfidf_version)
+        svd_path, ids_path, vectors_path = index.paths(model_dir)
+        with open(svd_path, 'rb') as f:
+            state = pickle.load(f)
+        if isinstance(state, dict):
+            index.svd, index.built_at = state['svd'], state['built_at']
+        else:
+            index.svd = state
+        index.ids = np.load(ids_path)
+        # Memory-mapped so every worker process shares the same pages
+        index.vectors = np.load(vectors_path, mmap_mode='r')
+        return index
+
+_index_lock = threading.Lock()
+_loaded_index = None
+
+def get_current_index():
+    """Return the index built for the active TF-IDF model, or None."""
+    global _loaded_index
+
+    model = get_current_model()
+    if model is None:
+        return None
+    if _loaded_index is not None and _loaded_index.tfidf_version == model.version:
+        return _loaded_index
+
+    with _index_lock:
+        if _loaded_index is None or _loaded_index.tfidf_version != model.version:
+            try:
+                _loaded_index = CandidateIndex.load(model.version)
+            except FileNotFoundError:
+                return None
+    return _loaded_index
+
+def unindexed_resumes(index):
+    # Rows that became done after the build started: a higher id, or a recent
+    # processing_finished_at for uploads that were pending or processing then
+    if index.built_at is None:
+        candidates = Resume.objects.filter(status='done').values_list('id', flat=True)
+    else:
+        # status is checked in Python: with it in the WHERE clause SQLite walks the
+        # status index over every done row instead of the id/finished-at indexes
+        rows = Resume.objects.filter(
+            Q(id__gt=index.max_id) | Q(processing_finished_at__gte=index.built_at - INDEX_BUILD_SLACK)
+        ).values_list('id', 'status')
+        candidates = [resume_id for resume_id, status in rows if status == 'done']
+    candidate_ids = np.fromiter(candidates, dtype=np.int64)
+    missing_ids = candidate_ids[~np.isin(candidate_ids, index.ids)]
+    if not len(missing_ids):
+        return []
+    return list(
+        Resume.objects.filter(id__in=missing_ids.tolist())
+        .only('id', 'raw_text', 'tfidf_vector', 'tfidf_version')
+    )
+
+def shortlist_candidates(job_description, k):
+    """Map resume id -> similarity for the k resumes closest to a job description.
+
+    Done resumes missing from the index (uploaded after it was built, or still
+    being extracted then) are projected on the fly, so the shortlist stays
+    complete between rebuilds. Returns None without an index.
+    """
+    model = get_current_model()
+    index = get_current_index()
+    if model is None or index is None or index.tfidf_version != model.version:
+        return None
+
+    query = index.project(model.job_vector(job_description))
+    ids, scores = index.search(query, k)
+
+    newer = unindexed_resumes(index)
+    if newer:
+        newer_scores = index.project(resume_vectors(newer, model)) @ query.ravel()
+        ids = np.concatenate([ids, [resume.id for resume in newer]])
+        scores = np.concatenate([scores, newer_scores])
+        top = np.argsort(-scores)[:k]
+        ids, scores = ids[top], scores[top]
+
+    return dict(zip(ids.tolist(), scores.tolist()))
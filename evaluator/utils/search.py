@@ -0,0 +1,84 @@
+import re
+from functools import reduce
+from operator import and_, or_
+
+from django.db import connection
+from django.db.models import Q
+
+from ..models import Resume
+
+# Column weights for bm25(), in FTS table column order:
+# name, skills, experience, education, raw_text
+BM25_WEIGHTS = (10.0, 5.0, 2.0, 1.0, 1.0)
+SEARCH_FIELDS = ['name', 'skills', 'experience', 'education', 'raw_text']
+
+TERM_PATTERN = re.compile(r'[\w+#.]+\*?')
+
+def parse_terms(query):
+    # Free text -> terms; punctuation is never passed to FTS5 as syntax
+    terms = []
+    for match in TERM_PATTERN.findall(query):
+        prefix = match.endswith('*')
+        term = match.rstrip('*').strip('.')
+        if term:
+            terms.append((term, prefix))
+    return terms
+
+def build_match_expression(terms):
+    # Each term quoted as an FTS5 string (all must match); "term"* for prefixes
+    parts = []
+    for term, prefix in terms:
+        quoted = '"' + term.replace('"', '""') + '"'
+        parts.append(quoted + '*' if prefix else quoted)
+    return ' '.join(parts)
+
+def search_resumes(query, limit=20, status='done'):
+    """Return [(resume_id, score, snippet)] for resumes matching every term.
+
+    Only resumes in `status` are returned (any status when it is None).
+
+    On SQLite this is a BM25-ranked FTS5 lookup; other databases fall back to
+    icontains filters without ranking or snippets.
+    """
+    terms = parse_terms(query)
+    # SQLite reads a negative LIMIT as no limit at all
+    if not terms or limit < 1:
+        return []
+
+    if connection.vendor != 'sqlite':
+        return fallback_search(terms, limit, status)
+
+    weights = ', '.join(str(weight) for weight in BM25_WEIGHTS)
+    params = [build_match_expression(terms)]
+    status_filter = ''
+    if status is not None:
+        status_filter = 'AND resume.status = %s'
+        params.append(status)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            SELECT evaluator_resume_fts.rowid, -bm25(evaluator_resume_fts, {weights}) AS score,
+                   snippet(evaluator_resume_fts, -1, '<mark>', '</mark>', '…', 16)
+            FROM evaluator_resume_fts
+            JOIN evaluator_resume AS resume ON resume.id = evaluator_resume_fts.rowid
+            WHERE evaluator_resume_fts MATCH %s {status_filter}
+            ORDER BY bm25(evaluator_resume_fts, {weights})
+            LIMIT %s
+            """,
+            params + [limit],
+        )
+        return cursor.fetchall()
+
+def fallback_search(terms, limit, status):
+    conditions = [
+        reduce(or_, (Q(**{f'{field}__icontains': term}) for field in SEARCH_FIELDS))
+        for term, _ in terms
+    ]
+    if status is not None:
+        conditions.append(Q(status=status))
+    ids = (
+        Resume.objects.filter(reduce(and_, conditions))
+        .order_by('-uploaded_at')
+        .values_list('id', flat=True)[:limit]
+    )
+    return [(resume_id, None, '') for resume_id in ids]
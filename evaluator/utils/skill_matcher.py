@@ -0,0 +1,69 @@
+from collections import deque
+from functools import lru_cache
+
+class SkillMatcher:
+    """Aho-Corasick automaton over normalized skill phrases.
+
+    The automaton works on whole tokens rather than characters, so a skill
+    only matches on word boundaries ("java" does not match "javascript") and
+    one linear pass over the resume tokens finds every required skill.
+    """
+
+    def __init__(self, skills):
+        # Normalized skills, deduplicated in job order
+        self.skills = list(dict.fromkeys(skill for skill in skills if skill))
+
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for index, skill in enumerate(self.skills):
+            node = 0
+            for token in skill.split():
+                child = self._goto[node].get(token)
+                if child is None:
+                    child = len(self._goto)
+                    self._goto[node][token] = child
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(())
+                node = child
+            self._output[node] += (index,)
+
+        # Breadth-first pass to link every state to its longest proper suffix
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for token, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(token, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def scan(self, text):
+        """Return the indexes of the skills found in normalized text."""
+        found = set()
+        node = 0
+        goto, fail, output = self._goto, self._fail, self._output
+        for token in text.split():
+            while node and token not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(token, 0)
+            if output[node]:
+                found.update(output[node])
+                if len(found) == len(self.skills):
+                    break
+        return found
+
+    def match(self, text):
+        found = self.scan(text)
+        matched_skills = [skill for index, skill in enumerate(self.skills) if index in found]
+        missing_skills = [skill for index, skill in enumerate(self.skills) if index not in found]
+        return matched_skills, missing_skills
+
+@lru_cache(maxsize=1024)
+def compile_skill_matcher(skills):
+    # Keyed by the tuple of normalized job skills, so an edited posting gets a new matcher
+    return SkillMatcher(skills)
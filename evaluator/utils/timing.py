@@ -0,0 +1,54 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .metrics import STAGE_SECONDS
+
+# Stage timings of the request being served; set by ServerTimingMiddleware
+current_timings = ContextVar('current_timings', default=None)
+
+class StageTimings:
+    """Seconds spent per stage during one request, in the order first seen."""
+
+    def __init__(self):
+        self.stages = {}
+
+    def add(self, name, seconds):
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def server_timing(self, total=None):
+        # Server-Timing durations are in milliseconds
+        entries = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in self.stages.items()]
+        if total is not None:
+            entries.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(entries)
+
+def record_stage(name, seconds):
+    STAGE_SECONDS.observe(seconds, stage=name)
+    timings = current_timings.get()
+    if timings is not None:
+        timings.add(name, seconds)
+
+@contextmanager
+def stage(name):
+    # Two perf_counter() calls and a histogram update; cheap enough for every call
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+def merge_stage_timings(stages):
+    for name, seconds in stages.items():
+        record_stage(name, seconds)
+
+def call_with_timings(func, *args):
+    # Process-pool entry point: the stages timed in the worker travel back
+    # with the result, together with the call's own duration
+    timings = StageTimings()
+    token = current_timings.set(timings)
+    start = time.perf_counter()
+    try:
+        return func(*args), timings.stages, time.perf_counter() - start
+    finally:
+        current_timings.reset(token)
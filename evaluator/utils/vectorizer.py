@@ -0,0 +1,182 @@
+import os
+import pickle
+import threading
+from datetime import datetime, timezone
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+from django.conf import settings
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+CURRENT_POINTER = 'CURRENT'
+JOB_VECTOR_CACHE_SIZE = 1024
+
+class CorpusVectorizer:
+    """TF-IDF model fitted over the whole resume corpus.
+
+    Vectors are L2-normalized, so cosine similarity between a stored resume
+    vector and a job vector is a plain sparse dot product.
+    """
+
+    def __init__(self, vectorizer, version, n_documents, fitted_at):
+        self.vectorizer = vectorizer
+        self.version = version
+        self.n_documents = n_documents
+        self.fitted_at = fitted_at
+        # Bounded cache of job description vectors under this model
+        self._job_cache = OrderedDict()
+        self._job_cache_lock = threading.Lock()
+
+    @property
+    def n_features(self):
+        return len(self.vectorizer.vocabulary_)
+
+    @classmethod
+    def fit(cls, texts):
+        texts = list(texts)
+        vectorizer = TfidfVectorizer(stop_words='english', max_features=50000, dtype=np.float32)
+        vectorizer.fit(texts)
+        # Only needed for introspection and bloats the pickle
+        vectorizer.stop_words_ = None
+
+        fitted_at = datetime.now(timezone.utc)
+        version = fitted_at.strftime('%Y%m%d%H%M%S%f')
+        return cls(vectorizer, version, len(texts), fitted_at)
+
+    def transform(self, texts):
+        return self.vectorizer.transform(texts).tocsr()
+
+    def job_vector(self, job_description):
+        return self.job_vectors([job_description])
+
+    def job_vectors(self, job_descriptions):
+        # One transform call for every description that is not cached yet
+        vectors = {}
+        with self._job_cache_lock:
+            for description in job_descriptions:
+                if description in self._job_cache:
+                    self._job_cache.move_to_end(description)
+                    vectors[description] = self._job_cache[description]
+
+        missing = [description for description in dict.fromkeys(job_descriptions)
+                   if description not in vectors]
+        if missing:
+            matrix = self.transform(missing)
+            with self._job_cache_lock:
+                for row, description in enumerate(missing):
+                    vectors[description] = self._job_cache[description] = matrix[row]
+                while len(self._job_cache) > JOB_VECTOR_CACHE_SIZE:
+                    self._job_cache.popitem(last=False)
+
+        return sparse.vstack([vectors[description] for description in job_descriptions]).tocsr()
+
+    def save(self, model_dir=None):
+        model_dir = Path(model_dir or settings.TFIDF_MODEL_DIR)
+        model_dir.mkdir(parents=True, exist_ok=True)
+
+        path = model_dir / f'tfidf-{self.version}.pkl'
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({
+                'vectorizer': self.vectorizer,
+                'version': self.version,
+                'n_documents': self.n_documents,
+                'fitted_at': self.fitted_at,
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        return path
+
+    def activate(self, model_dir=None):
+        # Point CURRENT at this version; readers pick it up on their next call
+        model_dir = Path(model_dir or settings.TFIDF_MODEL_DIR)
+        tmp_path = model_dir / f'{CURRENT_POINTER}.tmp'
+        tmp_path.write_text(self.version)
+        os.replace(tmp_path, model_dir / CURRENT_POINTER)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = pickle.load(f)
+        return cls(data['vectorizer'], data['version'], data['n_documents'], data['fitted_at'])
+
+_model_lock = threading.Lock()
+_loaded_model = None
+_loaded_pointer_mtime = None
+
+def get_current_model():
+    """Return the active CorpusVectorizer, or None if no model was fitted yet."""
+    global _loaded_model, _loaded_pointer_mtime
+
+    pointer = Path(settings.TFIDF_MODEL_DIR) / CURRENT_POINTER
+    try:
+        mtime = pointer.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    if _loaded_model is not None and mtime == _loaded_pointer_mtime:
+        return _loaded_model
+
+    with _model_lock:
+        if _loaded_model is None or mtime != _loaded_pointer_mtime:
+            version = pointer.read_text().strip()
+            _loaded_model = CorpusVectorizer.load(pointer.parent / f'tfidf-{version}.pkl')
+            _loaded_pointer_mtime = mtime
+    return _loaded_model
+
+def encode_vector(row):
+    # A 1 x n_features CSR row is stored as int32 indices followed by float32 values
+    row = row.tocsr()
+    return row.indices.astype(np.int32).tobytes() + row.data.astype(np.float32).tobytes()
+
+def decode_vectors(blobs, n_features):
+    """Stack encoded vectors into one CSR matrix, one row per blob."""
+    indptr = [0]
+    indices = []
+    data = []
+    for blob in blobs:
+        nnz = len(blob) // 8
+        buffer = bytes(blob)
+        indices.append(np.frombuffer(buffer, dtype=np.int32, count=nnz))
+        data.append(np.frombuffer(buffer, dtype=np.float32, count=nnz, offset=nnz * 4))
+        indptr.append(indptr[-1] + nnz)
+
+    if indices:
+        indices = np.concatenate(indices)
+        data = np.concatenate(data)
+    else:
+        indices = np.array([], dtype=np.int32)
+        data = np.array([], dtype=np.float32)
+    return sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, n_features))
+
+def vectorize_resume(resume, model=None):
+    """Store the resume's TF-IDF vector under the current model (does not save)."""
+    model = model or get_current_model()
+    if model is None:
+        return False
+    resume.tfidf_vector = encode_vector(model.transform([resume.raw_text]))
+    resume.tfidf_version = model.version
+    return True
+
+def vectorize_resumes(resumes, model=None):
+    # Batch variant of vectorize_resume: one transform call for the whole list
+    model = model or get_current_model()
+    if model is None or not resumes:
+        return False
+    matrix = model.transform([resume.raw_text for resume in resumes])
+    for row, resume in enumerate(resumes):
+        resume.tfidf_vector = encode_vector(matrix[row])
+        resume.tfidf_version = model.version
+    return True
+
+def resume_vectors(resumes, model):
+    """Return a CSR matrix of resume vectors, transforming only stale resumes."""
+    blobs = [resume.tfidf_vector if resume.tfidf_version == model.version else None
+             for resume in resumes]
+    stale = [i for i, blob in enumerate(blobs) if blob is None]
+    if stale:
+        fresh = model.transform([resumes[i].raw_text for i in stale])
+        for row, i in enumerate(stale):
+            blobs[i] = encode_vector(fresh[row])
+    return decode_vectors(blobs, model.n_features)
@@ -1,43 +1,498 @@
-from django.shortcuts import render
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
 from rest_framework.response import Response
 from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.views.decorators.http import require_GET
 from .models import JobPosting, Resume, Evaluation
-from .serializers import JobPostingSerializer, ResumeSerializer, EvaluationSerializer
-from .utils.pdf_extractor import ResumeExtractor
+from .serializers import JobPostingSerializer, ResumeSerializer, ResumeStatusSerializer, EvaluationSerializer
+from .pagination import NewestFirstCursorPagination, UploadedAtCursorPagination
 from .utils.evaluator import ResumeEvaluator
-import json
+from .utils.ingestion import extract_in_parallel, ingestion_queue
+from .utils.bulk_upload import iter_uploaded_pdfs
+from .utils.dedup import compute_content_hash, copy_extracted_fields, find_extracted_duplicate
+from .utils.vectorizer import vectorize_resumes
+from .utils.features import save_features
+from .utils.job_profiles import load_job_profile, load_job_profiles
+from .utils.retrieval import shortlist_candidates
+from .utils.search import search_resumes
+from .utils.pool_stats import job_pool_stats
+from .utils.batching import iter_queryset_chunks
+from .utils.claims import claim_pair, release_pair, wait_for_pair
+from .utils.single_flight import SingleFlight
+from .utils.metrics import CONTENT_TYPE, EVALUATIONS, registry
+from .utils.timing import stage
+from datetime import datetime, time
+from time import perf_counter
 
-class JobPostingViewSet(viewsets.ModelViewSet):
+RANK_CHUNK_SIZE = 1000
+RESULTS_MAX_LIMIT = 500
+SEARCH_MAX_LIMIT = 100
+STATS_MAX_TOP_SKILLS = 50
+
+# Resume fields returned with each full-text search hit
+SEARCH_RESULT_FIELDS = ['id', 'name', 'email', 'phone', 'skills', 'status', 'uploaded_at']
+
+# Resume columns the evaluation fingerprint reads: every resume of a pool is
+# loaded with only these to find the evaluations that are stale
+FINGERPRINT_RESUME_FIELDS = ['id', 'raw_text', 'education', 'skills']
+
+# Resume columns the evaluator reads, loaded only for the resumes re-scored.
+# Scoring reads select_related('features'), which only() has to name or
+# Django refuses to traverse the relation
+SCORED_RESUME_FIELDS = FINGERPRINT_RESUME_FIELDS + ['tfidf_vector', 'tfidf_version', 'features']
+
+# Columns rewritten when a stale evaluation is re-scored in place
+EVALUATION_RESULT_FIELDS = [
+    'skill_match_score', 'experience_score', 'education_score', 'cosine_similarity_score', 
+    'final_score', 'category', 'matched_skills', 'missing_skills', 'keyword_highlights', 'fingerprint',
+    'compute_time_ms',
+]
+
+# Concurrent analyze requests for the same (resume, job) pair share one evaluation
+analyze_flight = SingleFlight()
+
+def parse_count(value):
+    # Count parameters (limit, k, top_skills): an integer of at least 1, else None
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        return None
+    return count if count >= 1 else None
+
+def parse_id_list(data, name):
+    # Optional list of ids in a request body (resume_ids, job_posting_ids)
+    value = data.get(name)
+    if value is None:
+        return None
+    if not isinstance(value, list) or not all(type(item) is int for item in value):
+        raise ValidationError({name: 'Must be a list of integer ids'})
+    return value
+
+def compute_time_ms(seconds):
+    # Scoring time is stored on the row only when EVALUATION_RECORD_COMPUTE_TIME is on
+    return seconds * 1000 if settings.EVALUATION_RECORD_COMPUTE_TIME else None
+
+def upsert_evaluations(evaluations, batch_size=None):
+    # One INSERT ... ON CONFLICT per batch; the unique (resume, job_posting)
+    # constraint turns a re-score into an update of the existing row
+    with stage('db.upsert_evaluations'):
+        Evaluation.objects.bulk_create(
+            evaluations, batch_size=batch_size, update_conflicts=True, 
+            unique_fields=['resume', 'job_posting'], update_fields=EVALUATION_RESULT_FIELDS,
+        )
+
+def save_evaluation(resume, job_posting, fingerprint, evaluation_data, existing_evaluation=None):
+    with stage('db.save_evaluation'):
+        if existing_evaluation is None:
+            try:
+                with transaction.atomic():
+                    return Evaluation.objects.create(
+                        resume=resume,
+                        job_posting=job_posting,
+                        fingerprint=fingerprint,
+                        **evaluation_data
+                    )
+            except IntegrityError:
+                # Another process inserted the pair while this one was scoring
+                existing_evaluation = Evaluation.objects.get(resume=resume, job_posting=job_posting)
+                if existing_evaluation.fingerprint == fingerprint:
+                    return existing_evaluation
+        
+        # Stale: the resume, the job or the algorithm changed since it was scored
+        for field, value in evaluation_data.items():
+            setattr(existing_evaluation, field, value)
+        existing_evaluation.fingerprint = fingerprint
+        existing_evaluation.save(update_fields=EVALUATION_RESULT_FIELDS)
+        return existing_evaluation
+
+def parse_date_param(value):
+    # Accepts a full ISO datetime or a plain date (midnight, current timezone)
+    parsed = parse_datetime(value)
+    if parsed is None:
+        parsed_date = parse_date(value)
+        if parsed_date is None:
+            raise ValueError(value)
+        parsed = datetime.combine(parsed_date, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+class SparseFieldsetMixin:
+    # ?fields=a,b narrows list/retrieve responses; large text columns that are
+    # not serialized are deferred so they are never read from the database
+    deferrable_fields = []
+    list_exclude = []
+    
+    def get_response_fields(self):
+        if self.action not in ('list', 'retrieve'):
+            return None
+        fields = self.request.query_params.get('fields')
+        if fields:
+            return [field.strip() for field in fields.split(',') if field.strip()]
+        return None
+    
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_response_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        elif self.action == 'list':
+            kwargs.setdefault('exclude', self.list_exclude)
+        return super().get_serializer(*args, **kwargs)
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action not in ('list', 'retrieve'):
+            return queryset
+        fields = self.get_response_fields()
+        if fields is not None:
+            deferred = [field for field in self.deferrable_fields if field not in fields]
+        elif self.action == 'list':
+            deferred = [field for field in self.deferrable_fields if field in self.list_exclude]
+        else:
+            deferred = []
+        return queryset.defer(*deferred) if deferred else queryset
+
+class JobPostingViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = JobPosting.objects.all()
     serializer_class = JobPostingSerializer
+    pagination_class = NewestFirstCursorPagination
+    deferrable_fields = ['description', 'required_skills']
+    
+    def score_pool(self, job_posting, resumes):
+        # Score the pool chunk by chunk; evaluations whose fingerprint still
+        # matches are kept, stale or missing ones are replaced
+        evaluator = ResumeEvaluator()
+        job_hasher = evaluator.get_fingerprint_hasher(job_posting)
+        # Compile the job side once for every chunk
+        with stage('score.job_profile'):
+            load_job_profile(job_posting)
+        fingerprints = dict(
+            Evaluation.objects.filter(
+                job_posting=job_posting, resume__in=resumes
+            ).values_list('resume_id', 'fingerprint')
+        )
+        # Each chunk is scored outside any transaction and written in its own
+        # short one, so the SQLite write lock is never held while scoring
+        scanned = evaluated = 0
+        resumes = resumes.select_related(None).only(*FINGERPRINT_RESUME_FIELDS)
+        for chunk in iter_queryset_chunks(resumes, RANK_CHUNK_SIZE):
+            scanned += len(chunk)
+            stale_ids = [
+                resume.id for resume in chunk
+                if fingerprints.get(resume.id) != evaluator.get_fingerprint(resume, job_posting, job_hasher)
+            ]
+            if not stale_ids:
+                continue
+            
+            # Vectors and stored features are read only for the resumes re-scored
+            stale = [
+                (resume, evaluator.get_fingerprint(resume, job_posting, job_hasher))
+                for resume in Resume.objects.filter(id__in=stale_ids).only(*SCORED_RESUME_FIELDS)
+                .select_related('features').order_by('pk')
+            ]
+            if not stale:
+                continue
+            
+            start = perf_counter()
+            with stage('score.batch'):
+                evaluation_data = evaluator.evaluate_batch([resume for resume, _ in stale], job_posting)
+            # Batch scoring has no per-resume cost; each row gets the chunk's mean
+            elapsed = compute_time_ms((perf_counter() - start) / len(stale))
+            with transaction.atomic():
+                upsert_evaluations([
+                    Evaluation(resume=resume, job_posting=job_posting, fingerprint=fingerprint, 
+                               compute_time_ms=elapsed, **data)
+                    for (resume, fingerprint), data in zip(stale, evaluation_data)
+                ], batch_size=RANK_CHUNK_SIZE)
+            evaluated += len(stale)
+        EVALUATIONS.inc(evaluated, result='scored')
+        EVALUATIONS.inc(scanned - evaluated, result='cached')
+        return scanned, evaluated
+    
+    @action(detail=True, methods=['post'])
+    def rank(self, request, pk=None):
+        job_posting = self.get_object()
+        
+        limit = parse_count(request.data.get('limit', 50))
+        if limit is None or limit > RESULTS_MAX_LIMIT:
+            return Response({'error': f'limit must be an integer between 1 and {RESULTS_MAX_LIMIT}'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        resumes = Resume.objects.filter(status='done')
+        resume_ids = parse_id_list(request.data, 'resume_ids')
+        if resume_ids:
+            resumes = resumes.filter(id__in=resume_ids)
+        
+        scanned, evaluated = self.score_pool(job_posting, resumes)
+        
+        top_evaluations = Evaluation.objects.filter(job_posting=job_posting)
+        if resume_ids:
+            top_evaluations = top_evaluations.filter(resume__in=resumes)
+        top_evaluations = top_evaluations.with_related().order_by('-final_score')[:limit]
+        
+        return Response({
+            'job_posting_id': job_posting.id,
+            'evaluated': evaluated,
+            'cached': scanned - evaluated,
+            'results': EvaluationSerializer(top_evaluations, many=True).data
+        })
+    
+    @action(detail=True, methods=['get'])
+    def candidates(self, request, pk=None):
+        job_posting = self.get_object()
+        
+        k = parse_count(request.query_params.get('k', 50))
+        if k is None:
+            return Response({'error': 'k must be a positive integer'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        k = min(k, settings.CANDIDATES_MAX_K)
+        
+        # Shortlist with the LSA index
+        retrieval_scores = shortlist_candidates(job_posting.description, k)
+        if retrieval_scores is None:
+            return Response({'error': 'Candidate index is not built; run manage.py build_candidate_index'}, 
+                          status=status.HTTP_503_SERVICE_UNAVAILABLE)
+        
+        # Only the shortlist goes through full evaluation
+        shortlist = Resume.objects.filter(status='done', id__in=retrieval_scores)
+        self.score_pool(job_posting, shortlist)
+        
+        evaluations = Evaluation.objects.filter(
+            job_posting=job_posting, resume__in=shortlist
+        ).with_related().order_by('-final_score')
+        results = EvaluationSerializer(evaluations, many=True).data
+        for result in results:
+            result['retrieval_score'] = retrieval_scores[result['resume']] * 100
+        
+        return Response({
+            'job_posting_id': job_posting.id,
+            'k': k,
+            'results': results
+        })
+
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        job_posting = self.get_object()
+        
+        top_skills = parse_count(request.query_params.get('top_skills', 10))
+        if top_skills is None:
+            return Response({'error': 'top_skills must be a positive integer'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        top_skills = min(top_skills, STATS_MAX_TOP_SKILLS)
+        
+        return Response(job_pool_stats(job_posting, top_skills))
 
-class ResumeViewSet(viewsets.ModelViewSet):
-    queryset = Resume.objects.all()
+class ResumeViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = Resume.objects.defer('tfidf_vector')
     serializer_class = ResumeSerializer
+    pagination_class = UploadedAtCursorPagination
+    deferrable_fields = ['raw_text', 'education', 'experience', 'skills', 'error']
+    # Full raw text is only sent on retrieve or when asked for with ?fields=
+    list_exclude = ['raw_text']
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'match_jobs':
+            queryset = queryset.select_related('features')
+        return queryset
+    
+    def perform_update(self, serializer):
+        # Edited text changes the stored scoring features
+        save_features([serializer.save()])
     
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        resume = serializer.save()
-        
-        # Extract data from PDF
-        extractor = ResumeExtractor()
-        try:
-            extracted_data = extractor.extract_all_data(resume.file)
-            
-            # Update resume with extracted data
-            for field, value in extracted_data.items():
-                setattr(resume, field, value)
-            resume.save()
-            
+        # Reuse the stored file and extracted fields of an identical upload
+        content_hash = compute_content_hash(serializer.validated_data['file'])
+        duplicate = find_extracted_duplicate(content_hash)
+        if duplicate:
+            resume = serializer.save(content_hash=content_hash, status='done', 
+                                     **copy_extracted_fields(duplicate))
+            save_features([resume])
             return Response(ResumeSerializer(resume).data, status=status.HTTP_201_CREATED)
-        except Exception as e:
-            resume.delete()  # Clean up if extraction fails
-            return Response({'error': f'Failed to extract resume data: {str(e)}'}, 
+        
+        # Extraction runs in the ingestion worker pool; clients poll status/
+        resume = serializer.save(content_hash=content_hash, status='pending')
+        ingestion_queue.enqueue(resume)
+        
+        return Response(ResumeSerializer(resume).data, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        files = request.FILES.getlist('files')
+        archives = request.FILES.getlist('archive')
+        if not files and not archives:
+            return Response({'error': 'Upload PDFs as "files" or a ZIP as "archive"'}, 
                           status=status.HTTP_400_BAD_REQUEST)
+        
+        # Stream every new PDF to storage first, then extract them all in parallel;
+        # files already parsed before only get a new row pointing at the stored copy
+        results = []
+        stored = []
+        repeats = []
+        resumes = []
+        stored_hashes = set()
+        accepted = 0
+        for filename, pdf_file, error in iter_uploaded_pdfs(files, archives):
+            if error is None and accepted >= settings.BULK_UPLOAD_MAX_FILES:
+                error = f'Batch limit of {settings.BULK_UPLOAD_MAX_FILES} files exceeded'
+            if error:
+                results.append({'filename': filename, 'status': 'failed', 'error': error})
+                continue
+            accepted += 1
+            content_hash = compute_content_hash(pdf_file)
+            duplicate = find_extracted_duplicate(content_hash)
+            if duplicate:
+                resumes.append((len(results), Resume(content_hash=content_hash, status='done', 
+                                                     **copy_extracted_fields(duplicate))))
+            elif content_hash in stored_hashes:
+                repeats.append((len(results), content_hash))
+            else:
+                stored_hashes.add(content_hash)
+                name = default_storage.save(f'resumes/{pdf_file.name}', pdf_file)
+                stored.append((len(results), name, content_hash))
+            results.append({'filename': filename})
+        
+        started_at = timezone.now()
+        extracted = extract_in_parallel([default_storage.path(name) for _, name, _ in stored])
+        finished_at = timezone.now()
+        
+        parsed = {}
+        for (index, name, content_hash), (extracted_data, error) in zip(stored, extracted):
+            if error:
+                default_storage.delete(name)
+                results[index].update({'status': 'failed', 'error': error})
+                continue
+            parsed[content_hash] = Resume(file=name, content_hash=content_hash, status='done', 
+                                          processing_started_at=started_at, 
+                                          processing_finished_at=finished_at, **extracted_data)
+            resumes.append((index, parsed[content_hash]))
+        with stage('tfidf.vectorize'):
+            vectorize_resumes(list(parsed.values()))
+        
+        # Files repeated within this batch reuse the copy parsed above
+        for index, content_hash in repeats:
+            original = parsed.get(content_hash)
+            if original is None:
+                results[index].update({'status': 'failed', 'error': 'Duplicate of a file that failed to extract'})
+                continue
+            resumes.append((index, Resume(content_hash=content_hash, status='done', 
+                                          **copy_extracted_fields(original))))
+        with stage('db.save_resumes'), transaction.atomic():
+            Resume.objects.bulk_create([resume for _, resume in resumes])
+            save_features([resume for _, resume in resumes])
+        
+        for index, resume in resumes:
+            results[index].update({'status': 'done', 'id': resume.id, 'name': resume.name})
+        
+        return Response({
+            'created': len(resumes),
+            'failed': len(results) - len(resumes),
+            'results': results
+        }, status=status.HTTP_201_CREATED)
+    
+    @action(detail=True, methods=['post'], url_path='match-jobs')
+    def match_jobs(self, request, pk=None):
+        resume = self.get_object()
+        if resume.status != 'done':
+            return Response({'error': f'Resume is not ready for analysis (status: {resume.status})'}, 
+                          status=status.HTTP_409_CONFLICT)
+        
+        limit = parse_count(request.data.get('limit', 50))
+        if limit is None or limit > RESULTS_MAX_LIMIT:
+            return Response({'error': f'limit must be an integer between 1 and {RESULTS_MAX_LIMIT}'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        job_postings = JobPosting.objects.all()
+        job_posting_ids = parse_id_list(request.data, 'job_posting_ids')
+        if job_posting_ids:
+            job_postings = job_postings.filter(id__in=job_posting_ids)
+        job_postings = list(job_postings)
+        
+        # Score the resume against every job whose evaluation is missing or stale
+        evaluator = ResumeEvaluator()
+        fingerprints = {
+            job.id: evaluator.get_fingerprint(resume, job) for job in job_postings
+        }
+        existing = dict(
+            Evaluation.objects.filter(resume=resume).values_list('job_posting_id', 'fingerprint')
+        )
+        stale = [job for job in job_postings if existing.get(job.id) != fingerprints[job.id]]
+        
+        if stale:
+            with stage('score.job_profile'):
+                load_job_profiles(stale)
+            start = perf_counter()
+            with stage('score.jobs'):
+                evaluation_data = evaluator.evaluate_against_jobs(resume, stale)
+            elapsed = compute_time_ms((perf_counter() - start) / len(stale))
+            upsert_evaluations([
+                Evaluation(resume=resume, job_posting=job, fingerprint=fingerprints[job.id], 
+                           compute_time_ms=elapsed, **data)
+                for job, data in zip(stale, evaluation_data)
+            ])
+        EVALUATIONS.inc(len(stale), result='scored')
+        EVALUATIONS.inc(len(job_postings) - len(stale), result='cached')
+        
+        evaluations = Evaluation.objects.filter(
+            resume=resume, job_posting__in=job_postings
+        ).with_related().order_by('-final_score')[:limit]
+        
+        return Response({
+            'resume_id': resume.id,
+            'evaluated': len(stale),
+            'cached': len(job_postings) - len(stale),
+            'results': EvaluationSerializer(evaluations, many=True).data
+        })
+    
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response({'error': 'q is required'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        
+        limit = parse_count(request.query_params.get('limit', 20))
+        if limit is None:
+            return Response({'error': 'limit must be a positive integer'}, 
+                          status=status.HTTP_400_BAD_REQUEST)
+        limit = min(limit, SEARCH_MAX_LIMIT)
+        
+        # BM25-ranked hits from the FTS5 index, then one query for their rows
+        hits = search_resumes(query, limit)
+        resumes = Resume.objects.only(*SEARCH_RESULT_FIELDS).in_bulk([resume_id for resume_id, _, _ in hits])
+        
+        results = []
+        for resume_id, score, snippet in hits:
+            if resume_id not in resumes:
+                continue
+            result = ResumeSerializer(resumes[resume_id], fields=SEARCH_RESULT_FIELDS).data
+            result['score'] = score
+            result['snippet'] = snippet
+            results.append(result)
+        
+        return Response({
+            'query': query,
+            'count': len(results),
+            'results': results
+        })
+    
+    @action(detail=True, methods=['get'])
+    def status(self, request, pk=None):
+        resume = self.get_object()
+        if resume.status in ('pending', 'processing'):
+            ingestion_queue.start()
+        return Response(ResumeStatusSerializer(resume).data)
     
     @action(detail=True, methods=['put'])
     def update_extracted_data(self, request, pk=None):
@@ -50,11 +505,46 @@ class ResumeViewSet(viewsets.ModelViewSet):
                 setattr(resume, field, request.data[field])
         
         resume.save()
+        save_features([resume])
         return Response(ResumeSerializer(resume).data)
 
-class EvaluationViewSet(viewsets.ModelViewSet):
-    queryset = Evaluation.objects.all()
+class EvaluationViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
+    queryset = Evaluation.objects.with_related()
     serializer_class = EvaluationSerializer
+    pagination_class = NewestFirstCursorPagination
+    deferrable_fields = ['matched_skills', 'missing_skills', 'keyword_highlights']
+    filter_backends = [OrderingFilter]
+    ordering_fields = [
+        'final_score', 'skill_match_score', 'experience_score', 'education_score', 
+        'cosine_similarity_score', 'created_at',
+    ]
+    ordering = '-created_at'
+    
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        params = self.request.query_params
+        
+        # ?job_posting=X&ordering=-final_score is served by the (job_posting, -final_score) index
+        for param in ('job_posting', 'resume'):
+            if param in params:
+                queryset = queryset.filter(**{param: self.parse_param(param, int)})
+        if 'category' in params:
+            queryset = queryset.filter(category__in=params['category'].split(','))
+        if 'min_score' in params:
+            queryset = queryset.filter(final_score__gte=self.parse_param('min_score', float))
+        if 'max_score' in params:
+            queryset = queryset.filter(final_score__lte=self.parse_param('max_score', float))
+        if 'created_after' in params:
+            queryset = queryset.filter(created_at__gte=self.parse_param('created_after', parse_date_param))
+        if 'created_before' in params:
+            queryset = queryset.filter(created_at__lte=self.parse_param('created_before', parse_date_param))
+        return queryset
+    
+    def parse_param(self, name, parse):
+        try:
+            return parse(self.request.query_params[name])
+        except (TypeError, ValueError):
+            raise ValidationError({name: f'Invalid value: {self.request.query_params[name]}'})
     
     @action(detail=False, methods=['post'])
     def analyze(self, request):
@@ -65,26 +555,53 @@ class EvaluationViewSet(viewsets.ModelViewSet):
             return Response({'error': 'resume_id and job_posting_id are required'}, 
                           status=status.HTTP_400_BAD_REQUEST)
         
-        resume = get_object_or_404(Resume, id=resume_id)
+        resume = get_object_or_404(Resume.objects.select_related('features'), id=resume_id)
         job_posting = get_object_or_404(JobPosting, id=job_posting_id)
         
-        # Check if evaluation already exists
-        existing_evaluation = Evaluation.objects.filter(
-            resume=resume, job_posting=job_posting
-        ).first()
-        
-        if existing_evaluation:
-            return Response(EvaluationSerializer(existing_evaluation).data)
-        
-        # Perform evaluation
-        evaluator = ResumeEvaluator()
-        evaluation_data = evaluator.evaluate_resume(resume, job_posting)
-        
-        # Create evaluation record
-        evaluation = Evaluation.objects.create(
-            resume=resume,
-            job_posting=job_posting,
-            **evaluation_data
-        )
+        if resume.status != 'done':
+            return Response({'error': f'Resume is not ready for analysis (status: {resume.status})'}, 
+                          status=status.HTTP_409_CONFLICT)
         
+        # The first request for a pair scores it; concurrent ones wait for its result
+        evaluation = analyze_flight.do((resume.id, job_posting.id), self.evaluate_pair, resume, job_posting)
         return Response(EvaluationSerializer(evaluation).data)
+    
+    def evaluate_pair(self, resume, job_posting):
+        # Reuse the existing evaluation only if it was computed from the same inputs
+        evaluator = ResumeEvaluator()
+        fingerprint = evaluator.get_fingerprint(resume, job_posting)
+        token = None
+        try:
+            while True:
+                existing_evaluation = Evaluation.objects.filter(
+                    resume=resume, job_posting=job_posting
+                ).first()
+                
+                if existing_evaluation and existing_evaluation.fingerprint == fingerprint:
+                    EVALUATIONS.inc(result='cached')
+                    return existing_evaluation
+                if token is not None:
+                    break
+                
+                # Across worker processes the pair's claim elects one scorer; the
+                # others wait for it to finish, then read the row it wrote
+                token = claim_pair(resume, job_posting)
+                if token is None:
+                    wait_for_pair(resume, job_posting)
+            
+            # Perform evaluation
+            with stage('score.job_profile'):
+                load_job_profile(job_posting)
+            start = perf_counter()
+            evaluation_data = evaluator.evaluate_resume(resume, job_posting)
+            evaluation_data['compute_time_ms'] = compute_time_ms(perf_counter() - start)
+            EVALUATIONS.inc(result='scored')
+            return save_evaluation(resume, job_posting, fingerprint, evaluation_data, existing_evaluation)
+        finally:
+            if token is not None:
+                release_pair(resume, job_posting, token)
+
+@require_GET
+def metrics(request):
+    # Prometheus scrape target; counters and histograms of this process only
+    return HttpResponse(registry.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,12 @@
+# Production entry point: gunicorn managing uvicorn workers serving the ASGI app.
+# Each worker keeps its own process pool (PROCESS_POOL_WORKERS) for PDF parsing
+# and scoring, so keep workers x pool size within the available cores.
+import os
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+worker_class = 'uvicorn.workers.UvicornWorker'
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+graceful_timeout = 30
+keepalive = 5
+accesslog = '-'
@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
+import django
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,6 +47,8 @@ INSTALLED_APPS = [
 
 
 MIDDLEWARE = [
+    # Outermost, so its request timings cover every other middleware
+    'evaluator.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -51,6 +56,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # Last, so it wraps only the view; inactive unless PROFILING_TOKEN is set
+    'evaluator.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'resume_evaluator.urls'
@@ -72,31 +79,92 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'resume_evaluator.wsgi.application'
+ASGI_APPLICATION = 'resume_evaluator.asgi.application'
 
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# DJANGO_DB_PROFILE=production switches SQLite to WAL journaling (readers no
+# longer block on the scoring writers)
+DB_PROFILE = os.environ.get('DJANGO_DB_PROFILE', 'development')
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.environ.get('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+        'OPTIONS': {},
     }
 }
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
+# Applied to every new SQLite connection by evaluator.db.configure_sqlite_connection
+SQLITE_PRAGMAS = {
+    'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
 }
 
+if DB_PROFILE == 'production':
+    # Persistent connections only help WSGI deployments: under ASGI (the
+    # gunicorn + uvicorn setup) every request runs in a fresh thread context,
+    # so its connection is never reused and the default stays 0
+    DATABASES['default']['CONN_MAX_AGE'] = int(os.environ.get('DB_CONN_MAX_AGE', 0))
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    SQLITE_PRAGMAS.update({
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'temp_store': 'MEMORY',
+        'cache_size': -64000,  # KiB
+        'mmap_size': 256 * 1024 * 1024,
+    })
+    if django.VERSION >= (5, 1):
+        # Take the write lock at BEGIN, so a transaction never has to upgrade
+        # a read lock mid-way (which fails at once instead of waiting)
+        DATABASES['default']['OPTIONS']['transaction_mode'] = 'IMMEDIATE'
+
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
 STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 
+# Corpus-fitted TF-IDF models; refit with `manage.py refit_tfidf`
+TFIDF_MODEL_DIR = BASE_DIR / 'tfidf_models'
+TFIDF_REFIT_DRIFT = 0.2
+
+# LSA candidate index for top-K retrieval; rebuilt by `manage.py build_candidate_index`
+LSA_COMPONENTS = 200
+CANDIDATES_MAX_K = 500
+
+# Resume ingestion: uploads are queued and extracted in a process pool
+PROCESS_POOL_WORKERS = os.cpu_count()
+RESUME_INGESTION_EAGER = False  # extract inside the request (tests, debugging)
+RESUME_INGESTION_POLL_INTERVAL = 5  # seconds between queue scans when idle
+RESUME_INGESTION_STALE_AFTER = 600  # seconds before a stuck 'processing' row is retried
+
+# Per-stage timings (PDF parsing, scoring, DB writes) are sent as a
+# Server-Timing header and exported with counters at GET /metrics
+SERVER_TIMING = True
+EVALUATION_RECORD_COMPUTE_TIME = False  # store scoring time on each Evaluation row
+
+# Analyze requests claim the (resume, job) pair before scoring it; identical
+# requests in other processes poll for the result instead of scoring again
+EVALUATION_CLAIM_TIMEOUT = 120  # seconds before an unreleased claim is taken over
+EVALUATION_CLAIM_POLL_INTERVAL = 0.05  # seconds between checks while waiting
+
+# On-demand cProfile of a single request: send the token as an X-Profile-Token
+# header or ?_profile=<token>; profiles are listed at /admin/profiles/
+PROFILING_TOKEN = os.environ.get('PROFILING_TOKEN', '')
+PROFILING_DIR = os.environ.get('PROFILING_DIR', BASE_DIR / 'profiles')
+PROFILING_MAX_FILES = 200
+
+# PDF text extraction stops after this many pages or characters
+PDF_MAX_PAGES = 30
+PDF_MAX_CHARS = 200000
+
+# Bulk upload limits (ZIP archives or many multipart files)
+BULK_UPLOAD_MAX_FILES = 1000
+BULK_UPLOAD_MAX_FILE_SIZE = 20 * 1024 * 1024
+DATA_UPLOAD_MAX_NUMBER_FILES = BULK_UPLOAD_MAX_FILES
+
 CORS_ALLOW_ALL_ORIGINS = True
 
 REST_FRAMEWORK = {
@@ -105,6 +173,18 @@ REST_FRAMEWORK = {
     ]
 }
 
+# orjson is optional; without it DRF's stdlib JSON renderer and parser are used
+if find_spec('orjson'):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'evaluator.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+        'evaluator.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -18,8 +18,14 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from evaluator.admin import profile_detail, profile_download, profile_list
+from evaluator.views import metrics
 
 urlpatterns = [
+    path('admin/profiles/', admin.site.admin_view(profile_list), name='profile-list'),
+    path('admin/profiles/<str:name>/', admin.site.admin_view(profile_detail), name='profile-detail'),
+    path('admin/profiles/<str:name>/download/', admin.site.admin_view(profile_download), name='profile-download'),
     path('admin/', admin.site.urls),
     path('api/', include('evaluator.urls')),
+    path('metrics', metrics, name='metrics'),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
@@ -1,7 +1,9 @@
 # streamlit_app.py
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import time
 import pandas as pd
 from datetime import datetime
 import plotly.express as px
@@ -69,27 +71,74 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# HTTP timeouts in seconds: (connect, read). Uploads wait longer for the body to be sent
+REQUEST_TIMEOUT = (3.05, 30)
+UPLOAD_TIMEOUT = (3.05, 120)
+
+# How long cached reads are reused before Django is asked again
+CACHE_TTL_SECONDS = 60
+
+@st.cache_resource
+def get_http_session():
+    """One pooled keep-alive session shared by every rerun and browser session"""
+    session = requests.Session()
+    # Idempotent requests (GET/PUT) are retried on connection errors and 502-504
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def fetch_job_postings(base_url):
+    # List endpoints are cursor-paginated; follow `next` until exhausted
+    session = get_http_session()
+    job_postings = []
+    url = f"{base_url}/job-postings/?page_size=500"
+    while url:
+        response = session.get(url, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        page = response.json()
+        job_postings.extend(page['results'])
+        url = page['next']
+    return job_postings
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def fetch_resume(base_url, resume_id):
+    response = get_http_session().get(f"{base_url}/resumes/{resume_id}/", timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+@st.cache_data(ttl=CACHE_TTL_SECONDS, show_spinner=False)
+def fetch_job_stats(base_url, job_id):
+    response = get_http_session().get(f"{base_url}/job-postings/{job_id}/stats/", timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
 class APIClient:
     def __init__(self, base_url):
         self.base_url = base_url
+        self.session = get_http_session()
     
     def get_job_postings(self):
+        # Served from the TTL cache; create/update below clear it
         try:
-            response = requests.get(f"{self.base_url}/job-postings/")
-            return response.json() if response.status_code == 200 else []
+            return fetch_job_postings(self.base_url)
         except:
             return []
     
     def create_job_posting(self, data):
         try:
-            response = requests.post(f"{self.base_url}/job-postings/", json=data)
+            response = self.session.post(f"{self.base_url}/job-postings/", json=data, timeout=REQUEST_TIMEOUT)
+            fetch_job_postings.clear()
             return response.json() if response.status_code == 201 else None
         except:
             return None
     
     def update_job_posting(self, job_id, data):
         try:
-            response = requests.put(f"{self.base_url}/job-postings/{job_id}/", json=data)
+            response = self.session.put(f"{self.base_url}/job-postings/{job_id}/", json=data, timeout=REQUEST_TIMEOUT)
+            fetch_job_postings.clear()
             return response.json() if response.status_code == 200 else None
         except:
             return None
@@ -97,14 +146,42 @@ class APIClient:
     def upload_resume(self, file):
         try:
             files = {'file': file}
-            response = requests.post(f"{self.base_url}/resumes/", files=files)
-            return response.json() if response.status_code == 201 else None
+            response = self.session.post(f"{self.base_url}/resumes/", files=files, timeout=UPLOAD_TIMEOUT)
+            return response.json() if response.status_code in (201, 202) else None
+        except:
+            return None
+    
+    def get_resume(self, resume_id):
+        try:
+            return fetch_resume(self.base_url, resume_id)
+        except:
+            return None
+    
+    def get_resume_status(self, resume_id):
+        # Never cached: this is what wait_for_resume polls
+        try:
+            response = self.session.get(f"{self.base_url}/resumes/{resume_id}/status/", timeout=REQUEST_TIMEOUT)
+            return response.json() if response.status_code == 200 else None
         except:
             return None
     
+    def wait_for_resume(self, resume_id, timeout=120, interval=1):
+        """Poll the ingestion status until extraction finishes or fails"""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            status = self.get_resume_status(resume_id)
+            if status and status['status'] == 'done':
+                return self.get_resume(resume_id), None
+            if status and status['status'] == 'failed':
+                return None, status.get('error')
+            time.sleep(interval)
+        return None, "Timed out waiting for the resume to be processed"
+    
     def update_resume_data(self, resume_id, data):
         try:
-            response = requests.put(f"{self.base_url}/resumes/{resume_id}/update_extracted_data/", json=data)
+            response = self.session.put(f"{self.base_url}/resumes/{resume_id}/update_extracted_data/", 
+                                        json=data, timeout=REQUEST_TIMEOUT)
+            fetch_resume.clear()
             return response.json() if response.status_code == 200 else None
         except:
             return None
@@ -115,10 +192,18 @@ class APIClient:
                 'resume_id': resume_id,
                 'job_posting_id': job_posting_id
             }
-            response = requests.post(f"{self.base_url}/evaluations/analyze/", json=data)
+            response = self.session.post(f"{self.base_url}/evaluations/analyze/", json=data, timeout=REQUEST_TIMEOUT)
+            fetch_job_stats.clear()
             return response.json() if response.status_code == 200 else None
         except:
             return None
+    
+    def get_job_stats(self, job_id):
+        # Aggregated server-side; only the summary crosses the wire
+        try:
+            return fetch_job_stats(self.base_url, job_id)
+        except:
+            return None
 
 def safe_format_salary(value):
     """Safely format salary value to float for display"""
@@ -141,7 +226,8 @@ def main():
         "Job Details", 
         "Upload Resume", 
         "Review & Analyze", 
-        "Results Dashboard"
+        "Results Dashboard",
+        "Pool Dashboard"
     ])
     
     if page == "Job Details":
@@ -152,6 +238,8 @@ def main():
         show_review_analyze_page(api)
     elif page == "Results Dashboard":
         show_results_dashboard(api)
+    elif page == "Pool Dashboard":
+        show_pool_dashboard(api)
 
 def show_job_details_page(api):
     st.header(" Job Details Management")
@@ -269,14 +357,15 @@ def show_upload_resume_page(api):
         
         if st.button("Process Resume", type="primary"):
             with st.spinner("Extracting data from resume..."):
-                resume_data = api.upload_resume(uploaded_file)
+                upload = api.upload_resume(uploaded_file)
+                resume_data, error = api.wait_for_resume(upload['id']) if upload else (None, None)
                 
                 if resume_data:
                     st.session_state.current_resume = resume_data
                     st.success("Resume processed successfully!")
                     st.rerun()
                 else:
-                    st.error("Failed to process resume. Please try again.")
+                    st.error(error or "Failed to process resume. Please try again.")
     
     # Show extracted data if available
     if 'current_resume' in st.session_state:
@@ -458,7 +547,7 @@ def show_results_dashboard(api):
     with col1:
         st.write("**✅ Matched Skills**")
         try:
-            matched_skills = json.loads(evaluation['matched_skills'])
+            matched_skills = evaluation['matched_skills']
             if matched_skills:
                 for skill in matched_skills:
                     st.success(f"✓ {skill}")
@@ -470,7 +559,7 @@ def show_results_dashboard(api):
     with col2:
         st.write("**❌ Missing Skills**")
         try:
-            missing_skills = json.loads(evaluation['missing_skills'])
+            missing_skills = evaluation['missing_skills']
             if missing_skills:
                 for skill in missing_skills:
                     st.error(f"✗ {skill}")
@@ -482,7 +571,7 @@ def show_results_dashboard(api):
     # Keyword highlights
     st.subheader("🔍 Key Matching Keywords")
     try:
-        keywords = json.loads(evaluation['keyword_highlights'])
+        keywords = evaluation['keyword_highlights']
         if keywords:
             keyword_cols = st.columns(min(len(keywords), 5))
             for i, keyword in enumerate(keywords):
@@ -522,6 +611,87 @@ def show_results_dashboard(api):
         for rec in recommendations:
             st.write(f"• {rec}")
 
+def show_pool_dashboard(api):
+    st.header(" Candidate Pool Dashboard")
+    
+    job_postings = api.get_job_postings()
+    if not job_postings:
+        st.warning("Please create a job posting first!")
+        return
+    
+    job_options = {f"{job['title']} - {job['department']}": job['id'] for job in job_postings}
+    selected_job_title = st.selectbox("Choose a job posting:", list(job_options.keys()))
+    stats = api.get_job_stats(job_options[selected_job_title])
+    
+    if stats is None:
+        st.error("Could not load pool statistics")
+        return
+    if not stats['total']:
+        st.info("No resumes have been evaluated against this job yet")
+        return
+    
+    final_scores = stats['scores']['final_score']
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Evaluated Candidates", stats['total'])
+    with col2:
+        st.metric("Mean Score", f"{final_scores['mean']:.1f}")
+    with col3:
+        st.metric("Median Score", f"{final_scores['p50']:.1f}")
+    with col4:
+        st.metric("Excellent Matches", stats['categories']['excellent'])
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        category_display = {
+            'excellent': 'Excellent',
+            'good': 'Good', 
+            'average': 'Average',
+            'below_average': 'Below Average'
+        }
+        fig = px.pie(
+            names=[category_display[category] for category in stats['categories']],
+            values=list(stats['categories'].values()),
+            title='Candidates by Category'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        fig = px.bar(
+            x=[f"{bucket['min']}-{bucket['max']}" for bucket in stats['histogram']],
+            y=[bucket['count'] for bucket in stats['histogram']],
+            labels={'x': 'Final Score', 'y': 'Candidates'},
+            title='Final Score Distribution'
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.subheader(" Score Percentiles")
+    score_labels = {
+        'final_score': 'Final Score',
+        'skill_match_score': 'Skill Match',
+        'experience_score': 'Experience',
+        'education_score': 'Education',
+        'cosine_similarity_score': 'Text Similarity'
+    }
+    percentiles = pd.DataFrame([
+        {'Score': score_labels[field], 'Mean': values['mean'], 'P25': values['p25'], 
+         'Median': values['p50'], 'P75': values['p75'], 'P90': values['p90']}
+        for field, values in stats['scores'].items()
+    ])
+    st.dataframe(percentiles.round(1), use_container_width=True, hide_index=True)
+    
+    if stats['top_missing_skills']:
+        st.subheader(" Most Common Missing Skills")
+        fig = px.bar(
+            x=[item['count'] for item in stats['top_missing_skills']],
+            y=[item['skill'] for item in stats['top_missing_skills']],
+            orientation='h',
+            labels={'x': 'Candidates missing the skill', 'y': 'Skill'}
+        )
+        fig.update_layout(yaxis={'categoryorder': 'total ascending'})
+        st.plotly_chart(fig, use_container_width=True)
+
 if __name__ == "__main__":
     if 'current_resume' not in st.session_state:
         st.session_state.current_resume = None